@@ -1,23 +1,27 @@
+import os
+import io
+import csv
+import sys
+import json
 import time
+import wave
+import random
+import asyncio
 import logging
-import io
-import os
-from pydub import AudioSegment
-import numpy as np
-import requests
+import argparse
 from datetime import datetime
 
-# --- Configuration (copy from your main app for consistency) ---
-# Configure logging to see detailed API errors in the console
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+import numpy as np
+import httpx
 
-# Sarvam API Key (replace with your actual key)
-SARVAM_API_KEY = "sk_aov2qcwm_v6DDreRZzU6ntWRM5ixh8voS" 
+# --- Configuration ---
+# Configure logging to see failed requests in the console
+logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
-# API Endpoints
-SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text"
-SARVAM_TRANSLATE_URL = "https://api.sarvam.ai/translate"
-SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech" 
+# ShikshaLok backend under test (start it with SARVAM_BASE_URL pointing at backend/fake_sarvam.py
+# to measure our own overhead without spending Sarvam quota)
+SHIKSHA_API_URL = os.getenv("SHIKSHA_API_URL", "http://127.0.0.1:8000").rstrip("/")
 
 # Supported Languages (for testing purposes, ensure these are valid Sarvam codes)
 TEST_SOURCE_LANGUAGE = "en-IN" # Example: English
@@ -25,263 +29,356 @@ TEST_TARGET_LANGUAGE = "hi-IN" # Example: Hindi
 
 # --- Dummy Cost Model Parameters (adjust these based on Sarvam's pricing) ---
 # These are placeholder values. You'll need to check Sarvam AI's actual pricing.
-# Example: 1 USD = 83 INR (approx)
-# If Sarvam charges per second of audio for STT and per character for translation.
-COST_PER_SECOND_STT_USD = 0.00001 
-COST_PER_CHAR_TRANSLATE_USD = 0.000005 
-
-# --- API Call Functions (copied from your main app) ---
-def call_stt_api(audio_segment: AudioSegment, api_key: str, lang_code: str = "auto"):
-    wav_io = io.BytesIO()
-    audio_segment = audio_segment.set_channels(1).set_frame_rate(16000).set_sample_width(2)
-    audio_segment.export(wav_io, format="wav")
-    wav_io.seek(0)
-    files = {"file": ("audio.wav", wav_io.getvalue(), "audio/wav")}
-    headers = {"api-subscription-key": api_key}
-    data = {"language_code": lang_code if lang_code != "auto" else ""}
-
-    start_time = time.time()
-    try:
-        response = requests.post(SARVAM_STT_URL, headers=headers, files=files, data=data, timeout=15) # Increased timeout for tests
-        response.raise_for_status()
-        end_time = time.time()
-        latency = end_time - start_time
-
-        response_data = response.json()
-        transcript = response_data.get("transcript", "").strip()
-        detected_language = response_data.get("language_code", lang_code)
-        
-        audio_duration_seconds = len(audio_segment) / 1000.0
-        cost = audio_duration_seconds * COST_PER_SECOND_STT_USD
-
-        return transcript, detected_language, latency, cost
-    except requests.exceptions.HTTPError as e:
-        logging.error(f"STT API HTTP Error: {e.response.status_code} {e.response.reason} - {e.response.text}")
-        return "", lang_code, 0.0, 0.0
-    except requests.exceptions.RequestException as e:
-        logging.error(f"STT API Request Error: {e}")
-        return "", lang_code, 0.0, 0.0
-    except Exception as e:
-        logging.error(f"STT API Unexpected Error: {e}")
-        return "", lang_code, 0.0, 0.0
-
-def call_translate_api(text: str, source_lang_code: str, target_lang_code: str, api_key: str):
-    if not text.strip():
-        return "", 0.0, 0.0
-    
-    start_time = time.time()
-    try:
-        headers = {"api-subscription-key": api_key, "Content-Type": "application/json"}
-        data = {
-            "input": text,
-            "source_language_code": source_lang_code,
-            "target_language_code": target_lang_code,
-            "speaker_gender": "Male",
-            "mode": "formal",
-            "model": "mayura:v1",
-            "enable_preprocessing": True
-        }
-        response = requests.post(SARVAM_TRANSLATE_URL, headers=headers, json=data, timeout=15) # Increased timeout for tests
-        response.raise_for_status()
-        end_time = time.time()
-        latency = end_time - start_time
-
-        result = response.json()
-        translated_text = result.get("translated_text", "Translation failed").strip()
-        
-        cost = len(text) * COST_PER_CHAR_TRANSLATE_USD
-
-        return translated_text, latency, cost
-    except requests.exceptions.HTTPError as e:
-        logging.error(f"Translate API HTTP Error: {e.response.status_code} {e.response.reason} - {e.response.text}")
-        return f"Translation API Error: {e.response.text}", 0.0, 0.0
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Translate API Request Error: {e}")
-        return f"Translation Error: {str(e)}", 0.0, 0.0
-    except Exception as e:
-        logging.error(f"Translate API Unexpected Error: {e}")
-        return f"Translation Error: {str(e)}", 0.0, 0.0
-
-# --- Test Data Setup ---
-
-# Placeholder for creating dummy audio files if you don't have real ones.
-# IMPORTANT: For actual STT testing, replace these with paths to real audio files.
-def create_dummy_audio_file(filename, duration_sec, sample_rate=16000, channels=1, sample_width=2):
-    """Creates a silent WAV file for testing purposes. STT will return empty."""
-    samples = np.zeros(int(duration_sec * sample_rate), dtype=np.int16)
-    audio_segment = AudioSegment(samples.tobytes(), frame_rate=sample_rate, sample_width=sample_width, channels=channels)
-    audio_segment.export(filename, format="wav")
-    return filename
-
-# List of real audio files (WAV, MP3, etc.) for STT testing
-# You MUST replace these with actual paths to your test audio files.
-AUDIO_TEST_FILES = {
-    "short_audio_1": "audio_samples/short_sample.wav",  # Example: "Hello, how are you?" (5 sec)
-    "medium_audio_1": "audio_samples/medium_sample.wav", # Example: A paragraph (15 sec)
-    "long_audio_1": "audio_samples/long_sample.wav",     # Example: A minute-long speech (30 sec max for single call)
-    # Add more as needed
+# If Sarvam charges per second of audio for STT and per character for translation/TTS.
+COST_PER_SECOND_STT_USD = 0.00001
+COST_PER_CHAR_TRANSLATE_USD = 0.000005
+COST_PER_CHAR_TTS_USD = 0.000005
+
+ENDPOINTS = {
+    "translate": "/api/translate",
+    "stt": "/api/speech-to-text",
+    "tts": "/api/text-to-speech",
+    "document": "/api/document-translate",
 }
 
-# Example of creating dummy audio files for initial testing if you don't have real ones
-# Ensure 'dummy_audio_files' directory exists
-if not os.path.exists("dummy_audio_files"):
-    os.makedirs("dummy_audio_files")
-# dummy_audio_short_path = create_dummy_audio_file("dummy_audio_files/dummy_short.wav", 5)
-# dummy_audio_medium_path = create_dummy_audio_file("dummy_audio_files/dummy_medium.wav", 15)
-# dummy_audio_long_path = create_dummy_audio_file("dummy_audio_files/dummy_long.wav", 30)
-
-# Replace the above AUDIO_TEST_FILES with the dummy paths for initial no-real-audio runs:
-# AUDIO_TEST_FILES = {
-#     "dummy_short": dummy_audio_short_path,
-#     "dummy_medium": dummy_audio_medium_path,
-#     "dummy_long": dummy_audio_long_path,
-# }
-
+TEXT_EXTENSIONS = (".txt", ".md")
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".ogg", ".webm", ".m4a", ".flac")
+DOCUMENT_EXTENSIONS = (".docx", ".pdf", ".txt", ".png", ".jpg", ".jpeg")
 
-# Text data for text-to-text translation testing
+# Built-in text corpus used when --text-corpus is not given
 TEXT_TEST_CASES = {
     "short_text_1": "Hello, how are you?",
     "medium_text_1": "The quick brown fox jumps over the lazy dog. This is a medium-length sentence to test translation latency.",
     "long_text_1": "In the bustling city, amidst the towering skyscrapers and vibrant markets, a sense of quiet introspection settled upon the solitary traveler. He pondered the vastness of the universe and his minuscule place within it, finding both comfort and awe in the thought. The sounds of the city faded into a distant hum as his mind delved deeper into philosophical musings, searching for answers that perhaps did not exist, yet the journey of seeking itself was fulfilling."
 }
 
-# --- Metric Test Functions ---
-def run_audio_stt_and_translate_test(file_path, test_name, source_lang, target_lang):
-    results = {
-        "Test Name": test_name,
-        "Input Type": "Audio",
-        "Source Language": source_lang,
-        "Target Language": target_lang,
-        "Audio Duration (s)": 0.0,
-        "STT Latency (s)": 0.0,
-        "Translate Latency (s)": 0.0,
-        "Total API Latency (s)": 0.0,
-        "STT Cost (USD)": 0.0,
-        "Translate Cost (USD)": 0.0,
-        "Total API Cost (USD)": 0.0,
-        "STT Transcript": "",
-        "Translated Text": "",
-        "Notes": ""
-    }
-    
-    try:
-        audio_segment = AudioSegment.from_file(file_path)
-        results["Audio Duration (s)"] = len(audio_segment) / 1000.0
-
-        # Step 1: Speech-to-Text
-        transcript, detected_lang, stt_latency, stt_cost = call_stt_api(audio_segment, SARVAM_API_KEY, source_lang)
-        results["STT Latency (s)"] = stt_latency
-        results["STT Cost (USD)"] = stt_cost
-        results["STT Transcript"] = transcript
-        results["Notes"] += f"STT detected lang: {detected_lang}. "
-
-        if not transcript:
-            results["Notes"] += "STT returned empty transcript. "
-            return results
-
-        # Step 2: Translate
-        final_source_lang = detected_lang if source_lang == "auto" else source_lang
-        translated_text, translate_latency, translate_cost = call_translate_api(transcript, final_source_lang, target_lang, SARVAM_API_KEY)
-        results["Translate Latency (s)"] = translate_latency
-        results["Translate Cost (USD)"] = translate_cost
-        results["Translated Text"] = translated_text
-
-        results["Total API Latency (s)"] = stt_latency + translate_latency
-        results["Total API Cost (USD)"] = stt_cost + translate_cost
-
-    except FileNotFoundError:
-        results["Notes"] = f"Error: Audio file not found at {file_path}"
-    except Exception as e:
-        results["Notes"] = f"An unexpected error occurred: {e}"
-    
-    return results
-
-def run_text_translate_test(text_input, test_name, source_lang, target_lang):
-    results = {
-        "Test Name": test_name,
-        "Input Type": "Text",
-        "Source Language": source_lang,
-        "Target Language": target_lang,
-        "Text Length (chars)": len(text_input),
-        "Translate Latency (s)": 0.0,
-        "Translate Cost (USD)": 0.0,
-        "Translated Text": "",
-        "Notes": ""
-    }
-    
-    try:
-        translated_text, translate_latency, translate_cost = call_translate_api(text_input, source_lang, target_lang, SARVAM_API_KEY)
-        results["Translate Latency (s)"] = translate_latency
-        results["Translate Cost (USD)"] = translate_cost
-        results["Translated Text"] = translated_text
-        results["Total API Latency (s)"] = translate_latency
-        results["Total API Cost (USD)"] = translate_cost
-
-    except Exception as e:
-        results["Notes"] = f"An unexpected error occurred: {e}"
-    
-    return results
-
-def main():
-    print("--- Starting Metrics Test ---")
-    all_results = []
-
-    # --- Audio Tests ---
-    print("\nRunning Audio-to-Text & Translate Tests...")
-    for name, path in AUDIO_TEST_FILES.items():
-        print(f"Testing audio file: {name} ({path})...")
-        result = run_audio_stt_and_translate_test(path, f"Audio_{name}", TEST_SOURCE_LANGUAGE, TEST_TARGET_LANGUAGE)
-        all_results.append(result)
-        logging.info(f"Audio Test Result for {name}: Latency={result['Total API Latency (s)']:.4f}s, Cost=${result['Total API Cost (USD)']:.6f}")
-        logging.debug(f"STT: {result['STT Transcript']}")
-        logging.debug(f"Translation: {result['Translated Text']}")
-        print("-" * 30)
-
-    # --- Text-to-Text Tests ---
-    print("\nRunning Text-to-Text Translate Tests...")
-    for name, text in TEXT_TEST_CASES.items():
-        print(f"Testing text input: {name} (Length: {len(text)} chars)...")
-        result = run_text_translate_test(text, f"Text_{name}", TEST_SOURCE_LANGUAGE, TEST_TARGET_LANGUAGE)
-        all_results.append(result)
-        logging.info(f"Text Test Result for {name}: Latency={result['Translate Latency (s)']:.4f}s, Cost=${result['Translate Cost (USD)']:.6f}")
-        logging.debug(f"Original: {text}")
-        logging.debug(f"Translation: {result['Translated Text']}")
-        print("-" * 30)
-
-    print("\n--- Test Summary ---")
-    for result in all_results:
-        print(f"\n{result['Test Name']}:")
-        print(f"  Input Type: {result['Input Type']}")
-        if result["Input Type"] == "Audio":
-            print(f"  Audio Duration: {result['Audio Duration (s)']:.2f}s")
-            print(f"  STT Latency: {result['STT Latency (s)']:.4f}s")
-            print(f"  STT Cost: ${result['STT Cost (USD)']:.6f}")
-            print(f"  STT Transcript: {result['STT Transcript'][:100]}...")
-        
-        print(f"  Translation Latency: {result['Translate Latency (s)']:.4f}s")
-        print(f"  Translation Cost: ${result['Translate Cost (USD)']:.6f}")
-        print(f"  Total API Latency: {result['Total API Latency (s)']:.4f}s")
-        print(f"  Total API Cost: ${result['Total API Cost (USD)']:.6f}")
-        print(f"  Translated Text: {result['Translated Text'][:100]}...")
-        if result["Notes"]:
-            print(f"  Notes: {result['Notes']}")
-    
-    print("\n--- Important Notes for your Demo Video ---")
-    print("1. Accuracy Assessment:")
-    print("   To calculate accuracy (e.g., Word Error Rate for ASR, BLEU score for NMT), you need a 'ground truth' dataset (human-verified transcripts and translations).")
-    print("   Manually compare the 'STT Transcript' and 'Translated Text' outputs from the logs above with your ground truth data.")
-    print("   Automated tools for WER/BLEU would require installing additional libraries and providing labeled datasets.")
-    print("\n2. Cost Calculation in Rupees:")
-    print(f"   The costs above are in USD, based on the dummy rates (STT: ${COST_PER_SECOND_STT_USD}/s, Translate: ${COST_PER_CHAR_TRANSLATE_USD}/char).")
-    print("   To convert to Rupees, multiply by the current USD to INR exchange rate (e.g., 1 USD = 83 INR).")
-    print("   Total cost for a demo scenario: Sum all 'Total API Cost (USD)' values and convert to INR.")
-    print("\n3. Space & Time Complexity:")
-    print("   These are theoretical measures, not runtime metrics displayed by the API or this script.")
-    print("   - Time Complexity (API): For each API call, it's effectively O(1) from the client's perspective (a network request to a complex backend).")
-    print("   - Time Complexity (Client-side): Audio buffering, string concatenation, and history management are highly efficient for typical inputs. String operations are optimized, and history is a fixed small size (O(1)).")
-    print("   - Space Complexity (Client-side): Memory usage scales with audio chunk size, accumulated text, and history. Remains low.")
-    print("   You can explain these concepts as part of your demo narration, referring to the efficient design.")
-    print("\n--- Test Complete ---")
+
+# --- Corpora ---
+def _files_in(path: str, extensions: tuple) -> list:
+    if os.path.isfile(path):
+        return [path]
+    found = []
+    for root, _, names in os.walk(path):
+        for name in sorted(names):
+            if name.lower().endswith(extensions):
+                found.append(os.path.join(root, name))
+    return found
+
+
+def load_text_corpus(path: str = None) -> list:
+    """Paragraphs (blank-line separated) from a text file or directory, or the built-in cases"""
+    if not path:
+        return list(TEXT_TEST_CASES.values())
+    texts = []
+    for file_path in _files_in(path, TEXT_EXTENSIONS):
+        with open(file_path, "r", encoding="utf-8") as f:
+            texts.extend(p.strip() for p in f.read().split("\n\n") if p.strip())
+    if not texts:
+        raise SystemExit(f"No text found in {path}")
+    return texts
+
+
+def create_dummy_audio(duration_sec: float, sample_rate: int = 16000) -> bytes:
+    """A WAV tone for runs without recorded speech (STT will return junk or nothing)."""
+    t = np.arange(int(duration_sec * sample_rate)) / sample_rate
+    samples = (6000 * np.sin(2 * np.pi * 220 * t)).astype(np.int16)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(samples.tobytes())
+    return out.getvalue()
+
+
+def load_audio_corpus(path: str = None) -> list:
+    """(filename, bytes, seconds) for every audio file, or synthetic 5/15/30 s clips"""
+    if not path:
+        return [(f"dummy_{s}s.wav", create_dummy_audio(s), float(s)) for s in (5, 15, 30)]
+    clips = []
+    for file_path in _files_in(path, AUDIO_EXTENSIONS):
+        with open(file_path, "rb") as f:
+            content = f.read()
+        seconds = 0.0
+        if file_path.lower().endswith(".wav"):
+            try:
+                with wave.open(io.BytesIO(content)) as w:
+                    seconds = w.getnframes() / float(w.getframerate())
+            except (wave.Error, EOFError):
+                pass
+        clips.append((os.path.basename(file_path), content, seconds))
+    if not clips:
+        raise SystemExit(f"No audio files found in {path}")
+    return clips
+
+
+def load_document_corpus(path: str = None, texts: list = None) -> list:
+    """(filename, bytes) for every document, or a .txt built from the text corpus"""
+    if not path:
+        body = "\n\n".join(texts or TEXT_TEST_CASES.values())
+        return [("sample.txt", body.encode("utf-8"))]
+    docs = []
+    for file_path in _files_in(path, DOCUMENT_EXTENSIONS):
+        with open(file_path, "rb") as f:
+            docs.append((os.path.basename(file_path), f.read()))
+    if not docs:
+        raise SystemExit(f"No documents found in {path}")
+    return docs
+
+
+# --- Requests ---
+class LoadTest:
+    """Drives the backend endpoints and records one result row per request"""
+
+    def __init__(self, args):
+        self.args = args
+        self.rng = random.Random(args.seed)
+        self.texts = load_text_corpus(args.text_corpus)
+        self.audio = load_audio_corpus(args.audio_corpus) if "stt" in args.mix else []
+        self.documents = load_document_corpus(args.doc_corpus, self.texts) if "document" in args.mix else []
+        self.endpoints = list(args.mix)
+        self.weights = [args.mix[e] for e in self.endpoints]
+        self.results = []
+        self.in_flight = 0
+        self.started = 0.0
+
+    def _request_for(self, endpoint: str):
+        """Build (kwargs for httpx, units) for one request; units feed the cost estimate"""
+        args = self.args
+        if endpoint == "translate":
+            text = self.rng.choice(self.texts)
+            payload = {"input": text, "source_language_code": args.source, "target_language_code": args.target,
+                       "speaker_gender": "Male", "mode": "formal", "model": "mayura:v1",
+                       "enable_preprocessing": True}
+            if args.no_cache:
+                # Defeat the backend translation cache so every request reaches upstream
+                payload["input"] = f"{text} [{self.rng.getrandbits(32):08x}]"
+            return {"json": payload}, {"chars": len(payload["input"])}
+        if endpoint == "tts":
+            text = self.rng.choice(self.texts)[:500]
+            payload = {"inputs": [text], "target_language_code": args.target, "speaker": "meera",
+                       "model": "bulbul:v1"}
+            return {"json": payload}, {"chars": len(text)}
+        if endpoint == "stt":
+            name, content, seconds = self.rng.choice(self.audio)
+            return {"files": {"file": (name, content, "audio/wav" if name.endswith(".wav") else "application/octet-stream")},
+                    "data": {"language_code": args.source}}, {"audio_seconds": seconds}
+        name, content = self.rng.choice(self.documents)
+        return {"files": {"file": (name, content, "application/octet-stream")},
+                "data": {"source_language_code": args.source, "target_language_code": args.target}}, {"bytes": len(content)}
+
+    async def one(self, client: httpx.AsyncClient, endpoint: str):
+        kwargs, units = self._request_for(endpoint)
+        row = {"endpoint": endpoint, "start": round(time.perf_counter() - self.started, 6),
+               "latency": 0.0, "status": None, "ok": False, "error": "", "response_bytes": 0, **units}
+        self.in_flight += 1
+        began = time.perf_counter()
+        try:
+            response = await client.post(ENDPOINTS[endpoint], **kwargs)
+            row["status"] = response.status_code
+            row["response_bytes"] = len(response.content)
+            row["ok"] = response.status_code < 400
+            if not row["ok"]:
+                row["error"] = response.text[:200]
+        except httpx.HTTPError as e:
+            row["error"] = f"{type(e).__name__}: {e}"
+        finally:
+            row["latency"] = round(time.perf_counter() - began, 6)
+            self.in_flight -= 1
+        if not row["ok"]:
+            logging.debug(f"{endpoint} failed: {row['status']} {row['error']}")
+        self.results.append(row)
+
+    def pick(self) -> str:
+        return self.rng.choices(self.endpoints, weights=self.weights)[0]
+
+    def _done(self, issued: int) -> bool:
+        if self.args.requests and issued >= self.args.requests:
+            return True
+        return time.perf_counter() - self.started >= self.args.duration
+
+    async def closed_loop(self, client: httpx.AsyncClient):
+        """`concurrency` workers each send their next request as soon as the previous one finishes"""
+        issued = 0
+
+        async def worker():
+            nonlocal issued
+            while not self._done(issued):
+                issued += 1
+                await self.one(client, self.pick())
+
+        await asyncio.gather(*(worker() for _ in range(self.args.concurrency)))
+
+    async def open_loop(self, client: httpx.AsyncClient):
+        """Poisson arrivals at `rate` requests/sec regardless of how fast responses come back"""
+        issued = 0
+        tasks = set()
+        next_at = time.perf_counter()
+        while not self._done(issued):
+            next_at += self.rng.expovariate(self.args.rate)
+            await asyncio.sleep(max(next_at - time.perf_counter(), 0))
+            issued += 1
+            endpoint = self.pick()
+            if self.in_flight >= self.args.max_in_flight:
+                # The client itself is saturated: count it as a failure rather than silently queueing
+                self.results.append({"endpoint": endpoint, "start": round(time.perf_counter() - self.started, 6),
+                                     "latency": 0.0, "status": None, "ok": False,
+                                     "error": "client max-in-flight exceeded", "response_bytes": 0})
+                continue
+            task = asyncio.ensure_future(self.one(client, endpoint))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        if tasks:
+            await asyncio.gather(*tasks)
+
+    async def run(self):
+        limits = httpx.Limits(max_connections=max(self.args.concurrency, self.args.max_in_flight),
+                              max_keepalive_connections=max(self.args.concurrency, 100))
+        timeout = httpx.Timeout(self.args.timeout, connect=10)
+        async with httpx.AsyncClient(base_url=self.args.url, limits=limits, timeout=timeout) as client:
+            if self.args.warmup:
+                logging.info(f"Warming up with {self.args.warmup} request(s) per endpoint...")
+                await asyncio.gather(*(self.one(client, e) for e in self.endpoints for _ in range(self.args.warmup)))
+                self.results.clear()
+            self.started = time.perf_counter()
+            if self.args.rate:
+                await self.open_loop(client)
+            else:
+                await self.closed_loop(client)
+            return time.perf_counter() - self.started
+
+
+# --- Reporting ---
+def percentile(sorted_values: list, q: float) -> float:
+    """Linear-interpolated percentile (q in 0..100) of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    pos = (len(sorted_values) - 1) * q / 100.0
+    lower = int(pos)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (pos - lower)
+
+
+def summarize(rows: list, elapsed: float) -> dict:
+    """Per-endpoint and overall latency percentiles, throughput, error rate and estimated upstream cost"""
+    groups = {}
+    for row in rows:
+        groups.setdefault(row["endpoint"], []).append(row)
+    groups["all"] = rows
+    summary = {}
+    for name, group in groups.items():
+        ok = [r for r in group if r["ok"]]
+        latencies = sorted(r["latency"] for r in ok)
+        cost = sum(r.get("chars", 0) for r in ok if r["endpoint"] == "translate") * COST_PER_CHAR_TRANSLATE_USD
+        cost += sum(r.get("chars", 0) for r in ok if r["endpoint"] == "tts") * COST_PER_CHAR_TTS_USD
+        cost += sum(r.get("audio_seconds", 0) for r in ok) * COST_PER_SECOND_STT_USD
+        statuses = {}
+        for r in group:
+            key = str(r["status"]) if r["status"] is not None else "transport_error"
+            statuses[key] = statuses.get(key, 0) + 1
+        summary[name] = {
+            "requests": len(group),
+            "succeeded": len(ok),
+            "errors": len(group) - len(ok),
+            "error_rate": round((len(group) - len(ok)) / len(group), 4) if group else 0.0,
+            "throughput_rps": round(len(ok) / elapsed, 3) if elapsed else 0.0,
+            "latency_mean": round(sum(latencies) / len(latencies), 4) if latencies else 0.0,
+            "latency_p50": round(percentile(latencies, 50), 4),
+            "latency_p95": round(percentile(latencies, 95), 4),
+            "latency_p99": round(percentile(latencies, 99), 4),
+            "latency_max": round(latencies[-1], 4) if latencies else 0.0,
+            "statuses": statuses,
+            "estimated_cost_usd": round(cost, 6),
+        }
+    return summary
+
+
+def write_results(prefix: str, config: dict, summary: dict, rows: list, elapsed: float):
+    """<prefix>.json (config + summary), <prefix>_summary.csv and <prefix>_requests.csv"""
+    directory = os.path.dirname(prefix)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(f"{prefix}.json", "w", encoding="utf-8") as f:
+        json.dump({"config": config, "elapsed_seconds": round(elapsed, 3), "summary": summary}, f, indent=2)
+
+    summary_fields = ["endpoint", "requests", "succeeded", "errors", "error_rate", "throughput_rps", "latency_mean",
+                      "latency_p50", "latency_p95", "latency_p99", "latency_max", "estimated_cost_usd"]
+    with open(f"{prefix}_summary.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=summary_fields, extrasaction="ignore")
+        writer.writeheader()
+        for endpoint, stats in summary.items():
+            writer.writerow({"endpoint": endpoint, **stats})
+
+    request_fields = ["endpoint", "start", "latency", "status", "ok", "error", "response_bytes",
+                      "chars", "audio_seconds", "bytes"]
+    with open(f"{prefix}_requests.csv", "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=request_fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+
+def print_summary(summary: dict, elapsed: float):
+    print(f"\n--- Load Test Summary ({elapsed:.1f}s) ---")
+    print(f"{'endpoint':<10} {'reqs':>7} {'err%':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'max':>8}")
+    for endpoint, s in summary.items():
+        print(f"{endpoint:<10} {s['requests']:>7} {s['error_rate'] * 100:>6.2f}% {s['throughput_rps']:>8.2f} "
+              f"{s['latency_p50']:>8.3f} {s['latency_p95']:>8.3f} {s['latency_p99']:>8.3f} {s['latency_max']:>8.3f}")
+    print(f"Estimated upstream cost: ${summary.get('all', {}).get('estimated_cost_usd', 0):.6f} "
+          f"(dummy rates, multiply by the USD to INR rate for rupees)")
+
+
+def parse_mix(value: str) -> dict:
+    """"translate:3,stt:1" -> {"translate": 3.0, "stt": 1.0}; weights default to 1"""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.strip().partition(":")
+        if name not in ENDPOINTS:
+            raise argparse.ArgumentTypeError(f"Unknown endpoint '{name}', choose from {', '.join(ENDPOINTS)}")
+        mix[name] = float(weight) if weight else 1.0
+    return mix
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Concurrent end-to-end load generator for the ShikshaLok backend")
+    parser.add_argument("--url", default=SHIKSHA_API_URL, help="Backend base URL (default: %(default)s)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("translate"),
+                        help="Endpoints and weights, e.g. translate:3,stt:1,tts:1,document:0.2")
+    parser.add_argument("--concurrency", type=int, default=10, help="Closed-loop workers (ignored with --rate)")
+    parser.add_argument("--rate", type=float, default=0.0, help="Open-loop Poisson arrival rate in requests/sec")
+    parser.add_argument("--max-in-flight", type=int, default=1000, help="Open-loop cap on outstanding requests")
+    parser.add_argument("--duration", type=float, default=30.0, help="Test length in seconds")
+    parser.add_argument("--requests", type=int, default=0, help="Stop after this many requests instead")
+    parser.add_argument("--warmup", type=int, default=1, help="Unrecorded requests per endpoint before the run")
+    parser.add_argument("--timeout", type=float, default=300.0, help="Per-request read timeout in seconds")
+    parser.add_argument("--text-corpus", help="Text file or directory (paragraphs separated by blank lines)")
+    parser.add_argument("--audio-corpus", help="Audio file or directory for /api/speech-to-text")
+    parser.add_argument("--doc-corpus", help="Document file or directory for /api/document-translate")
+    parser.add_argument("--source", default=TEST_SOURCE_LANGUAGE)
+    parser.add_argument("--target", default=TEST_TARGET_LANGUAGE)
+    parser.add_argument("--no-cache", action="store_true", help="Make every translate input unique")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=f"metrics/loadtest_{datetime.now().strftime('%Y%m%d_%H%M%S')}",
+                        help="Output prefix for the JSON and CSV results")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.concurrency < 1 or args.rate < 0:
+        raise SystemExit("--concurrency must be >= 1 and --rate >= 0")
+    mode = f"open loop at {args.rate}/s" if args.rate else f"closed loop with {args.concurrency} workers"
+    logging.info(f"Load testing {args.url} ({', '.join(args.mix)}), {mode}")
+
+    test = LoadTest(args)
+    elapsed = asyncio.run(test.run())
+    summary = summarize(test.results, elapsed)
+    config = {k: v for k, v in vars(args).items()}
+    config["started_at"] = datetime.now().isoformat()
+    write_results(args.output, config, summary, test.results, elapsed)
+    print_summary(summary, elapsed)
+    print(f"\nResults written to {args.output}.json, {args.output}_summary.csv and {args.output}_requests.csv")
+    return 0 if summary.get("all", {}).get("requests") else 1
+
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    sys.exit(main())
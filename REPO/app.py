@@ -6,11 +6,12 @@ import requests
 import io
 from pydub import AudioSegment
 
-# Replace 'your_api_key_here' with your actual Sarvam AI API key
-SARVAM_API_KEY = "sk_aov2qcwm_v6DDreRZzU6ntWRM5ixh8voS"
+# Set SARVAM_API_KEYS (comma separated, first key is used) or SARVAM_API_KEY
+from sarvam_keys import sarvam_api_key
+SARVAM_API_KEY = sarvam_api_key()
 
 def translate_audio(audio, input_language_code, output_language_code):
-    api_url = "https://api.sarvam.ai/speech-to-text-translate"
+    api_url = os.getenv("SARVAM_BASE_URL", "https://api.sarvam.ai").rstrip("/") + "/speech-to-text-translate"
     headers = {
         "api-subscription-key": SARVAM_API_KEY
     }
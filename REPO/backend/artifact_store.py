@@ -0,0 +1,148 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+
+# Artifact store settings (override with environment variables); an empty directory disables it
+ARTIFACT_STORE_DIR = os.getenv("ARTIFACT_STORE_DIR", os.path.join(tempfile.gettempdir(), "shiksha_artifacts"))
+ARTIFACT_STORE_MAX_BYTES = int(os.getenv("ARTIFACT_STORE_MAX_BYTES", str(2 * 1024 * 1024 * 1024)))
+ARTIFACT_TTL = float(os.getenv("ARTIFACT_TTL", str(7 * 24 * 3600)))
+
+META_SUFFIX = ".meta.json"
+
+
+class ArtifactStore:
+    """Disk store of generated outputs (translated documents, dubbed videos).
+
+    An artifact is a file plus a small metadata sidecar, both named after a
+    key derived from the request's input and options. Reads return a path so
+    the file can be streamed to the client without loading it. Entries
+    expire after `ttl` seconds, and once the store passes `max_bytes` the
+    least recently served artifacts are removed. Pass directory=None or ""
+    to disable."""
+
+    def __init__(self, directory: str = ARTIFACT_STORE_DIR, max_bytes: int = ARTIFACT_STORE_MAX_BYTES, ttl: float = ARTIFACT_TTL):
+        self.directory = directory or None
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self._bytes = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.is_file())
+            except OSError as e:
+                logging.warning(f"Artifact store disabled ({self.directory}): {e}")
+                self.directory = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    @staticmethod
+    def make_key(input_id: str, kind: str, version: str = "1", **options) -> str:
+        """Key over the input identity (content hash or URL), the kind of output, its options and the pipeline version"""
+        raw = json.dumps({"input": input_id, "kind": kind, "version": version, "options": options},
+                         ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def _paths(self, key: str):
+        return os.path.join(self.directory, key), os.path.join(self.directory, key + META_SUFFIX)
+
+    def get(self, key: str):
+        """(path, metadata) of a live artifact, or None"""
+        if not self.directory:
+            return None
+        path, meta_path = self._paths(key)
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if time.time() - meta.get("created", 0) > self.ttl:
+                self._remove(key)
+                self.misses += 1
+                return None
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return path, meta
+
+    def put(self, key: str, file_path: str, **meta) -> str:
+        """Move a generated file into the store and return its new path (the original path if disabled or on error)"""
+        if not self.directory:
+            return file_path
+        path, meta_path = self._paths(key)
+        try:
+            size = os.path.getsize(file_path)
+            if size > self.max_bytes:
+                return file_path
+            # Move next to the target first so the final rename is atomic
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            os.close(fd)
+            shutil.move(file_path, tmp_path)
+            with self._lock:
+                previous = sum(os.path.getsize(p) for p in (path, meta_path) if os.path.exists(p))
+                os.replace(tmp_path, path)
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump({**meta, "created": time.time(), "size": size}, f, ensure_ascii=False)
+                self._bytes += size + os.path.getsize(meta_path) - previous
+                self.stores += 1
+                if self._bytes > self.max_bytes:
+                    self._evict(keep=key)
+            return path
+        except OSError as e:
+            logging.warning(f"Artifact store write failed: {e}")
+            return file_path if os.path.exists(file_path) else path
+
+    def _remove(self, key: str) -> int:
+        freed = 0
+        for p in self._paths(key):
+            try:
+                freed += os.path.getsize(p)
+                os.unlink(p)
+            except OSError:
+                pass
+        self._bytes = max(0, self._bytes - freed)
+        return freed
+
+    def _evict(self, keep: str = None):
+        """Drop expired artifacts, then least recently served ones until the store is at 90% of its quota"""
+        now = time.time()
+        entries = []
+        for entry in os.scandir(self.directory):
+            if not entry.is_file() or entry.name.endswith((META_SUFFIX, ".tmp")):
+                continue
+            try:
+                st = entry.stat()
+            except OSError:
+                continue
+            entries.append((st.st_mtime, entry.name))
+        entries.sort()
+        target = int(self.max_bytes * 0.9)
+        for mtime, key in entries:
+            if key == keep:
+                continue
+            if now - mtime > self.ttl or self._bytes > target:
+                self._remove(key)
+                self.evictions += 1
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.directory is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+            "ttl": self.ttl,
+        }
@@ -0,0 +1,333 @@
+"""Throughput benchmark for the document text extractors.
+
+Generates DOCX, PDF, PPTX, XLSX, CSV and image corpora at increasing sizes,
+then runs every extractor (and every PDF engine separately) in a fresh
+subprocess to record pages/sec, time to first text and peak RSS.
+
+    python benchmarks/bench_extract.py --sizes 1,10,50 --formats pdf,docx
+    python benchmarks/bench_extract.py --corpus-dir /tmp/extract_corpus --keep-corpus
+
+Results are written as JSON plus a Markdown comparison report.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import random
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import SAMPLES  # noqa: E402
+
+try:
+    import resource
+    RESOURCE_AVAILABLE = True
+except ImportError:
+    RESOURCE_AVAILABLE = False
+
+# Size unit per format, and how many of them one "size" step generates
+UNITS = {
+    "docx": ("pages", 1),
+    "pdf": ("pages", 1),
+    "pptx": ("slides", 1),
+    "xlsx": ("rows", 100),
+    "csv": ("rows", 100),
+    "image": ("images", 1),
+}
+
+# Extractors per format; PDF gets one entry per engine plus the production fallback chain,
+# both as the streaming page generator and the whole-document function
+EXTRACTORS = {
+    "docx": ["extract_segments_from_docx"],
+    "pdf": ["pdfplumber", "PyMuPDF", "PyPDF2", "iter_pdf_pages", "extract_segments_from_pdf"],
+    "pptx": ["extract_segments_from_pptx"],
+    "xlsx": ["extract_segments_from_excel"],
+    "csv": ["extract_segments_from_csv"],
+    "image": ["extract_segments_from_image"],
+}
+
+# Availability flag in main that each non-PDF extractor depends on
+REQUIRES = {
+    "docx": "DOCX_AVAILABLE",
+    "pptx": "PPTX_AVAILABLE",
+    "xlsx": "EXCEL_AVAILABLE",
+    "csv": "EXCEL_AVAILABLE",
+    "image": "OCR_AVAILABLE",
+}
+
+PARAGRAPHS_PER_PAGE = 8
+
+
+def _sentences(rng: random.Random, count: int) -> str:
+    return " ".join(rng.choice(SAMPLES["english"]["sentence"]) for _ in range(count))
+
+
+# --- Corpus generation ---
+def make_docx(path: str, pages: int, rng: random.Random):
+    from docx import Document
+    from docx.enum.text import WD_BREAK
+
+    doc = Document()
+    for page in range(pages):
+        doc.add_heading(f"Chapter {page + 1}: {rng.choice(SAMPLES['english']['heading'])}", level=1)
+        for i in range(PARAGRAPHS_PER_PAGE):
+            if i % 3 == 2:
+                doc.add_paragraph(_sentences(rng, 1), style="List Bullet")
+            else:
+                doc.add_paragraph(_sentences(rng, 3))
+        doc.paragraphs[-1].add_run().add_break(WD_BREAK.PAGE)
+    doc.save(path)
+
+
+def make_pdf(path: str, pages: int, rng: random.Random):
+    import fitz
+
+    doc = fitz.open()
+    for page_no in range(pages):
+        page = doc.new_page()
+        body = [f"Chapter {page_no + 1} Overview", ""]
+        for i in range(PARAGRAPHS_PER_PAGE):
+            body.append(f"• {_sentences(rng, 1)}" if i % 3 == 2 else _sentences(rng, 2))
+        page.insert_textbox(fitz.Rect(50, 50, 545, 792), "\n".join(body), fontsize=10, fontname="helv")
+    doc.save(path)
+    doc.close()
+
+
+def make_pptx(path: str, slides: int, rng: random.Random):
+    from pptx import Presentation
+
+    prs = Presentation()
+    layout = prs.slide_layouts[1]
+    for i in range(slides):
+        slide = prs.slides.add_slide(layout)
+        slide.shapes.title.text = f"Slide {i + 1}: {rng.choice(SAMPLES['english']['heading'])}"
+        body = slide.placeholders[1].text_frame
+        body.text = _sentences(rng, 1)
+        for _ in range(4):
+            body.add_paragraph().text = _sentences(rng, 1)
+    prs.save(path)
+
+
+def _table_rows(rows: int, rng: random.Random):
+    header = ["Roll No", "Name", "Subject", "Marks", "Remarks", "Email"]
+    yield header
+    for i in range(rows):
+        yield [i + 1, f"Student {i + 1}", rng.choice(["Maths", "Science", "Hindi", "English"]),
+               rng.randint(30, 100), _sentences(rng, 1)[:80], f"student{i + 1}@example.edu"]
+
+
+def make_xlsx(path: str, rows: int, rng: random.Random):
+    import openpyxl
+
+    wb = openpyxl.Workbook()
+    sheet = wb.active
+    for row in _table_rows(rows, rng):
+        sheet.append(row)
+    wb.save(path)
+
+
+def make_csv(path: str, rows: int, rng: random.Random):
+    import csv
+
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        csv.writer(f).writerows(_table_rows(rows, rng))
+
+
+def make_images(path: str, images: int, rng: random.Random):
+    """A directory of page-sized PNG scans, one text page per image"""
+    from PIL import Image, ImageDraw
+
+    os.makedirs(path, exist_ok=True)
+    for i in range(images):
+        image = Image.new("RGB", (1240, 1754), "white")
+        draw = ImageDraw.Draw(image)
+        y = 60
+        while y < 1680:
+            draw.text((60, y), _sentences(rng, 1)[:110], fill="black")
+            y += 28
+        image.save(os.path.join(path, f"page_{i + 1:04d}.png"))
+
+
+GENERATORS = {
+    "docx": (make_docx, ".docx"),
+    "pdf": (make_pdf, ".pdf"),
+    "pptx": (make_pptx, ".pptx"),
+    "xlsx": (make_xlsx, ".xlsx"),
+    "csv": (make_csv, ".csv"),
+    "image": (make_images, ""),
+}
+
+
+def build_corpus(directory: str, formats: list, sizes: list, seed: int = 0) -> list:
+    """Generate (format, size, units, path) for every requested format and size, reusing existing files"""
+    corpus = []
+    for fmt in formats:
+        generate, ext = GENERATORS[fmt]
+        _, per_size = UNITS[fmt]
+        for size in sizes:
+            units = size * per_size
+            path = os.path.join(directory, f"{fmt}_{size}{ext}")
+            if not os.path.exists(path):
+                started = time.perf_counter()
+                try:
+                    generate(path, units, random.Random(f"{fmt}:{size}:{seed}"))
+                except ImportError as e:
+                    print(f"Skipping {fmt}: generator dependency missing ({e})")
+                    break
+                print(f"Generated {path} ({units} {UNITS[fmt][0]}) in {time.perf_counter() - started:.1f}s")
+            corpus.append((fmt, size, units, path))
+    return corpus
+
+
+# --- Measurement (runs in a fresh subprocess per case) ---
+def _max_rss_kb() -> int:
+    if not RESOURCE_AVAILABLE:
+        return 0
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_worker(fmt: str, extractor: str, path: str) -> dict:
+    sys.path.insert(0, BACKEND_DIR)
+    import main
+
+    # PDF engines and iter_pdf_pages yield (page_number, segments) as pages are parsed
+    paged = fmt == "pdf" and extractor != "extract_segments_from_pdf"
+    if paged and extractor != "iter_pdf_pages":
+        engines = {name: (available, fn) for name, available, fn in main.PDF_ENGINES}
+        available, fn = engines[extractor]
+        if not available:
+            return {"error": f"{extractor} not installed"}
+    else:
+        # Unavailable extractors return an instant placeholder message, which would look impossibly fast
+        flag = REQUIRES.get(fmt)
+        if flag and not getattr(main, flag, False):
+            return {"error": f"{extractor} unavailable ({flag} is False)"}
+        fn = getattr(main, extractor)
+
+    files = sorted(os.path.join(path, f) for f in os.listdir(path)) if os.path.isdir(path) else [path]
+    rss_before = _max_rss_kb()
+
+    first_text = None
+    chars = 0
+    started = time.perf_counter()
+    for i, file_path in enumerate(files):
+        if paged:
+            for _, segments in fn(file_path):
+                chars += sum(len(segment.text) for segment in segments)
+                if first_text is None:
+                    first_text = time.perf_counter() - started
+        else:
+            segments = fn(file_path) or []
+            chars += sum(len(segment.text) for segment in segments)
+        if first_text is None and i == 0:
+            # Whole-document extractors only yield text once the first file is done
+            first_text = time.perf_counter() - started
+    seconds = time.perf_counter() - started
+
+    return {
+        "seconds": seconds,
+        "first_text_seconds": first_text,
+        "chars": chars,
+        "rss_baseline_kb": rss_before,
+        "rss_peak_kb": _max_rss_kb(),
+    }
+
+
+def measure(fmt: str, extractor: str, path: str, timeout: float) -> dict:
+    command = [sys.executable, os.path.abspath(__file__), "--worker", fmt, extractor, path]
+    try:
+        proc = subprocess.run(command, capture_output=True, text=True, timeout=timeout, cwd=BACKEND_DIR)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout:.0f}s"}
+    lines = [l for l in proc.stdout.strip().splitlines() if l.startswith("{")]
+    if proc.returncode != 0 or not lines:
+        return {"error": (proc.stderr.strip().splitlines() or ["worker failed"])[-1][:200]}
+    return json.loads(lines[-1])
+
+
+# --- Reporting ---
+def markdown_report(results: list) -> str:
+    lines = ["# Extractor benchmark", "",
+             "| format | extractor | size | units | units/sec | first text (s) | total (s) | chars | peak RSS delta (MiB) |",
+             "|---|---|---|---|---|---|---|---|---|"]
+    for r in results:
+        if "error" in r:
+            lines.append(f"| {r['format']} | {r['extractor']} | {r['size']} | {r['units']} {r['unit']} | — | — | — | — | {r['error']} |")
+            continue
+        first = f"{r['first_text_seconds']:.3f}" if r["first_text_seconds"] is not None else "—"
+        lines.append(
+            f"| {r['format']} | {r['extractor']} | {r['size']} | {r['units']} {r['unit']} | {r['units_per_sec']:.1f} "
+            f"| {first} | {r['seconds']:.3f} | {r['chars']} | {r['rss_delta_kb'] / 1024:.1f} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark document text extractors over a generated corpus")
+    parser.add_argument("--formats", default=",".join(GENERATORS), help=f"Comma separated, from {', '.join(GENERATORS)}")
+    parser.add_argument("--sizes", default="1,10,50", help="Size steps (pages, slides, 100s of rows, images)")
+    parser.add_argument("--corpus-dir", help="Where to generate (and reuse) the corpus; a temp dir by default")
+    parser.add_argument("--keep-corpus", action="store_true", help="Keep a temporary corpus after the run")
+    parser.add_argument("--timeout", type=float, default=600.0, help="Seconds allowed per extraction")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                                         f"extract_{datetime.now().strftime('%Y%m%d_%H%M%S')}"),
+                        help="Output prefix for the .json and .md results")
+    parser.add_argument("--worker", nargs=3, metavar=("FORMAT", "EXTRACTOR", "PATH"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker:
+        print(json.dumps(run_worker(*args.worker)))
+        return
+
+    formats = [f for f in args.formats.split(",") if f]
+    unknown = set(formats) - set(GENERATORS)
+    if unknown:
+        raise SystemExit(f"Unknown format(s): {', '.join(sorted(unknown))}")
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+
+    corpus_dir = args.corpus_dir or tempfile.mkdtemp(prefix="extract_corpus_")
+    os.makedirs(corpus_dir, exist_ok=True)
+    results = []
+    try:
+        for fmt, size, units, path in build_corpus(corpus_dir, formats, sizes, args.seed):
+            unit = UNITS[fmt][0]
+            for extractor in EXTRACTORS[fmt]:
+                row = {"format": fmt, "extractor": extractor, "size": size, "units": units, "unit": unit,
+                       "file_bytes": sum(os.path.getsize(os.path.join(path, f)) for f in os.listdir(path))
+                       if os.path.isdir(path) else os.path.getsize(path)}
+                stats = measure(fmt, extractor, path, args.timeout)
+                if "error" not in stats:
+                    stats["units_per_sec"] = units / stats["seconds"] if stats["seconds"] else 0.0
+                    stats["rss_delta_kb"] = stats["rss_peak_kb"] - stats["rss_baseline_kb"]
+                    print(f"{fmt:<6} {extractor:<24} {units:>6} {unit:<7} {stats['units_per_sec']:>9.1f}/s  "
+                          f"first {stats['first_text_seconds'] or 0:>7.3f}s  peak RSS +{stats['rss_delta_kb'] / 1024:.1f} MiB")
+                else:
+                    print(f"{fmt:<6} {extractor:<24} {units:>6} {unit:<7} {stats['error']}")
+                row.update(stats)
+                results.append(row)
+    finally:
+        if not args.corpus_dir and not args.keep_corpus:
+            shutil.rmtree(corpus_dir, ignore_errors=True)
+        elif args.keep_corpus:
+            print(f"Corpus kept in {corpus_dir}")
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(f"{args.output}.json", "w", encoding="utf-8") as f:
+        json.dump({"meta": {"created": datetime.now().isoformat(), "python": sys.version.split()[0]},
+                   "results": results}, f, indent=2)
+    with open(f"{args.output}.md", "w", encoding="utf-8") as f:
+        f.write(markdown_report(results))
+    print(f"\nResults written to {args.output}.json and {args.output}.md")
+
+
+if __name__ == "__main__":
+    main_cli()
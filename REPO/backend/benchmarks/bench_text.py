@@ -0,0 +1,164 @@
+"""Micro-benchmarks for the backend text hot paths.
+
+Runs every benchmarked function over synthetic structured documents (or a
+real corpus tiled to size) from 1 KB to 10 MB in English and Indic scripts,
+and records ops/sec, throughput and peak allocation per case.
+
+    python benchmarks/bench_text.py --sizes 1KB,100KB,1MB --output benchmarks/results/current.json
+    python benchmarks/compare.py benchmarks/results/baseline.json benchmarks/results/current.json
+"""
+import os
+import sys
+import json
+import random
+import time
+import logging
+import argparse
+import platform
+import tracemalloc
+import subprocess
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from corpus import SAMPLES, SIZES, load_inputs  # noqa: E402
+
+
+def benchmarks(main) -> dict:
+    """name -> callable(text) for every benchmarked hot path"""
+    from simplification import RuleBasedSimplifier
+    from glossary import Glossary
+
+    preprocessor = main.preprocessor
+    rules = RuleBasedSimplifier()
+    # Synthetic subject glossary; apply() cost should not depend on its size
+    rng = random.Random(0)
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    synthetic_terms = {" ".join("".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+                                for _ in range(rng.randint(1, 3))): f"term{i}" for i in range(20000)}
+    synthetic_terms.update({"energy": "urja", "power supply": "bijli aapurti", "students": "vidyarthi"})
+    large_glossary = Glossary(synthetic_terms)
+    # Thousands of terms sharing a first word, some of which ("the", "and") run through every
+    # input: each occurrence should only follow the words that actually come next
+    prefixes = ("power", "electric", "the", "and")
+    shared_terms = {f"{prefixes[i % len(prefixes)]} "
+                    + " ".join("".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+                               for _ in range(rng.randint(1, 2))): f"shared{i}" for i in range(8000)}
+    shared_terms.update({"power supply": "bijli aapurti", "the office": "karyalay", "the infrastructure": "aadharbhoot dhancha"})
+    shared_prefix_glossary = Glossary(shared_terms)
+    return {
+        "chunk_text": lambda text: main.chunk_text(text, main.SARVAM_TRANSLATE_MAX_CHARS),
+        "_split_sentences": main._split_sentences,
+        "identify_line_type": lambda text: [main.identify_line_type(line) for line in text.split("\n")],
+        "format_translated_text_for_download": main.format_translated_text_for_download,
+        # The async localize_text_for_indian_context wraps this when no LLM backend is configured
+        "localize_text_for_indian_context": rules.simplify,
+        "decode_html_entities": main.decode_html_entities,
+        "TextPreprocessingPipeline.process": preprocessor.process,
+        "TextPreprocessingPipeline.process_many": lambda text: preprocessor.process_many(text.split("\n")),
+        "TextPreprocessingPipeline.process[stt]": lambda text: preprocessor.process(text, input_type="stt"),
+        "Glossary.apply[20k terms]": large_glossary.apply,
+        "Glossary.apply[8k shared-prefix terms]": shared_prefix_glossary.apply,
+    }
+
+
+def measure(fn, text: str, min_time: float, max_iterations: int) -> dict:
+    """Time repeated calls for at least `min_time` seconds, then trace one call's allocations"""
+    fn(text)  # warm caches and compiled regexes
+    iterations = 0
+    best = float("inf")
+    started = time.perf_counter()
+    while iterations < max_iterations:
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+        iterations += 1
+        if time.perf_counter() - started >= min_time:
+            break
+    elapsed = time.perf_counter() - started
+
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    base, _ = tracemalloc.get_traced_memory()
+    result = fn(text)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+
+    size = len(text.encode("utf-8"))
+    mean = elapsed / iterations
+    return {
+        "iterations": iterations,
+        "mean_seconds": mean,
+        "best_seconds": best,
+        "ops_per_sec": 1.0 / mean if mean else 0.0,
+        "mb_per_sec": size / mean / (1 << 20) if mean else 0.0,
+        "peak_alloc_bytes": peak - base,
+        "retained_bytes": current - base,
+        "alloc_per_input_byte": (peak - base) / size if size else 0.0,
+    }
+
+
+def git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR,
+                              capture_output=True, text=True, timeout=5).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return ""
+
+
+def run(args) -> dict:
+    import main
+
+    # Keep per-call INFO logging (e.g. from localization) out of the measurements
+    logging.getLogger().setLevel(logging.WARNING)
+    selected = benchmarks(main)
+    if args.functions:
+        wanted = set(args.functions.split(","))
+        selected = {k: v for k, v in selected.items() if k in wanted}
+    inputs = load_inputs(args.scripts.split(","), args.sizes.split(","), args.corpus)
+
+    results = []
+    for script, size_label, text in inputs:
+        for name, fn in selected.items():
+            stats = measure(fn, text, args.min_time, args.max_iterations)
+            results.append({"function": name, "input": script, "size": size_label,
+                            "bytes": len(text.encode("utf-8")), **stats})
+            print(f"{name:<38} {script:<8} {size_label:>6}  {stats['ops_per_sec']:>10.2f} ops/s  "
+                  f"{stats['mb_per_sec']:>8.2f} MB/s  peak {stats['peak_alloc_bytes'] / 1024:>10.1f} KiB")
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(),
+            "revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "min_time": args.min_time,
+        },
+        "results": results,
+    }
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark backend text hot paths")
+    parser.add_argument("--sizes", default=",".join(SIZES), help=f"Comma separated, from {', '.join(SIZES)}")
+    parser.add_argument("--scripts", default=",".join(SAMPLES), help=f"Comma separated, from {', '.join(SAMPLES)}")
+    parser.add_argument("--corpus", help="Real text file to tile to each size instead of synthetic input")
+    parser.add_argument("--functions", help="Only run these benchmarks (comma separated)")
+    parser.add_argument("--min-time", type=float, default=1.0, help="Seconds to spend timing each case")
+    parser.add_argument("--max-iterations", type=int, default=10000)
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                                         f"text_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,188 @@
+"""Benchmark of the video dubbing pipeline (_dub_video) against the fake Sarvam server.
+
+Generates MP4s whose soundtrack alternates synthetic speech bursts and
+silence at a chosen length and segment density, starts fake_sarvam.py as
+the upstream, and runs each video through audio extraction, VAD,
+per-segment STT/translate/TTS, atempo fitting, overlay and mux.
+Reports seconds per stage and the end-to-end real-time factor
+(processing time / media duration).
+
+    python benchmarks/bench_video.py --durations 30,120 --densities 6,20 \\
+        --fake-latency lognormal:-1.5,0.4
+
+Needs ffmpeg and ffprobe on PATH, like the endpoint itself.
+"""
+import os
+import sys
+import json
+import time
+import wave
+import shutil
+import asyncio
+import logging
+import argparse
+import tempfile
+import subprocess
+from datetime import datetime
+
+import numpy as np
+import httpx
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SAMPLE_RATE = 16000
+
+# Report stages in pipeline order
+STAGES = ["extract_audio", "decode_audio", "detect_gender", "detect_nonsilent", "stt", "translate", "tts",
+          "atempo", "overlay", "export_audio", "sync_audio", "mux"]
+
+
+# --- Media generation ---
+def speech_like(seconds: float, rng: np.random.Generator) -> np.ndarray:
+    """Voiced harmonics with a ~4 Hz syllable envelope, loud enough to pass the -35 dBFS VAD threshold"""
+    t = np.arange(int(seconds * SAMPLE_RATE)) / SAMPLE_RATE
+    pitch = rng.uniform(110, 220)
+    signal = sum(np.sin(2 * np.pi * pitch * k * t) / k for k in range(1, 6))
+    envelope = 0.55 + 0.45 * np.sin(2 * np.pi * rng.uniform(3, 5) * t)
+    return 0.4 * signal * envelope / 2.3
+
+
+def build_soundtrack(duration: float, density: float, mean_segment: float, seed: int) -> tuple:
+    """Mono 16 kHz samples with roughly `density` speech segments per minute, plus the planned segment count"""
+    rng = np.random.default_rng(seed)
+    total = int(duration * SAMPLE_RATE)
+    audio = rng.normal(0, 0.002, total)  # quiet room noise, well below the VAD threshold
+    planned = max(1, int(round(duration / 60.0 * density)))
+    slot = duration / planned
+    for i in range(planned):
+        length = min(max(rng.normal(mean_segment, mean_segment / 3), 0.5), slot * 0.8)
+        start = i * slot + rng.uniform(0, slot - length)
+        a, b = int(start * SAMPLE_RATE), int((start + length) * SAMPLE_RATE)
+        audio[a:b] += speech_like((b - a) / SAMPLE_RATE, rng)
+    return (np.clip(audio, -1, 1) * 32767).astype(np.int16), planned
+
+
+def write_video(path: str, samples: np.ndarray):
+    """Mux the soundtrack with a small solid-colour video stream"""
+    wav_path = path + ".wav"
+    with wave.open(wav_path, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(samples.tobytes())
+    duration = len(samples) / SAMPLE_RATE
+    cmd = ["ffmpeg", "-y", "-f", "lavfi", "-i", f"color=c=black:s=320x240:r=10:d={duration:.3f}",
+           "-i", wav_path, "-c:v", "libx264", "-preset", "ultrafast", "-c:a", "aac", "-shortest", path]
+    subprocess.run(cmd, check=True, capture_output=True)
+    os.unlink(wav_path)
+
+
+# --- Fake upstream ---
+def start_fake_sarvam(port: int, latency: str) -> subprocess.Popen:
+    env = {**os.environ, "FAKE_SARVAM_LATENCY": latency}
+    proc = subprocess.Popen([sys.executable, os.path.join(BACKEND_DIR, "fake_sarvam.py"), "--port", str(port)],
+                            env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    deadline = time.time() + 20
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/fake/stats", timeout=1).raise_for_status()
+            return proc
+        except httpx.HTTPError:
+            if proc.poll() is not None:
+                raise SystemExit("fake_sarvam.py exited during startup")
+            time.sleep(0.2)
+    proc.terminate()
+    raise SystemExit("fake_sarvam.py did not start in time")
+
+
+def fake_counts(port: int) -> dict:
+    return httpx.get(f"http://127.0.0.1:{port}/fake/stats", timeout=5).json()["requests"]
+
+
+# --- Runner ---
+async def run_cases(main, cases: list, args) -> list:
+    results = []
+    try:
+        for duration, density in cases:
+            workdir = tempfile.mkdtemp(prefix="dub_bench_")
+            try:
+                video_path = os.path.join(workdir, "input.mp4")
+                samples, planned = build_soundtrack(duration, density, args.segment_length, args.seed)
+                write_video(video_path, samples)
+
+                before = fake_counts(args.port)
+                timings = {}
+                started = time.perf_counter()
+                _, failed_segments = await main._dub_video(video_path, workdir, args.source, args.target, args.sampling_rate, timings)
+                wall = time.perf_counter() - started
+                after = fake_counts(args.port)
+
+                calls = {k: after.get(k, 0) - before.get(k, 0) for k in after}
+                row = {
+                    "media_seconds": duration,
+                    "segments_per_minute": density,
+                    "planned_segments": planned,
+                    "stt_calls": calls.get("stt", 0),
+                    "translate_calls": calls.get("translate", 0),
+                    "tts_calls": calls.get("tts", 0),
+                    "failed_segments": failed_segments,
+                    "wall_seconds": round(wall, 3),
+                    "real_time_factor": round(wall / duration, 4),
+                    "stages": {stage: round(timings.get(stage, 0.0), 4) for stage in STAGES},
+                }
+                results.append(row)
+                top = sorted(row["stages"].items(), key=lambda kv: kv[1], reverse=True)[:3]
+                print(f"{duration:>6.0f}s  {density:>5.1f}/min  {row['stt_calls']:>4} segs  wall {wall:>7.2f}s  "
+                      f"RTF {row['real_time_factor']:.3f}  top: " + ", ".join(f"{k} {v:.2f}s" for k, v in top))
+            finally:
+                shutil.rmtree(workdir, ignore_errors=True)
+    finally:
+        await main.sarvam_client.aclose()
+    return results
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the video dubbing pipeline against fake_sarvam.py")
+    parser.add_argument("--durations", default="30,120", help="Video lengths in seconds (comma separated)")
+    parser.add_argument("--densities", default="6,20", help="Speech segments per minute (comma separated)")
+    parser.add_argument("--segment-length", type=float, default=3.0, help="Mean speech segment length in seconds")
+    parser.add_argument("--fake-latency", default="lognormal:-1.5,0.4", help="FAKE_SARVAM_LATENCY for the stand-in")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--source", default="en-IN")
+    parser.add_argument("--target", default="hi-IN")
+    parser.add_argument("--sampling-rate", type=int, default=22050)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default=os.path.join(os.path.dirname(os.path.abspath(__file__)), "results",
+                                                         f"video_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"))
+    args = parser.parse_args(argv)
+
+    for tool in ("ffmpeg", "ffprobe"):
+        if not shutil.which(tool):
+            raise SystemExit(f"{tool} is required on PATH")
+
+    cases = [(float(d), float(s)) for d in args.durations.split(",") for s in args.densities.split(",")]
+    fake = start_fake_sarvam(args.port, args.fake_latency)
+    try:
+        # Point the backend at the stand-in and keep the translation cache out of the measurement
+        os.environ["SARVAM_BASE_URL"] = f"http://127.0.0.1:{args.port}"
+        os.environ["TRANSLATION_CACHE_PATH"] = ""
+        os.environ["TRANSLATION_CACHE_MEMORY_ENTRIES"] = "0"
+        sys.path.insert(0, BACKEND_DIR)
+        import main
+
+        logging.getLogger().setLevel(logging.WARNING)
+        results = asyncio.run(run_cases(main, cases, args))
+    finally:
+        fake.terminate()
+        fake.wait(timeout=10)
+
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump({"meta": {"created": datetime.now().isoformat(), "fake_latency": args.fake_latency,
+                            "segment_length": args.segment_length},
+                   "results": results}, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main_cli()
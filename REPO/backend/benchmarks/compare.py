@@ -0,0 +1,61 @@
+"""Compare two benchmark result files and flag regressions.
+
+    python benchmarks/compare.py baseline.json current.json --threshold 0.10
+
+Exits with status 1 when any case got slower (ops/sec) or allocated more
+(peak bytes) than the threshold allows, so it can gate CI.
+"""
+import sys
+import json
+import argparse
+
+
+def load(path: str) -> dict:
+    with open(path, "r", encoding="utf-8") as f:
+        report = json.load(f)
+    return {(r["function"], r["input"], r["size"]): r for r in report["results"]}
+
+
+def compare(baseline: dict, current: dict, threshold: float, alloc_threshold: float) -> list:
+    """One row per case present in both files: (key, speed ratio, alloc ratio, regressed).
+    Speed > 1 means the current run is faster; alloc > 1 means it allocates more."""
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        old, new = baseline[key], current[key]
+        # Best-of-N time is far less noisy than the mean on a shared machine
+        speed = old["best_seconds"] / new["best_seconds"] if new["best_seconds"] else 1.0
+        alloc = (new["peak_alloc_bytes"] / old["peak_alloc_bytes"]) if old["peak_alloc_bytes"] else 1.0
+        regressed = speed < 1.0 - threshold or alloc > 1.0 + alloc_threshold
+        rows.append((key, speed, alloc, regressed))
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Flag benchmark regressions against a saved baseline")
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown (fraction)")
+    parser.add_argument("--alloc-threshold", type=float, default=0.25, help="Allowed peak allocation growth (fraction)")
+    parser.add_argument("--only-regressions", action="store_true")
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    rows = compare(baseline, current, args.threshold, args.alloc_threshold)
+
+    print(f"{'function':<38} {'input':<10} {'size':>6} {'speed':>8} {'alloc':>8}")
+    for (function, source, size), speed, alloc, regressed in rows:
+        if args.only_regressions and not regressed:
+            continue
+        flag = "  REGRESSION" if regressed else ("  faster" if speed > 1.0 + args.threshold else "")
+        print(f"{function:<38} {source:<10} {size:>6} {speed:>7.2f}x {alloc:>7.2f}x{flag}")
+
+    missing = sorted(baseline.keys() - current.keys())
+    if missing:
+        print(f"\n{len(missing)} baseline case(s) missing from the current run")
+    regressions = sum(1 for row in rows if row[3])
+    print(f"\n{regressions} regression(s) in {len(rows)} compared case(s)")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+import os
+import random
+
+# Document-shaped building blocks per script: headings, bullets, numbered items,
+# paragraphs, plus the emails, phone numbers, units and HTML entities the
+# preprocessing and formatting passes look for.
+SAMPLES = {
+    "english": {
+        "heading": ["Introduction", "Course Objectives:", "**Module Overview**", "ASSESSMENT PLAN", "Key Terms"],
+        "sentence": [
+            "The implementation of the new curriculum is essential in order to facilitate learning.",
+            "Students should utilize the library resources and participate in group discussions.",
+            "Due to the fact that the infrastructure is limited, we must maintain a sufficient schedule.",
+            "Teachers will evaluate progress and monitor attendance on a weekly basis.",
+            "The journey of 25 kms costs ₹ 500 and it is a piece of cake for most travellers.",
+            "Contact the office at admin@example.edu or 9876543210 for further details.",
+            "It is important to note that numerous students demonstrate considerable improvement.",
+            "Fees &amp; charges are listed in the appendix &lt;see table 2&gt; for reference.",
+            "Why does the sky appear blue? Light scatters more at shorter wavelengths!",
+        ],
+    },
+    "hindi": {
+        "heading": ["परिचय", "पाठ्यक्रम के उद्देश्य:", "**मॉड्यूल अवलोकन**", "मूल्यांकन योजना", "मुख्य शब्द"],
+        "sentence": [
+            "नए पाठ्यक्रम का कार्यान्वयन सीखने को आसान बनाने के लिए आवश्यक है।",
+            "छात्रों को पुस्तकालय के संसाधनों का उपयोग करना चाहिए और समूह चर्चा में भाग लेना चाहिए।",
+            "बुनियादी ढांचा सीमित होने के कारण हमें पर्याप्त समय सारणी बनाए रखनी होगी।",
+            "शिक्षक साप्ताहिक आधार पर प्रगति का मूल्यांकन करेंगे और उपस्थिति की निगरानी करेंगे।",
+            "25 kms की यात्रा का खर्च ₹ 500 है और यह अधिकांश यात्रियों के लिए आसान है।",
+            "अधिक जानकारी के लिए admin@example.edu या 9876543210 पर संपर्क करें।",
+            "आसमान नीला क्यों दिखता है? प्रकाश छोटी तरंगदैर्ध्य पर अधिक बिखरता है!",
+        ],
+    },
+    "tamil": {
+        "heading": ["அறிமுகம்", "பாடநெறி நோக்கங்கள்:", "**தொகுதி கண்ணோட்டம்**", "மதிப்பீட்டுத் திட்டம்"],
+        "sentence": [
+            "புதிய பாடத்திட்டத்தை செயல்படுத்துவது கற்றலை எளிதாக்க அவசியம்.",
+            "மாணவர்கள் நூலக வளங்களைப் பயன்படுத்தி குழு விவாதங்களில் பங்கேற்க வேண்டும்.",
+            "ஆசிரியர்கள் வாராந்திர அடிப்படையில் முன்னேற்றத்தை மதிப்பீடு செய்வார்கள்.",
+            "மேலும் விவரங்களுக்கு admin@example.edu அல்லது 9876543210 ஐ தொடர்பு கொள்ளவும்.",
+        ],
+    },
+}
+
+SIZES = {"1KB": 1 << 10, "10KB": 10 << 10, "100KB": 100 << 10, "1MB": 1 << 20, "10MB": 10 << 20}
+
+
+def synthetic_document(script: str, size: int, seed: int = 0) -> str:
+    """Structured text of roughly `size` UTF-8 bytes in the given script"""
+    rng = random.Random(f"{script}:{size}:{seed}")
+    blocks = SAMPLES[script]
+    parts = []
+    total = 0
+    while total < size:
+        kind = rng.random()
+        if kind < 0.12:
+            block = rng.choice(blocks["heading"])
+        elif kind < 0.3:
+            block = "\n".join(f"• {rng.choice(blocks['sentence'])}" for _ in range(rng.randint(2, 4)))
+        elif kind < 0.42:
+            block = "\n".join(f"{i}. {rng.choice(blocks['sentence'])}" for i in range(1, rng.randint(3, 5)))
+        else:
+            block = " ".join(rng.choice(blocks["sentence"]) for _ in range(rng.randint(2, 6)))
+        parts.append(block)
+        total += len(block.encode("utf-8")) + 2
+    return "\n\n".join(parts)
+
+
+def tile_to_size(text: str, size: int) -> str:
+    """Repeat real text until it reaches roughly `size` UTF-8 bytes"""
+    if not text:
+        return ""
+    unit = len(text.encode("utf-8")) + 2
+    return "\n\n".join([text] * max(1, -(-size // unit)))
+
+
+def load_inputs(scripts: list, sizes: list, corpus: str = None) -> list:
+    """(label, size_label, text) inputs: synthetic per script, or tiles of a real corpus file"""
+    inputs = []
+    for size_label in sizes:
+        if corpus:
+            with open(corpus, "r", encoding="utf-8") as f:
+                real = f.read()
+            inputs.append((os.path.basename(corpus), size_label, tile_to_size(real, SIZES[size_label])))
+            continue
+        for script in scripts:
+            inputs.append((script, size_label, synthetic_document(script, SIZES[size_label])))
+    return inputs
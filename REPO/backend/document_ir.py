@@ -0,0 +1,187 @@
+"""Structured document representation shared by the extractors, translation and the writers.
+
+A document is a list of Segment objects in reading order. Extractors build
+it once, translation replaces each segment's text, and the DOCX, PDF and
+plain-text writers lay it out from the segment types, so no stage has to
+re-detect structure from "**" or bullet markers in a flattened string.
+"""
+import re
+
+SEGMENT_TYPES = ("heading", "bullet", "numbered", "paragraph", "empty")
+BULLET_MARKERS = ('•', '-', '*', '◦', '▪', '▫')
+
+# Run formatting flags (Segment.runs holds (length, flags) pairs)
+BOLD = 1
+ITALIC = 2
+UNDERLINE = 4
+
+_NUMBERED = re.compile(r'^(\d+\.)\s+')
+
+
+class Segment:
+    """One structural element: a heading, list item, paragraph or blank line.
+
+    `level` is the heading level (1 for top-level and inferred headings),
+    `runs` optional (length, flags) pairs describing run formatting of
+    `text`, `location` where the element came from (e.g. (page, line) or
+    (paragraph,)), and `marker` the original bullet or number of a list item.
+    """
+    __slots__ = ("id", "type", "level", "text", "runs", "location", "marker")
+
+    def __init__(self, id: int, type: str, text: str = "", level: int = 0, runs: tuple = None,
+                 location: tuple = None, marker: str = None):
+        self.id = id
+        self.type = type
+        self.level = level
+        self.text = text
+        self.runs = runs
+        self.location = location
+        self.marker = marker
+
+    def __repr__(self):
+        return f"Segment({self.id}, {self.type!r}, {self.text[:40]!r})"
+
+    @property
+    def is_empty(self) -> bool:
+        return self.type == "empty" or not self.text.strip()
+
+    def with_text(self, text: str) -> "Segment":
+        """Copy of the segment carrying another text (e.g. its translation).
+        Only formatting shared by the whole segment carries over, as one run."""
+        flags = self.formatting
+        return Segment(self.id, self.type, text, self.level, ((len(text), flags),) if flags else None,
+                       self.location, self.marker)
+
+    @property
+    def formatting(self) -> int:
+        """Flags set on every character of the segment (0 when mixed or unformatted)"""
+        if not self.runs:
+            return 0
+        flags = BOLD | ITALIC | UNDERLINE
+        for length, run_flags in self.runs:
+            if length:
+                flags &= run_flags
+        return flags
+
+    def to_list(self) -> list:
+        return [self.id, self.type, self.text, self.level, self.runs, self.location, self.marker]
+
+    @classmethod
+    def from_list(cls, data: list) -> "Segment":
+        id, type, text, level, runs, location, marker = data
+        return cls(id, type, text, level,
+                   tuple(tuple(r) for r in runs) if runs else None,
+                   tuple(location) if location else None, marker)
+
+
+def identify_line_type(line: str) -> str:
+    """Identify the type of line (heading, bullet, numbered, paragraph)."""
+    line = line.strip()
+    if not line:
+        return "empty"
+
+    # Check for headings (marked with ** or short lines that look like titles)
+    if line.startswith('**') and line.endswith('**'):
+        return "heading"
+
+    # Check for bullet points
+    if line.startswith(BULLET_MARKERS):
+        return "bullet"
+
+    # Check for numbered lists
+    if _NUMBERED.match(line):
+        return "numbered"
+
+    # Check for potential headings (short lines, title case, no punctuation at end)
+    if (len(line) < 80 and
+        not line.endswith('.') and
+        not line.startswith(('1.', '2.', '3.', '4.', '5.')) and
+        (line.isupper() or line.istitle() or ':' in line)):
+        return "heading"
+
+    return "paragraph"
+
+
+class SegmentBuilder:
+    """Builds a segment list, grouping consecutive paragraph lines into one paragraph"""
+
+    def __init__(self):
+        self.segments = []
+        self._lines = []
+        self._location = None
+
+    def _close_paragraph(self):
+        if self._lines:
+            self.segments.append(Segment(len(self.segments), "paragraph", "\n".join(self._lines), location=self._location))
+            self._lines = []
+            self._location = None
+
+    def add(self, type: str, text: str = "", level: int = 0, runs: tuple = None, location: tuple = None, marker: str = None):
+        """Append a segment as is"""
+        self._close_paragraph()
+        self.segments.append(Segment(len(self.segments), type, text, level, runs, location, marker))
+
+    def add_line(self, line: str, location: tuple = None, line_type: str = None):
+        """Append one line of flattened text, classifying it unless `line_type` is given"""
+        line = line.strip()
+        line_type = line_type or identify_line_type(line)
+        if line_type == "paragraph":
+            if not self._lines:
+                self._location = location
+            self._lines.append(line)
+        elif line_type == "empty":
+            self.add("empty", location=location)
+        elif line_type == "heading":
+            text = line[2:-2].strip() if line.startswith('**') and line.endswith('**') and len(line) >= 4 else line
+            self.add("heading", text, level=1, location=location)
+        elif line_type == "bullet":
+            self.add("bullet", line[1:].strip(), location=location, marker=line[0])
+        else:
+            m = _NUMBERED.match(line)
+            self.add("numbered", line[m.end():] if m else line, location=location, marker=m.group(1) if m else None)
+
+    def add_text(self, text: str, location: tuple = None):
+        """Append flattened text line by line; locations get the line number appended"""
+        for i, line in enumerate(text.split("\n")):
+            self.add_line(line, (location or ()) + (i,))
+
+    def finish(self) -> list:
+        self._close_paragraph()
+        return self.segments
+
+
+def segments_from_text(text: str) -> list:
+    """Segments of flattened text ("**heading**", bullet and numbered lines, blank-line separated paragraphs)"""
+    builder = SegmentBuilder()
+    builder.add_text(text)
+    return builder.finish()
+
+
+def render_segment(segment: Segment) -> str:
+    """Flattened form of one segment, as the text extractors used to emit it"""
+    if segment.is_empty:
+        return ""
+    if segment.type == "heading":
+        return f"**{segment.text}**"
+    if segment.type in ("bullet", "numbered") and segment.marker:
+        return f"{segment.marker} {segment.text}"
+    return segment.text
+
+
+def render_text(segments: list) -> str:
+    """Flattened text of a segment list, for display and plain-text consumers"""
+    return "\n".join(render_segment(s) for s in segments)
+
+
+def compact_segments(segments: list) -> list:
+    """Drop leading, trailing and repeated blank segments and renumber the rest"""
+    compacted = []
+    for segment in segments:
+        if segment.type == "empty" and (not compacted or compacted[-1].type == "empty"):
+            continue
+        compacted.append(segment)
+    while compacted and compacted[-1].type == "empty":
+        compacted.pop()
+    for i, segment in enumerate(compacted):
+        segment.id = i
+    return compacted
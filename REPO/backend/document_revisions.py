@@ -0,0 +1,131 @@
+import os
+import json
+import time
+import sqlite3
+import difflib
+import hashlib
+import logging
+import tempfile
+import threading
+
+from translation_cache import normalize_text
+
+# Revision store settings (override with environment variables); an empty path disables it
+DOCUMENT_REVISIONS_PATH = os.getenv(
+    "DOCUMENT_REVISIONS_PATH", os.path.join(tempfile.gettempdir(), "shiksha_document_revisions.sqlite3")
+)
+# Documents kept; the least recently translated are dropped beyond this
+DOCUMENT_REVISIONS_MAX = int(os.getenv("DOCUMENT_REVISIONS_MAX", "5000"))
+
+
+def fingerprint(text: str) -> str:
+    """Identity of one structured element's source text"""
+    return hashlib.sha1(normalize_text(text).encode("utf-8")).hexdigest()
+
+
+def diff_fingerprints(previous: list, current: list) -> dict:
+    """Count unchanged, changed, added and removed elements between two revisions"""
+    counts = {"unchanged": 0, "changed": 0, "added": 0, "removed": 0}
+    matcher = difflib.SequenceMatcher(None, previous, current, autojunk=False)
+    for op, i1, i2, j1, j2 in matcher.get_opcodes():
+        if op == "equal":
+            counts["unchanged"] += i2 - i1
+        elif op == "replace":
+            changed = min(i2 - i1, j2 - j1)
+            counts["changed"] += changed
+            counts["removed"] += i2 - i1 - changed
+            counts["added"] += j2 - j1 - changed
+        elif op == "delete":
+            counts["removed"] += i2 - i1
+        else:
+            counts["added"] += j2 - j1
+    return counts
+
+
+class DocumentRevisionStore:
+    """Last translated revision of each document, per language pair.
+
+    A revision is the document's element fingerprints in order, with the
+    translation of each. Entries are content-addressed, so a key shared by
+    two different documents (e.g. a common filename) only costs reuse, never
+    correctness. Pass path=None or "" to disable."""
+
+    def __init__(self, path: str = DOCUMENT_REVISIONS_PATH, max_documents: int = DOCUMENT_REVISIONS_MAX):
+        self.max_documents = max_documents
+        self._lock = threading.Lock()
+        self._db = None
+        self.loads = 0
+        self.saves = 0
+        self.reused_elements = 0
+        if path:
+            self._open(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    def _open(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS revisions ("
+                "document_key TEXT NOT NULL, pair TEXT NOT NULL, revision INTEGER NOT NULL, "
+                "updated REAL NOT NULL, elements TEXT NOT NULL, PRIMARY KEY (document_key, pair))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS revisions_updated ON revisions(updated)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Document revision store disabled ({path}): {e}")
+            self._db = None
+
+    def load(self, document_key: str, pair: str):
+        """(revision number, [[fingerprint, translation], ...]) of the last translation, or (0, [])"""
+        if self._db is None or not document_key:
+            return 0, []
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT revision, elements FROM revisions WHERE document_key = ? AND pair = ?", (document_key, pair)
+                ).fetchone()
+            except sqlite3.Error as e:
+                logging.warning(f"Document revision lookup failed: {e}")
+                return 0, []
+            self.loads += 1
+        if row is None:
+            return 0, []
+        return row[0], json.loads(row[1])
+
+    def save(self, document_key: str, pair: str, elements: list) -> int:
+        """Store [[fingerprint, translation], ...] as the document's newest revision; returns its number"""
+        if self._db is None or not document_key:
+            return 0
+        payload = json.dumps(elements, ensure_ascii=False)
+        with self._lock:
+            try:
+                row = self._db.execute(
+                    "SELECT revision FROM revisions WHERE document_key = ? AND pair = ?", (document_key, pair)
+                ).fetchone()
+                revision = (row[0] if row else 0) + 1
+                self._db.execute(
+                    "INSERT OR REPLACE INTO revisions (document_key, pair, revision, updated, elements) VALUES (?, ?, ?, ?, ?)",
+                    (document_key, pair, revision, time.time(), payload),
+                )
+                self._db.execute(
+                    "DELETE FROM revisions WHERE rowid IN (SELECT rowid FROM revisions ORDER BY updated DESC LIMIT -1 OFFSET ?)",
+                    (self.max_documents,),
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Document revision write failed: {e}")
+                return 0
+            self.saves += 1
+        return revision
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self._db is not None,
+            "loads": self.loads,
+            "saves": self.saves,
+            "reused_elements": self.reused_elements,
+        }
@@ -0,0 +1,123 @@
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+
+# Extraction cache settings (override with environment variables); an empty directory disables it
+EXTRACTION_CACHE_DIR = os.getenv("EXTRACTION_CACHE_DIR", os.path.join(tempfile.gettempdir(), "shiksha_extraction_cache"))
+EXTRACTION_CACHE_MAX_BYTES = int(os.getenv("EXTRACTION_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+
+HASH_CHUNK_BYTES = 1 << 20
+
+
+def file_digest(file_path: str) -> str:
+    """SHA-256 of a file's bytes, read in chunks"""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_CHUNK_BYTES), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class ExtractionCache:
+    """Disk cache of document extraction results, keyed by file content hash.
+
+    Each entry is one JSON file named after the content hash, the extractor
+    and its version. A hit refreshes the file's mtime, and when the directory
+    grows past `max_bytes` the least recently used entries are deleted.
+    Pass directory=None or "" to disable."""
+
+    def __init__(self, directory: str = EXTRACTION_CACHE_DIR, max_bytes: int = EXTRACTION_CACHE_MAX_BYTES):
+        self.directory = directory or None
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if self.directory:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                self._bytes = sum(entry.stat().st_size for entry in os.scandir(self.directory) if entry.name.endswith(".json"))
+            except OSError as e:
+                logging.warning(f"Extraction cache disabled ({self.directory}): {e}")
+                self.directory = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.directory is not None
+
+    def _path(self, digest: str, extractor: str, version: str) -> str:
+        return os.path.join(self.directory, f"{digest}.{extractor}.{version}.json")
+
+    def get(self, digest: str, extractor: str, version: str = "1"):
+        """Cached result dict, or None"""
+        if not self.directory:
+            return None
+        path = self._path(digest, extractor, version)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return result
+
+    def set(self, digest: str, extractor: str, result: dict, version: str = "1"):
+        """Store a result dict, evicting least recently used entries beyond the size limit"""
+        if not self.directory:
+            return
+        path = self._path(digest, extractor, version)
+        payload = json.dumps(result, ensure_ascii=False).encode("utf-8")
+        if len(payload) > self.max_bytes:
+            return
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload)
+            with self._lock:
+                previous = os.path.getsize(path) if os.path.exists(path) else 0
+                os.replace(tmp_path, path)
+                self._bytes += len(payload) - previous
+                if self._bytes > self.max_bytes:
+                    self._evict()
+        except OSError as e:
+            logging.warning(f"Extraction cache write failed: {e}")
+
+    def _evict(self):
+        """Delete least recently used entries until the cache is at 90% of its limit"""
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(".json"):
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, entry.path))
+        entries.sort()
+        total = sum(size for _, size, _ in entries)
+        target = int(self.max_bytes * 0.9)
+        for _, size, path in entries:
+            if total <= target:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                continue
+            total -= size
+            self.evictions += 1
+        self._bytes = total
+
+    def stats(self) -> dict:
+        return {
+            "enabled": self.directory is not None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "bytes": self._bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -0,0 +1,195 @@
+"""Local stand-in for the Sarvam API, for offline load tests and benchmarks.
+
+Implements /speech-to-text, /translate, /text-to-speech and
+/speech-to-text-translate with the same request and response shapes as the
+real service, returning deterministic pseudo-translations and synthetic WAV
+audio after a configurable delay.
+
+Run it and point the apps at it:
+
+    python fake_sarvam.py --port 9000
+    SARVAM_BASE_URL=http://127.0.0.1:9000 uvicorn main:app
+
+Behaviour is configured with environment variables:
+
+    FAKE_SARVAM_LATENCY             latency distribution for every endpoint
+    FAKE_SARVAM_<ENDPOINT>_LATENCY  per-endpoint override (TRANSLATE, STT, TTS, STT_TRANSLATE)
+                                    e.g. "fixed:0.2", "uniform:0.1,0.5",
+                                    "lognormal:-1.5,0.5", "exponential:0.3"
+    FAKE_SARVAM_ERROR_RATE          fraction of requests answered with HTTP 500
+    FAKE_SARVAM_429_RATE            fraction of requests answered with HTTP 429
+    FAKE_SARVAM_RETRY_AFTER         Retry-After seconds sent with 429s
+    FAKE_SARVAM_SEED                seed for latency and error injection
+"""
+import os
+import io
+import re
+import wave
+import uuid
+import base64
+import random
+import asyncio
+import hashlib
+import argparse
+import logging
+
+import numpy as np
+from fastapi import FastAPI, UploadFile, File, Form, Request
+from fastapi.responses import JSONResponse
+
+FAKE_SARVAM_LATENCY = os.getenv("FAKE_SARVAM_LATENCY", "fixed:0")
+FAKE_SARVAM_ERROR_RATE = float(os.getenv("FAKE_SARVAM_ERROR_RATE", "0"))
+FAKE_SARVAM_429_RATE = float(os.getenv("FAKE_SARVAM_429_RATE", "0"))
+FAKE_SARVAM_RETRY_AFTER = os.getenv("FAKE_SARVAM_RETRY_AFTER", "1")
+FAKE_SARVAM_SEED = os.getenv("FAKE_SARVAM_SEED")
+
+# Synthetic speech length per input character
+TTS_SECONDS_PER_CHAR = 0.06
+TTS_MAX_SECONDS = 30.0
+
+rng = random.Random(FAKE_SARVAM_SEED)
+app = FastAPI(title="Fake Sarvam API")
+counters = {}
+
+
+def parse_latency(spec: str):
+    """Turn a latency spec like "uniform:0.1,0.5" into a sampler returning seconds"""
+    kind, _, args = (spec or "fixed:0").partition(":")
+    params = [float(a) for a in args.split(",") if a.strip()] if args else []
+    if kind == "fixed":
+        return lambda: params[0] if params else 0.0
+    if kind == "uniform":
+        return lambda: rng.uniform(params[0], params[1])
+    if kind == "lognormal":
+        return lambda: rng.lognormvariate(params[0], params[1])
+    if kind == "exponential":
+        return lambda: rng.expovariate(1.0 / params[0]) if params[0] > 0 else 0.0
+    raise ValueError(f"Unknown latency distribution: {spec}")
+
+
+def latency_sampler(endpoint: str):
+    return parse_latency(os.getenv(f"FAKE_SARVAM_{endpoint.upper()}_LATENCY", FAKE_SARVAM_LATENCY))
+
+
+samplers = {name: latency_sampler(name) for name in ("translate", "stt", "tts", "stt_translate")}
+
+
+async def simulate(endpoint: str):
+    """Count the request, sleep for a sampled latency and maybe inject a failure response"""
+    counters[endpoint] = counters.get(endpoint, 0) + 1
+    await asyncio.sleep(max(samplers[endpoint](), 0.0))
+    roll = rng.random()
+    if roll < FAKE_SARVAM_429_RATE:
+        counters["429"] = counters.get("429", 0) + 1
+        return JSONResponse({"error": {"message": "Rate limit exceeded", "code": "rate_limit_exceeded_error"}},
+                            status_code=429, headers={"Retry-After": FAKE_SARVAM_RETRY_AFTER})
+    if roll < FAKE_SARVAM_429_RATE + FAKE_SARVAM_ERROR_RATE:
+        counters["500"] = counters.get("500", 0) + 1
+        return JSONResponse({"error": {"message": "Injected failure", "code": "internal_server_error"}}, status_code=500)
+    return None
+
+
+def pseudo_translate(text: str, target_language_code: str) -> str:
+    """Deterministic stand-in translation: every word is reversed, so markers
+    (**, bullets, numbering, segment delimiters) and line structure survive"""
+    return re.sub(r"[^\W\d_]+", lambda m: m.group(0)[::-1], text or "")
+
+
+def synthetic_wav(seconds: float, sample_rate: int = 22050, seed: str = "") -> bytes:
+    """Mono 16-bit sine tone whose pitch is derived from `seed`"""
+    frequency = 180 + int(hashlib.md5(seed.encode("utf-8")).hexdigest()[:4], 16) % 200
+    t = np.arange(int(seconds * sample_rate)) / sample_rate
+    samples = (8000 * np.sin(2 * np.pi * frequency * t)).astype(np.int16)
+    out = io.BytesIO()
+    with wave.open(out, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        w.writeframes(samples.tobytes())
+    return out.getvalue()
+
+
+def wav_duration(content: bytes) -> float:
+    try:
+        with wave.open(io.BytesIO(content)) as w:
+            return w.getnframes() / float(w.getframerate())
+    except (wave.Error, EOFError):
+        return 0.0
+
+
+def synthetic_transcript(content: bytes) -> str:
+    """Deterministic transcript: one pseudo-word per half second of audio"""
+    digest = hashlib.sha256(content).hexdigest()
+    words = max(1, int(wav_duration(content) * 2))
+    return " ".join(f"word{digest[i % 60:i % 60 + 4]}" for i in range(words))
+
+
+@app.post("/translate")
+async def translate(request: Request):
+    failure = await simulate("translate")
+    if failure:
+        return failure
+    body = await request.json()
+    return {
+        "request_id": str(uuid.uuid4()),
+        "translated_text": pseudo_translate(body.get("input", ""), body.get("target_language_code")),
+        "source_language_code": body.get("source_language_code") or "en-IN",
+    }
+
+
+@app.post("/speech-to-text")
+async def speech_to_text(file: UploadFile = File(...), language_code: str = Form("unknown"), model: str = Form("saarika:v2")):
+    failure = await simulate("stt")
+    if failure:
+        return failure
+    content = await file.read()
+    return {
+        "request_id": str(uuid.uuid4()),
+        "transcript": synthetic_transcript(content),
+        "language_code": language_code if language_code not in ("", "unknown", "auto") else "en-IN",
+    }
+
+
+@app.post("/speech-to-text-translate")
+async def speech_to_text_translate(file: UploadFile = File(...), model: str = Form("saaras:v2"),
+                                   input_language_code: str = Form("unknown"), output_language_code: str = Form("en-IN")):
+    failure = await simulate("stt_translate")
+    if failure:
+        return failure
+    content = await file.read()
+    return {
+        "request_id": str(uuid.uuid4()),
+        "transcript": pseudo_translate(synthetic_transcript(content), output_language_code),
+        "language_code": input_language_code if input_language_code != "unknown" else "en-IN",
+    }
+
+
+@app.post("/text-to-speech")
+async def text_to_speech(request: Request):
+    failure = await simulate("tts")
+    if failure:
+        return failure
+    body = await request.json()
+    inputs = body.get("inputs") or [body.get("text", "")]
+    sample_rate = int(body.get("speech_sample_rate", 22050))
+    audios = []
+    for text in inputs:
+        seconds = min(max(len(text) * TTS_SECONDS_PER_CHAR, 0.2), TTS_MAX_SECONDS)
+        audios.append(base64.b64encode(synthetic_wav(seconds, sample_rate, text)).decode("ascii"))
+    return {"request_id": str(uuid.uuid4()), "audios": audios}
+
+
+@app.get("/fake/stats")
+def stats():
+    return {"requests": dict(counters)}
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Run the fake Sarvam API server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
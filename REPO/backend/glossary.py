@@ -0,0 +1,277 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from collections import Counter
+
+# Term lists, one directory per tenant ("default" applies to every tenant):
+#   <GLOSSARY_DIR>/<tenant>/any.tsv             every language pair
+#   <GLOSSARY_DIR>/<tenant>/en-IN_hi-IN.tsv     one source/target pair
+# .tsv files hold "term<TAB>replacement" lines (# starts a comment); .json files hold an object.
+GLOSSARY_DIR = os.getenv("GLOSSARY_DIR", os.path.join(os.path.dirname(os.path.abspath(__file__)), "glossaries"))
+# Minimum seconds between checks of the term files for changes
+GLOSSARY_RELOAD_SECONDS = float(os.getenv("GLOSSARY_RELOAD_SECONDS", "2"))
+
+DEFAULT_TENANT = "default"
+ANY_PAIR = "any"
+GLOSSARY_EXTENSIONS = (".tsv", ".json")
+
+# Built-in replacements, applied wherever they occur (also inside words)
+BUILTIN_GLOSSARY = {
+    "kms": "kilometers",
+    "₹": "rupees",
+    "circuit brkr": "circuit breaker",
+    "break a leg": "good luck",
+    "piece of cake": "very easy"
+}
+
+_SAFE_NAME = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_.-]*$")
+
+# Word characters, counting Indic vowel signs and viramas (which \w alone does not) as part of the word
+_WORD = r"[\w\u0900-\u0dff]"
+_TOKEN = re.compile(rf"{_WORD}+|[^\w\s]")
+# The whitespace and token that follow a position
+_NEXT_TOKEN = re.compile(rf"(\s*)({_WORD}+|[^\w\s])")
+
+
+def load_term_file(path: str) -> dict:
+    """Parse one .tsv or .json term list into {term: replacement}"""
+    if path.endswith(".json"):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise ValueError(f"{path}: expected a JSON object of term -> replacement")
+        return {str(k).strip(): str(v).strip() for k, v in data.items() if str(k).strip()}
+    terms = {}
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.rstrip("\r\n")
+            if not line.strip() or line.lstrip().startswith("#"):
+                continue
+            term, sep, replacement = line.partition("\t")
+            if not sep or not term.strip():
+                logging.warning(f"Glossary {path}:{line_no}: expected 'term<TAB>replacement', skipped")
+                continue
+            terms[term.strip()] = replacement.strip()
+    return terms
+
+
+class Glossary:
+    """Compiled term list for one tenant and language pair.
+
+    File terms are stored in a token-level trie, so apply() is one scan over
+    the text's tokens that, from each token, follows the trie only as far as
+    the text continues some term. Many terms sharing a first word cost no more
+    than one; a lookup is bounded by the longest term's length in tokens.
+    Terms match whole words only, the longest term wins where several start
+    at the same token, and a lowercase term also matches its capitalized
+    form. The built-in entries keep their plain substring behaviour and are
+    applied first, as normalization.
+    """
+
+    def __init__(self, terms: dict = None, substring_terms: dict = None, version: str = ""):
+        self.version = version
+        self.terms = {}
+        for term, replacement in (terms or {}).items():
+            self.terms[term] = replacement
+            if term[:1].islower():
+                self.terms.setdefault(term[:1].upper() + term[1:], replacement[:1].upper() + replacement[1:])
+        # A file entry for a built-in term replaces it
+        self.substring_terms = {k: v for k, v in (substring_terms or {}).items() if k not in self.terms}
+        self.substring_pattern = None
+        if self.substring_terms:
+            ordered = sorted(self.substring_terms, key=len, reverse=True)
+            self.substring_pattern = re.compile("|".join(re.escape(t) for t in ordered))
+        # First tokens map to nodes whose edges are keyed by (whitespace before the token, token),
+        # so a path spells its term exactly; a node's None entry holds the term that ends there
+        self.trie = {}
+        for term in self.terms:
+            node, end = self.trie, None
+            for m in _TOKEN.finditer(term):
+                key = m.group(0) if end is None else (term[end:m.start()], m.group(0))
+                node = node.setdefault(key, {})
+                end = m.end()
+            if end is not None:
+                node[None] = term
+        self.max_words = max([len(t.split()) for t in [*self.terms, *self.substring_terms]] + [1])
+        self.term_count = len(terms or {}) + len(self.substring_terms)
+        self.texts = 0
+        self.hits = Counter()
+
+    def find(self, text: str):
+        """Yield (start, end, term) for each whole-word term occurrence, left to right"""
+        trie = self.trie
+        if not trie:
+            return
+        last = 0
+        for m in _TOKEN.finditer(text):
+            start = m.start()
+            if start < last:
+                continue
+            node = trie.get(m.group(0))
+            if node is None:
+                continue
+            # Tokens are maximal word runs, so a path match is also a whole-word match
+            end, match = m.end(), None
+            while True:
+                term = node.get(None)
+                if term is not None:
+                    match = (end, term)
+                if len(node) == (term is not None):  # leaf: no longer term continues here
+                    break
+                following = _NEXT_TOKEN.match(text, end)
+                if following is None:
+                    break
+                node = node.get(following.groups())
+                if node is None:
+                    break
+                end = following.end()
+            if match is not None:
+                last, term = match
+                yield start, last, term
+
+    def spans(self, text: str) -> list:
+        """(start, end) of every replacement apply() would make, for callers that must not split one"""
+        spans = [m.span() for m in self.substring_pattern.finditer(text)] if self.substring_pattern else []
+        return spans + [(start, end) for start, end, _ in self.find(text)]
+
+    def apply(self, text: str) -> str:
+        """Apply the built-in entries, then replace file terms in one pass"""
+        self.texts += 1
+        if not text:
+            return text
+        text = self._apply_substring(text)
+        if not self.trie:
+            return text
+        pieces, last = [], 0
+        for start, end, term in self.find(text):
+            pieces.append(text[last:start])
+            pieces.append(self.terms[term])
+            self.hits[term] += 1
+            last = end
+        if not pieces:
+            return text
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+    def _apply_substring(self, text: str) -> str:
+        if self.substring_pattern is None:
+            return text
+        replacements, hits = self.substring_terms, self.hits
+
+        def replace(m):
+            term = m.group(0)
+            hits[term] += 1
+            return replacements[term]
+
+        return self.substring_pattern.sub(replace, text)
+
+    def stats(self, top: int = 10) -> dict:
+        return {
+            "version": self.version,
+            "terms": self.term_count,
+            "texts": self.texts,
+            "replacements": sum(self.hits.values()),
+            "top_terms": dict(self.hits.most_common(top)),
+        }
+
+
+class GlossaryStore:
+    """Resolves, compiles and hot-reloads glossaries per (tenant, source, target).
+
+    Layers are merged lowest priority first: built-in entries, the default
+    tenant's files, then the tenant's own; within a tenant the pair-specific
+    file overrides any.tsv. Files are re-checked at most every
+    `reload_seconds`, and a glossary is recompiled only when one of its
+    files was added, removed or modified.
+    """
+
+    def __init__(self, directory: str = GLOSSARY_DIR, builtin: dict = None, reload_seconds: float = GLOSSARY_RELOAD_SECONDS):
+        self.directory = directory
+        self.builtin = dict(BUILTIN_GLOSSARY if builtin is None else builtin)
+        self.reload_seconds = reload_seconds
+        self._entries = {}  # (tenant, source, target) -> [signature, glossary, checked_at]
+        self._files = {}  # path -> (mtime_ns, size, terms)
+        self._lock = threading.Lock()
+        self.reloads = 0
+        self.errors = 0
+
+    @staticmethod
+    def _clean(name):
+        return name if name and _SAFE_NAME.match(name) else None
+
+    def _candidate_files(self, tenant, source, target) -> list:
+        if not self.directory:
+            return []
+        tenants = [DEFAULT_TENANT] + ([tenant] if tenant and tenant != DEFAULT_TENANT else [])
+        stems = [ANY_PAIR] + ([f"{source}_{target}"] if source and target else [])
+        return [os.path.join(self.directory, t, stem + ext) for t in tenants for stem in stems for ext in GLOSSARY_EXTENSIONS]
+
+    def _signature(self, paths: list) -> tuple:
+        signature = []
+        for path in paths:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            signature.append((path, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def _terms(self, path, mtime_ns, size) -> dict:
+        cached = self._files.get(path)
+        if cached and cached[0] == mtime_ns and cached[1] == size:
+            return cached[2]
+        try:
+            terms = load_term_file(path)
+        except (OSError, ValueError) as e:
+            self.errors += 1
+            logging.error(f"Failed to load glossary {path}: {e}")
+            terms = cached[2] if cached else {}
+        self._files[path] = (mtime_ns, size, terms)
+        return terms
+
+    def _build(self, signature: tuple) -> Glossary:
+        started = time.perf_counter()
+        terms = {}
+        for path, mtime_ns, size in signature:
+            terms.update(self._terms(path, mtime_ns, size))
+        version = hashlib.sha1(repr(sorted(terms.items())).encode("utf-8")).hexdigest()[:12] if terms else "builtin"
+        glossary = Glossary(terms, self.builtin, version)
+        if signature:
+            logging.info(f"📖 Compiled glossary {version} from {len(signature)} file(s), {len(terms)} terms "
+                         f"in {time.perf_counter() - started:.3f}s")
+        return glossary
+
+    def get(self, tenant: str = None, source_lang: str = None, target_lang: str = None) -> Glossary:
+        """Current glossary for a tenant and language pair, reloading changed files"""
+        key = (self._clean(tenant) or DEFAULT_TENANT, self._clean(source_lang), self._clean(target_lang))
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and now - entry[2] < self.reload_seconds:
+            return entry[1]
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and now - entry[2] < self.reload_seconds:
+                return entry[1]
+            signature = self._signature(self._candidate_files(*key))
+            if entry and entry[0] == signature:
+                entry[2] = now
+                return entry[1]
+            glossary = self._build(signature)
+            if entry:
+                self.reloads += 1
+                logging.info(f"🔄 Glossary for {key[0]} {key[1]}->{key[2]} reloaded ({glossary.version})")
+            self._entries[key] = [signature, glossary, now]
+            return glossary
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "reloads": self.reloads,
+            "errors": self.errors,
+            "glossaries": {f"{t}:{s or ANY_PAIR}->{g or ANY_PAIR}": entry[1].stats()
+                           for (t, s, g), entry in self._entries.items()},
+        }
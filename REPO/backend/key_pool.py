@@ -0,0 +1,126 @@
+import os
+import time
+import logging
+from collections import deque
+
+# How long a key is taken out of rotation after upstream rejects it
+KEY_EJECT_AUTH_SECONDS = float(os.getenv("SARVAM_KEY_EJECT_AUTH_SECONDS", "600"))
+KEY_EJECT_RATE_LIMIT_SECONDS = float(os.getenv("SARVAM_KEY_EJECT_RATE_LIMIT_SECONDS", "30"))
+
+# Window used for per-key request rate tracking
+KEY_RATE_WINDOW_SECONDS = 60
+
+
+def load_api_keys(default_key: str = None) -> list:
+    """Load Sarvam API keys from SARVAM_API_KEYS (comma separated) and/or
+    SARVAM_API_KEYS_FILE (one key per line, # comments allowed)."""
+    keys = [k.strip() for k in os.getenv("SARVAM_API_KEYS", "").split(",") if k.strip()]
+    keys_file = os.getenv("SARVAM_API_KEYS_FILE")
+    if keys_file:
+        try:
+            with open(keys_file, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.split("#", 1)[0].strip()
+                    if line:
+                        keys.append(line)
+        except OSError as e:
+            logging.error(f"Could not read API keys file {keys_file}: {e}")
+    if not keys and default_key:
+        keys = [default_key]
+    # Drop duplicates while preserving order
+    return list(dict.fromkeys(keys))
+
+
+class ApiKey:
+    """One upstream API key with its load and health counters"""
+
+    def __init__(self, key: str):
+        self.key = key
+        self.in_flight = 0
+        self.requests = 0
+        self.failures = 0
+        self.ejections = 0
+        self.ejected_until = 0.0
+        self.last_status = None
+        self.recent = deque()
+
+    @property
+    def label(self) -> str:
+        """Masked key for logs and metrics"""
+        return f"{self.key[:6]}…{self.key[-4:]}" if len(self.key) > 12 else "…"
+
+    def recent_rate(self, now: float) -> float:
+        while self.recent and now - self.recent[0] > KEY_RATE_WINDOW_SECONDS:
+            self.recent.popleft()
+        return len(self.recent) / KEY_RATE_WINDOW_SECONDS
+
+    def healthy(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+
+class ApiKeyPool:
+    """Pool of Sarvam API keys with least-loaded selection.
+
+    acquire() hands out the healthy key with the fewest in-flight requests (ties
+    broken by recent request rate); release() feeds the response status back,
+    temporarily ejecting keys that get 401/403 or 429, and cancel() returns a key
+    whose request was abandoned without counting it as a failure."""
+
+    def __init__(self, keys: list):
+        if not keys:
+            raise ValueError("ApiKeyPool needs at least one API key")
+        self.keys = [ApiKey(k) for k in keys]
+
+    @classmethod
+    def from_config(cls, default_key: str = None) -> "ApiKeyPool":
+        pool = cls(load_api_keys(default_key))
+        logging.info(f"Loaded {len(pool.keys)} Sarvam API key(s)")
+        return pool
+
+    def acquire(self) -> ApiKey:
+        now = time.time()
+        candidates = [k for k in self.keys if k.healthy(now)]
+        if candidates:
+            key = min(candidates, key=lambda k: (k.in_flight, k.recent_rate(now)))
+        else:
+            # Every key is ejected: use the one that recovers first rather than failing outright
+            key = min(self.keys, key=lambda k: k.ejected_until)
+        key.in_flight += 1
+        key.requests += 1
+        key.recent.append(now)
+        return key
+
+    def release(self, key: ApiKey, status_code, retry_after: float = None):
+        key.in_flight -= 1
+        key.last_status = status_code
+        if status_code in (401, 403):
+            self._eject(key, KEY_EJECT_AUTH_SECONDS, status_code)
+        elif status_code == 429:
+            self._eject(key, retry_after or KEY_EJECT_RATE_LIMIT_SECONDS, status_code)
+        elif status_code is None or status_code >= 500:
+            key.failures += 1
+
+    def cancel(self, key: ApiKey):
+        """Give back a key whose request was abandoned before upstream answered"""
+        key.in_flight -= 1
+
+    def _eject(self, key: ApiKey, seconds: float, status_code):
+        key.failures += 1
+        key.ejections += 1
+        key.ejected_until = max(key.ejected_until, time.time() + seconds)
+        logging.warning(f"API key {key.label} ejected for {seconds:.0f}s after HTTP {status_code}")
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            f"{i}:{k.label}": {
+                "healthy": k.healthy(now),
+                "in_flight": k.in_flight,
+                "requests": k.requests,
+                "requests_per_sec": round(k.recent_rate(now), 3),
+                "failures": k.failures,
+                "ejections": k.ejections,
+                "last_status": k.last_status,
+            }
+            for i, k in enumerate(self.keys)
+        }
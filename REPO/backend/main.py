@@ -1,6 +1,6 @@
 from fastapi import FastAPI, UploadFile, File, Form, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from pydub import AudioSegment
 from pydub.silence import detect_nonsilent
 import subprocess
@@ -11,7 +11,6 @@ from silero_vad import load_silero_vad, read_audio, get_speech_timestamps
 import os
 import tempfile
 import uuid
-import requests
 import io
 import base64
 import logging
@@ -89,12 +88,15 @@ except ImportError:
 
 import zipfile
 import re
-from requests.exceptions import Timeout
+import json
+import hashlib
+import time
+import asyncio
+import httpx
+from contextlib import contextmanager
 import html
 from datetime import datetime
 
-# Text simplification using OpenAI-compatible API
-BLOOMZ_AVAILABLE = True
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -103,8 +105,29 @@ logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(
 from text_preprocessing import TextPreprocessingPipeline
 preprocessor = TextPreprocessingPipeline()
 
+# Pluggable simplification backends for localization (rules, optional local LLM server)
+from simplification import Simplifier
+simplifier = Simplifier.from_config()
+
+# Two-tier (memory LRU + SQLite) cache of upstream translations
+from translation_cache import TranslationCache
+translation_cache = TranslationCache()
+
+# Persistent segment-level translation memory (exact and near-match reuse across documents)
+from translation_memory import TranslationMemory
+translation_memory = TranslationMemory()
+
+# Last translated revision of each uploaded document, for incremental re-translation
+from document_revisions import DocumentRevisionStore, fingerprint, diff_fingerprints
+document_revisions = DocumentRevisionStore()
+
 app = FastAPI()
 
+@app.on_event("shutdown")
+async def close_upstream_clients():
+    await sarvam_client.aclose()
+    await simplifier.aclose()
+
 # Allow CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -112,6 +135,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Translation-Memory", "X-Artifact-Cache"],
 )
 
 # Dummy translation function (replace with your logic)
@@ -128,172 +152,108 @@ def text_to_speech(text, lang):
     silent.export(dummy_wav, format="wav")
     return dummy_wav
 
-SARVAM_API_KEY = "sk_aov2qcwm_v6DDreRZzU6ntWRM5ixh8voS"
-SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text"
-SARVAM_TRANSLATE_URL = "https://api.sarvam.ai/translate"
-SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech"
+SARVAM_API_KEY = os.getenv("SARVAM_API_KEY", "sk_aov2qcwm_v6DDreRZzU6ntWRM5ixh8voS")
+# Point SARVAM_BASE_URL at fake_sarvam.py for offline load tests
+SARVAM_BASE_URL = os.getenv("SARVAM_BASE_URL", "https://api.sarvam.ai").rstrip("/")
+SARVAM_STT_URL = f"{SARVAM_BASE_URL}/speech-to-text"
+SARVAM_TRANSLATE_URL = f"{SARVAM_BASE_URL}/translate"
+SARVAM_TTS_URL = f"{SARVAM_BASE_URL}/text-to-speech"
 
-def localize_text_for_indian_context(text: str) -> str:
-    """Simplify and localize text for Indian readers using AI-powered content generation"""
-    if not BLOOMZ_AVAILABLE or not text.strip():
-        return text
-    
-    try:
-        # Use OpenAI-compatible API for true content simplification
-        prompt = f"""Rewrite the following text to make it simple and easy to understand for Indian readers. Use:
-- Simple, everyday words instead of complex terms
-- Short, clear sentences
-- Indian context and examples where appropriate
-- Conversational tone
+# Shared pooled async client for all Sarvam API calls; requests are spread over
+# the keys in SARVAM_API_KEYS / SARVAM_API_KEYS_FILE (default: SARVAM_API_KEY)
+from sarvam_client import SarvamClient
+from resilience import CircuitOpenError
+from key_pool import ApiKeyPool
+sarvam_client = SarvamClient(key_pool=ApiKeyPool.from_config(default_key=SARVAM_API_KEY))
 
-Original text: {text}
+# Maximum number of document elements translated in parallel
+TRANSLATE_MAX_CONCURRENCY = int(os.getenv("TRANSLATE_MAX_CONCURRENCY", "8"))
 
-Simplified version:"""
-        
-        # Try using a free AI API service
-        try:
-            response = requests.post(
-                "https://api.openai.com/v1/chat/completions",
-                headers={
-                    "Authorization": "Bearer sk-test",  # This won't work, but shows the structure
-                    "Content-Type": "application/json"
-                },
-                json={
-                    "model": "gpt-3.5-turbo",
-                    "messages": [{"role": "user", "content": prompt}],
-                    "max_tokens": len(text) + 100,
-                    "temperature": 0.7
-                },
-                timeout=10
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                simplified = result['choices'][0]['message']['content'].strip()
-                if simplified and len(simplified) > 10:
-                    logging.info(f"🤖 AI LOCALIZATION: '{text[:50]}...' -> '{simplified[:50]}...'")
-                    return simplified
-        except:
-            pass
-        
-        # Fallback to enhanced rule-based approach with sentence restructuring
-        simplified = text
-        
-        # Advanced text transformations for Indian context
-        transformations = [
-            # Complex phrases to simple explanations
-            ("implementation of", "using"),
-            ("in order to", "to"),
-            ("due to the fact that", "because"),
-            ("it is important to note that", ""),
-            ("it should be emphasized that", ""),
-            ("with regard to", "about"),
-            ("in accordance with", "following"),
-            ("for the purpose of", "to"),
-            ("in the event that", "if"),
-            ("prior to", "before"),
-            ("subsequent to", "after"),
-            ("in spite of", "despite"),
-            ("as a result of", "because of"),
-            ("in addition to", "also"),
-            ("with the exception of", "except"),
-            
-            # Technical terms to everyday language
-            ("methodology", "way of doing"),
-            ("infrastructure", "basic systems"),
-            ("optimization", "making better"),
-            ("implementation", "putting into use"),
-            ("comprehensive", "complete"),
-            ("sophisticated", "advanced"),
-            ("facilitate", "make easier"),
-            ("utilize", "use"),
-            ("demonstrate", "show"),
-            ("establish", "set up"),
-            ("maintain", "keep"),
-            ("acquire", "get"),
-            ("construct", "build"),
-            ("operate", "run"),
-            ("monitor", "watch"),
-            ("evaluate", "check"),
-            ("analyze", "study"),
-            ("investigate", "look into"),
-            ("collaborate", "work together"),
-            ("coordinate", "organize"),
-            ("communicate", "talk"),
-            ("participate", "take part"),
-            ("contribute", "help"),
-            ("significant", "important"),
-            ("substantial", "large"),
-            ("considerable", "big"),
-            ("numerous", "many"),
-            ("various", "different"),
-            ("appropriate", "right"),
-            ("adequate", "enough"),
-            ("sufficient", "enough"),
-            ("essential", "needed"),
-            ("crucial", "very important"),
-            ("vital", "very important"),
-            ("beneficial", "helpful"),
-            ("advantageous", "good"),
-            ("efficient", "works well"),
-            ("effective", "works good")
-        ]
-        
-        # Apply transformations
-        for complex_phrase, simple_phrase in transformations:
-            simplified = simplified.replace(complex_phrase, simple_phrase)
-            simplified = simplified.replace(complex_phrase.capitalize(), simple_phrase.capitalize())
-        
-        # Break long sentences and add Indian context
-        sentences = simplified.split('. ')
-        new_sentences = []
-        
-        for sentence in sentences:
-            sentence = sentence.strip()
-            if not sentence:
-                continue
-                
-            words = sentence.split()
-            if len(words) > 15:
-                # Try to break at natural points
-                mid_point = len(words) // 2
-                # Look for conjunctions near the middle
-                for i in range(max(5, mid_point-3), min(len(words)-5, mid_point+3)):
-                    if words[i].lower() in ['and', 'but', 'or', 'because', 'since', 'while', 'when', 'if', 'that']:
-                        first_part = ' '.join(words[:i]).strip()
-                        second_part = ' '.join(words[i+1:]).strip()
-                        if first_part and second_part:
-                            new_sentences.append(first_part)
-                            new_sentences.append(second_part.capitalize())
-                            break
-                else:
-                    new_sentences.append(sentence)
-            else:
-                new_sentences.append(sentence)
-        
-        result = '. '.join(new_sentences)
-        
-        # Clean up extra spaces and punctuation
-        result = ' '.join(result.split())  # Remove extra spaces
-        result = result.replace(' .', '.').replace('..', '.')
-        
-        logging.info(f"🔄 ENHANCED LOCALIZATION: '{text[:50]}...' -> '{result[:50]}...'")
-        return result
-        
-    except Exception as e:
-        logging.error(f"Localization error: {e}")
+# Upstream input limit (characters per translate request)
+SARVAM_TRANSLATE_MAX_CHARS = int(os.getenv("SARVAM_TRANSLATE_MAX_CHARS", "1000"))
+
+# Packing of several document elements into one translate request
+from segment_packing import SEGMENT_DELIMITER, pack_segments, split_packed_translation
+
+# Characters of already-extracted pages translated together while a document is still being extracted
+DOCUMENT_PIPELINE_BATCH_CHARS = int(os.getenv("DOCUMENT_PIPELINE_BATCH_CHARS", str(SARVAM_TRANSLATE_MAX_CHARS * TRANSLATE_MAX_CONCURRENCY)))
+
+class TranslationError(Exception):
+    """Fatal upstream translation error that aborts a document translation."""
+
+async def localize_text_for_indian_context(text: str) -> str:
+    """Simplify and localize text for Indian readers (LLM backend when configured, rules otherwise)"""
+    if not text.strip():
         return text
+    simplified = await simplifier.simplify(text)
+    logging.info(f"🔄 LOCALIZATION: '{text[:50]}...' -> '{simplified[:50]}...'")
+    return simplified
+
+# Generated documents and dubbed videos, served again for identical requests
+from artifact_store import ArtifactStore
+artifact_store = ArtifactStore()
+# Bump when a change to the translation or dubbing pipeline should invalidate stored artifacts
+ARTIFACT_PIPELINE_VERSION = "2"
+
+def artifact_response(artifact_key: str, file_path: str, media_type: str, filename: str, headers: dict = None, partial: bool = False) -> FileResponse:
+    """Keep a freshly generated file in the artifact store and stream it from there.
+    Partial outputs (some segments left untranslated) are served but never stored."""
+    if partial:
+        logging.warning(f"Not storing {filename}: some segments failed to translate")
+        return FileResponse(file_path, media_type=media_type, filename=filename, headers=headers)
+    stored_path = artifact_store.put(artifact_key, file_path, media_type=media_type, filename=filename)
+    return FileResponse(stored_path, media_type=media_type, filename=filename,
+                        headers={**(headers or {}), "X-Artifact-Cache": "miss"})
+
+def cached_artifact_response(artifact_key: str):
+    """Stream a stored artifact, or None if there is no live one for the key"""
+    artifact = artifact_store.get(artifact_key)
+    if artifact is None:
+        return None
+    path, meta = artifact
+    logging.info(f"♻️ Serving stored artifact {meta.get('filename')} ({meta.get('size', 0)} bytes)")
+    return FileResponse(path, media_type=meta["media_type"], filename=meta["filename"], headers={"X-Artifact-Cache": "hit"})
+
+# Structured document segments shared by the extractors, translation and the writers
+from document_ir import (
+    Segment, SegmentBuilder, BOLD, ITALIC, UNDERLINE, identify_line_type,
+    segments_from_text, render_text, compact_segments,
+)
 
-# Document text extraction functions
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from DOCX files with structure preservation"""
+# Content-hash keyed disk cache of extraction results, shared by every extraction entry point
+from extraction_cache import ExtractionCache, file_digest
+extraction_cache = ExtractionCache()
+# Runs page-by-page extraction in a worker thread so translation can start on the first pages
+from page_pipeline import ThreadedIterator
+# Bump when an extractor's output changes so stale cache entries are ignored
+EXTRACTION_VERSION = "2"
+
+# Document extraction functions; each returns the document as a list of document_ir.Segment
+def _docx_heading_level(style_name: str) -> int:
+    """Heading level from a DOCX style name ("Heading 2" -> 2, "Title" -> 1)"""
+    match = re.search(r'(\d+)$', style_name)
+    return int(match.group(1)) if style_name.startswith('Heading') and match else 1
+
+def _docx_run_formatting(paragraph, text: str):
+    """Formatting shared by all of a paragraph's visible runs, as a single (length, flags) run"""
+    flags = BOLD | ITALIC | UNDERLINE
+    seen = False
+    for run in paragraph.runs:
+        if not run.text.strip():
+            continue
+        seen = True
+        flags &= (BOLD if run.bold else 0) | (ITALIC if run.italic else 0) | (UNDERLINE if run.underline else 0)
+    return ((len(text), flags),) if seen and flags else None
+
+def extract_segments_from_docx(file_path: str) -> list:
+    """Extract DOCX paragraphs as segments, with heading levels and run formatting"""
     if not DOCX_AVAILABLE:
-        return "DOCX processing not available. Please install python-docx."
+        return segments_from_text("DOCX processing not available. Please install python-docx.")
     
     try:
         doc = Document(file_path)
-        text = []
-        for paragraph in doc.paragraphs:
+        builder = SegmentBuilder()
+        for index, paragraph in enumerate(doc.paragraphs):
             if paragraph.text.strip():
                 para_text = paragraph.text.strip()
                 
@@ -331,216 +291,281 @@ def extract_text_from_docx(file_path: str) -> str:
                 except:
                     pass  # Ignore formatting errors
                 
+                try:
+                    runs = _docx_run_formatting(paragraph, para_text)
+                except Exception:
+                    runs = None
+                location = (index,)
                 if is_heading:
-                    text.append(f"**{para_text}**")
+                    builder.add("heading", para_text, level=_docx_heading_level(paragraph.style.name), runs=runs, location=location)
                 elif is_bullet:
-                    # Ensure bullet formatting
-                    if not para_text.startswith(('•', '-', '*')):
-                        text.append(f"• {para_text}")
+                    numbered = re.match(r'^(\d+\.)\s*', para_text)
+                    if numbered:
+                        builder.add("numbered", para_text[numbered.end():], runs=runs, location=location, marker=numbered.group(1))
+                    elif para_text.startswith(('•', '-', '*')):
+                        builder.add("bullet", para_text[1:].strip(), runs=runs, location=location, marker=para_text[0])
                     else:
-                        text.append(para_text)
+                        builder.add("bullet", para_text, runs=runs, location=location, marker='•')
                 else:
-                    text.append(para_text)
+                    builder.add("paragraph", para_text, runs=runs, location=location)
             else:
-                text.append("")  # Preserve empty lines
+                builder.add("empty", location=(index,))  # Preserve empty lines
         
-        # Join with single newlines, then clean up
-        result = '\n'.join(text)
-        result = result.replace('\n\n\n', '\n\n')  # Remove excessive line breaks
-        return result.strip()
+        return compact_segments(builder.finish())
     except Exception as e:
         logging.error(f"Error extracting text from DOCX: {e}")
-        return ""
-
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF files using multiple methods for better results"""
+        return []
+
+def _is_pdf_heading(line: str) -> bool:
+    """Heading heuristics for a line of PDF text"""
+    # Check for common heading patterns
+    if (len(line) < 100 and 
+        not any(line.startswith(prefix) for prefix in ['1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '•', '-', 'a)', 'b)', 'c)']) and
+        not line.endswith('.') and
+        (line.isupper() or 
+         line.endswith(':') or
+         line.title() == line or  # Title case
+         line in ['Digital Image Processing (DIP)', 'Introduction', 'Fundamentals', 'Key Steps in DIP', 'Applications', 'Advantages of DIP', 'Conclusion', 'Overview', 'Summary', 'Background', 'Methodology', 'Results', 'Discussion', 'References'])):
+        return True
     
-    # Try pdfplumber first (usually best for text extraction)
-    if PDFPLUMBER_AVAILABLE:
-        try:
-            text = ""
-            with pdfplumber.open(file_path) as pdf:
-                logging.info(f"PDF has {len(pdf.pages)} pages (pdfplumber)")
-                for i, page in enumerate(pdf.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            logging.info(f"Page {i+1} extracted {len(page_text)} characters (pdfplumber)")
-                            # Preserve structure and identify headings
-                            lines = page_text.split('\n')
-                            processed_lines = []
-                            for line in lines:
-                                line = line.strip()
-                                if line:
-                                    # Enhanced heading detection
-                                    is_heading = False
-                                    
-                                    # Check for common heading patterns
-                                    if (len(line) < 100 and 
-                                        not any(line.startswith(prefix) for prefix in ['1.', '2.', '3.', '4.', '5.', '6.', '7.', '8.', '9.', '•', '-', 'a)', 'b)', 'c)']) and
-                                        not line.endswith('.') and
-                                        (line.isupper() or 
-                                         line.endswith(':') or
-                                         line.title() == line or  # Title case
-                                         line in ['Digital Image Processing (DIP)', 'Introduction', 'Fundamentals', 'Key Steps in DIP', 'Applications', 'Advantages of DIP', 'Conclusion', 'Overview', 'Summary', 'Background', 'Methodology', 'Results', 'Discussion', 'References'])):
-                                        is_heading = True
-                                    
-                                    # Additional checks for headings
-                                    if not is_heading and len(line) < 60:
-                                        # Check if line has typical heading characteristics
-                                        words = line.split()
-                                        if (len(words) <= 6 and 
-                                            all(word[0].isupper() for word in words if word.isalpha()) and
-                                            not any(char in line for char in ['.', ',', ';', '(', ')']) and
-                                            len(line) > 5):
-                                            is_heading = True
-                                    
-                                    if is_heading:
-                                        processed_lines.append(f"**{line}**")
-                                    else:
-                                        processed_lines.append(line)
-                            text += '\n'.join(processed_lines) + "\n\n"
-                    except Exception as page_error:
-                        logging.warning(f"Error extracting text from page {i+1}: {page_error}")
-                        continue
-            
-            if text.strip():
-                # Clean up the text while preserving structure
-                text = text.replace('\n\n\n', '\n\n')  # Remove excessive line breaks
-                logging.info(f"pdfplumber extracted {len(text)} characters total")
-                logging.info(f"Text preview: {text[:200]}...")
-                return text.strip()
-        except Exception as e:
-            logging.warning(f"pdfplumber failed: {e}")
-    
-    # Try PyMuPDF (fitz) as second option
-    if MUPDF_AVAILABLE:
+    # Additional checks for headings
+    if len(line) < 60:
+        # Check if line has typical heading characteristics
+        words = line.split()
+        if (len(words) <= 6 and 
+            all(word[0].isupper() for word in words if word.isalpha()) and
+            not any(char in line for char in ['.', ',', ';', '(', ')']) and
+            len(line) > 5):
+            return True
+    return False
+
+def _pdf_page_segments(page_number: int, page_text: str, detect_headings: bool) -> list:
+    """Segments of one page's text; locations are (page, line)"""
+    builder = SegmentBuilder()
+    if detect_headings:
+        # Preserve structure and identify headings
+        for line_no, line in enumerate(page_text.split('\n')):
+            line = line.strip()
+            if line:
+                builder.add_line(line, (page_number, line_no), "heading" if _is_pdf_heading(line) else None)
+        builder.add("empty", location=(page_number,))
+    else:
+        builder.add_text(page_text, (page_number,))
+    return builder.finish()
+
+def _iter_pdf_with_pdfplumber(file_path: str):
+    """pdfplumber extraction with heading detection (usually best for text extraction)"""
+    with pdfplumber.open(file_path) as pdf:
+        logging.info(f"PDF has {len(pdf.pages)} pages (pdfplumber)")
+        for i, page in enumerate(pdf.pages):
+            try:
+                page_text = page.extract_text()
+                logging.debug(f"Page {i+1} extracted {len(page_text or '')} characters (pdfplumber)")
+                yield i + 1, _pdf_page_segments(i + 1, page_text, True) if page_text else []
+            except Exception as page_error:
+                logging.warning(f"Error extracting text from page {i+1}: {page_error}")
+                yield i + 1, []
+            finally:
+                # Parsed layout objects are cached on the page; release them so memory stays flat
+                page.close()
+
+def _iter_pdf_with_pymupdf(file_path: str):
+    """PyMuPDF (fitz) extraction of the plain page text"""
+    doc = fitz.open(file_path)
+    try:
+        logging.info(f"PDF has {len(doc)} pages (PyMuPDF)")
+        for i in range(len(doc)):
+            try:
+                page_text = doc.load_page(i).get_text()
+                logging.debug(f"Page {i+1} extracted {len(page_text)} characters (PyMuPDF)")
+                yield i + 1, _pdf_page_segments(i + 1, page_text, False) if page_text else []
+            except Exception as page_error:
+                logging.warning(f"Error extracting text from page {i+1}: {page_error}")
+                yield i + 1, []
+    finally:
+        doc.close()
+
+def _iter_pdf_with_pypdf2(file_path: str):
+    """PyPDF2 extraction of the plain page text"""
+    with open(file_path, 'rb') as file:
+        pdf_reader = PyPDF2.PdfReader(file)
+        logging.info(f"PDF has {len(pdf_reader.pages)} pages (PyPDF2)")
+        
+        for i, page in enumerate(pdf_reader.pages):
+            try:
+                page_text = page.extract_text()
+                logging.debug(f"Page {i+1} extracted {len(page_text or '')} characters (PyPDF2)")
+                yield i + 1, _pdf_page_segments(i + 1, page_text, False) if page_text else []
+            except Exception as page_error:
+                logging.warning(f"Error extracting text from page {i+1}: {page_error}")
+                yield i + 1, []
+
+# PDF engines in the order iter_pdf_pages tries them: (name, available, page generator)
+PDF_ENGINES = [
+    ("pdfplumber", PDFPLUMBER_AVAILABLE, _iter_pdf_with_pdfplumber),
+    ("PyMuPDF", MUPDF_AVAILABLE, _iter_pdf_with_pymupdf),
+    ("PyPDF2", PDF_AVAILABLE, _iter_pdf_with_pypdf2),
+]
+
+class PdfExtractionAborted(Exception):
+    """Raised by iter_pdf_pages when every engine failed after some pages were already yielded"""
+
+def iter_pdf_pages(file_path: str, engines: list = None, report: dict = None):
+    """Yield (page_number, segments) for each PDF page as soon as it is parsed.
+    Engines are tried in PDF_ENGINES order. Leading pages without text are held back
+    until an engine produces text, so a PDF one engine cannot read falls through to the
+    next; from then on pages stream and only the current page is held in memory.
+    If the streaming engine fails partway, the next engine continues after the last
+    yielded page, and PdfExtractionAborted is raised when none can finish the document.
+    `report` receives the engines that yielded pages and whether the document completed.
+    Segment ids run across the document and repeated blank segments are dropped."""
+    report = report if report is not None else {}
+    report.update({"engines": [], "complete": False})
+    done_pages = 0
+    # Renumbering state as of the last yielded page, restored when an engine is abandoned
+    next_id, last_empty = 0, True
+    for name, available, engine in engines or PDF_ENGINES:
+        if not available:
+            continue
+        pages = engine(file_path)
+        held = []
+        # Once pages were yielded the document is known to have text: continue without holding back
+        streaming = done_pages > 0
+        page_id, page_empty = next_id, last_empty
         try:
-            text = ""
-            doc = fitz.open(file_path)
-            logging.info(f"PDF has {len(doc)} pages (PyMuPDF)")
-            for i in range(len(doc)):
-                try:
-                    page = doc.load_page(i)
-                    page_text = page.get_text()
-                    if page_text:
-                        logging.info(f"Page {i+1} extracted {len(page_text)} characters (PyMuPDF)")
-                        text += page_text + "\n"
-                except Exception as page_error:
-                    logging.warning(f"Error extracting text from page {i+1}: {page_error}")
+            for page_number, segments in pages:
+                if page_number <= done_pages:
                     continue
-            doc.close()
-            
-            if text.strip():
-                logging.info(f"PyMuPDF extracted {len(text)} characters total")
-                logging.info(f"Text preview: {text[:200]}...")
-                return text.strip()
+                page = []
+                for segment in segments:
+                    if segment.type == "empty":
+                        if page_empty:
+                            continue
+                    page_empty = segment.type == "empty"
+                    segment.id = page_id
+                    page_id += 1
+                    page.append(segment)
+                held.append((page_number, page))
+                if not streaming and any(not s.is_empty for s in page):
+                    streaming = True
+                if streaming:
+                    if name not in report["engines"]:
+                        report["engines"].append(name)
+                        logging.info(f"📄 Streaming PDF pages with {name}" + (f" from page {held[0][0]}" if done_pages else ""))
+                    yield from held
+                    held = []
+                    done_pages = page_number
+                    next_id, last_empty = page_id, page_empty
         except Exception as e:
-            logging.warning(f"PyMuPDF failed: {e}")
-    
-    # Fallback to PyPDF2
-    if PDF_AVAILABLE:
+            if done_pages:
+                logging.warning(f"{name} failed after page {done_pages}: {e}")
+            else:
+                logging.warning(f"{name} failed: {e}")
+            continue
+        finally:
+            pages.close()
+        if streaming:
+            report["complete"] = True
+            return
+    if done_pages:
+        raise PdfExtractionAborted(f"No PDF engine could extract the pages after page {done_pages}")
+
+def _pdf_extraction_failure() -> list:
+    return segments_from_text(f"Unable to extract text from PDF. This may be a scanned/image-based PDF. Consider converting to a text-based PDF or using OCR. Available methods: pdfplumber={PDFPLUMBER_AVAILABLE}, PyMuPDF={MUPDF_AVAILABLE}, PyPDF2={PDF_AVAILABLE}")
+
+def extract_segments_from_pdf(file_path: str) -> list:
+    """Extract text from PDF files using multiple methods for better results"""
+    # Each engine reads the whole document on its own, so one failing partway falls through to the next
+    for engine in PDF_ENGINES:
         try:
-            text = ""
-            with open(file_path, 'rb') as file:
-                pdf_reader = PyPDF2.PdfReader(file)
-                logging.info(f"PDF has {len(pdf_reader.pages)} pages (PyPDF2)")
-                
-                for i, page in enumerate(pdf_reader.pages):
-                    try:
-                        page_text = page.extract_text()
-                        if page_text:
-                            logging.info(f"Page {i+1} extracted {len(page_text)} characters (PyPDF2)")
-                            text += page_text + "\n"
-                    except Exception as page_error:
-                        logging.warning(f"Error extracting text from page {i+1}: {page_error}")
-                        continue
-            
-            if text.strip():
-                logging.info(f"PyPDF2 extracted {len(text)} characters total")
-                logging.info(f"Text preview: {text[:200]}...")
-                return text.strip()
-        except Exception as e:
-            logging.warning(f"PyPDF2 failed: {e}")
+            segments = compact_segments([segment for _, page in iter_pdf_pages(file_path, [engine]) for segment in page])
+        except PdfExtractionAborted as e:
+            logging.warning(f"{engine[0]}: {e}")
+            continue
+        if segments:
+            logging.info(f"{engine[0]} extracted {len(segments)} segments, {sum(len(s.text) for s in segments)} characters total")
+            logging.info(f"Text preview: {render_text(segments[:5])[:200]}...")
+            return segments
     
     # If all methods fail or return minimal text
-    return f"Unable to extract text from PDF. This may be a scanned/image-based PDF. Consider converting to a text-based PDF or using OCR. Available methods: pdfplumber={PDFPLUMBER_AVAILABLE}, PyMuPDF={MUPDF_AVAILABLE}, PyPDF2={PDF_AVAILABLE}"
+    return _pdf_extraction_failure()
 
-def extract_text_from_pptx(file_path: str) -> str:
+def extract_segments_from_pptx(file_path: str) -> list:
     """Extract text from PPTX files"""
     if not PPTX_AVAILABLE:
-        return "PPTX processing not available. Please install python-pptx."
+        return segments_from_text("PPTX processing not available. Please install python-pptx.")
     
     try:
         prs = Presentation(file_path)
-        text = []
-        for slide in prs.slides:
-            for shape in slide.shapes:
+        builder = SegmentBuilder()
+        for slide_no, slide in enumerate(prs.slides, 1):
+            for shape_no, shape in enumerate(slide.shapes):
                 if hasattr(shape, "text"):
-                    text.append(shape.text)
-        return '\n'.join(text)
+                    builder.add_text(shape.text, (slide_no, shape_no))
+        return builder.finish()
     except Exception as e:
         logging.error(f"Error extracting text from PPTX: {e}")
-        return ""
+        return []
 
-def extract_text_from_excel(file_path: str) -> str:
+def extract_segments_from_excel(file_path: str) -> list:
     """Extract text from Excel files"""
     if not EXCEL_AVAILABLE:
-        return "Excel processing not available. Please install openpyxl, xlrd, and pandas."
+        return segments_from_text("Excel processing not available. Please install openpyxl, xlrd, and pandas.")
     
     try:
-        text = []
+        builder = SegmentBuilder()
         # Try reading with pandas first
         try:
             df = pd.read_excel(file_path, sheet_name=None)
             for sheet_name, sheet_data in df.items():
-                text.append(f"Sheet: {sheet_name}")
-                text.append(str(sheet_data))
-                text.append("\n")
+                builder.add_line(f"Sheet: {sheet_name}", (sheet_name,))
+                builder.add_text(str(sheet_data), (sheet_name,))
+                builder.add("empty", location=(sheet_name,))
         except:
             # Fallback to openpyxl
+            builder = SegmentBuilder()
             wb = openpyxl.load_workbook(file_path)
             for sheet_name in wb.sheetnames:
                 sheet = wb[sheet_name]
-                text.append(f"Sheet: {sheet_name}")
-                for row in sheet.iter_rows():
+                builder.add_line(f"Sheet: {sheet_name}", (sheet_name,))
+                for row_no, row in enumerate(sheet.iter_rows(), 1):
                     row_data = []
                     for cell in row:
                         if cell.value:
                             row_data.append(str(cell.value))
                     if row_data:
-                        text.append(" | ".join(row_data))
-                text.append("\n")
-        return '\n'.join(text)
+                        builder.add_line(" | ".join(row_data), (sheet_name, row_no))
+                builder.add("empty", location=(sheet_name,))
+        return compact_segments(builder.finish())
     except Exception as e:
         logging.error(f"Error extracting text from Excel: {e}")
-        return ""
+        return []
 
-def extract_text_from_csv(file_path: str) -> str:
+def extract_segments_from_csv(file_path: str) -> list:
     """Extract text from CSV files"""
     if not EXCEL_AVAILABLE:
-        return "CSV processing not available. Please install pandas."
+        return segments_from_text("CSV processing not available. Please install pandas.")
     
     try:
         df = pd.read_csv(file_path)
-        return df.to_string()
+        return segments_from_text(df.to_string())
     except Exception as e:
         logging.error(f"Error extracting text from CSV: {e}")
-        return ""
+        return []
 
-def extract_text_from_txt(file_path: str) -> str:
+def extract_segments_from_txt(file_path: str) -> list:
     """Extract text from plain text files"""
     try:
         with open(file_path, 'r', encoding='utf-8') as file:
-            return file.read()
+            return segments_from_text(file.read())
     except Exception as e:
         logging.error(f"Error extracting text from TXT: {e}")
-        return ""
+        return []
 
-def extract_text_from_image(file_path: str) -> str:
+def extract_segments_from_image(file_path: str) -> list:
     """Extract text from images using OCR"""
     if not OCR_AVAILABLE:
-        return "OCR processing not available. Please install Pillow and pytesseract."
+        return segments_from_text("OCR processing not available. Please install Pillow and pytesseract.")
     
     try:
         image = Image.open(file_path)
@@ -571,13 +596,13 @@ def extract_text_from_image(file_path: str) -> str:
             processed_image = Image.fromarray(thresh)
             text = pytesseract.image_to_string(processed_image)
         
-        return text.strip() if text else ""
+        return segments_from_text(text.strip()) if text and text.strip() else []
     except Exception as e:
         logging.error(f"Error extracting text from image: {e}")
-        return f"OCR failed: {str(e)}"
+        return segments_from_text(f"OCR failed: {str(e)}")
 
-def extract_text_from_document(file_path: str, content_type: str) -> str:
-    """Main function to extract text from various document formats (robust detection)"""
+def _document_extractor(file_path: str, content_type: str):
+    """(name, function) of the extractor for a document's type, or (None, None) if unsupported"""
     # Normalize and improve content type detection
     ext = os.path.splitext(file_path)[1].lower()
     ct = (content_type or "").lower().strip()
@@ -589,28 +614,119 @@ def extract_text_from_document(file_path: str, content_type: str) -> str:
     
     # Word
     if ct == "application/vnd.openxmlformats-officedocument.wordprocessingml.document" or ext == ".docx":
-        return extract_text_from_docx(file_path)
+        return "docx", extract_segments_from_docx
     # PDF
     elif ct == "application/pdf" or ext == ".pdf":
-        return extract_text_from_pdf(file_path)
+        return "pdf", extract_segments_from_pdf
     # PowerPoint
     elif ct == "application/vnd.openxmlformats-officedocument.presentationml.presentation" or ext == ".pptx":
-        return extract_text_from_pptx(file_path)
+        return "pptx", extract_segments_from_pptx
     # Excel
     elif ct in ["application/vnd.openxmlformats-officedocument.spreadsheetml.sheet", "application/vnd.ms-excel"] or ext in (".xlsx", ".xls"):
-        return extract_text_from_excel(file_path)
+        return "excel", extract_segments_from_excel
     # CSV
     elif ct in ["text/csv", "application/csv"] or ext == ".csv":
-        return extract_text_from_csv(file_path)
+        return "csv", extract_segments_from_csv
     # Plain text (treat any text/* as text)
     elif ct.startswith("text/") or ext == ".txt":
-        return extract_text_from_txt(file_path)
+        return "txt", extract_segments_from_txt
     # Images
     elif ct.startswith('image/') or ext in ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.tiff', '.tif'):
-        return extract_text_from_image(file_path)
+        return "image", extract_segments_from_image
     else:
         logging.warning(f"Unsupported file type: ext={ext}, effective_type={ct}")
-        return ""
+        return None, None
+
+def _is_extraction_failure(text: str) -> bool:
+    """True for empty output and the messages extractors return instead of raising"""
+    return (not text.strip() or text.startswith(("OCR failed:", "Unable to extract text from PDF"))
+            or "not available. Please install" in text[:120])
+
+def _extract_cached(file_path: str, extractor, name: str) -> dict:
+    """Run a segment extractor through the extraction cache.
+    Returns {"text": flattened text, "segments": list of Segment}."""
+    digest = None
+    if extraction_cache.enabled:
+        try:
+            digest = file_digest(file_path)
+        except OSError as e:
+            logging.warning(f"Could not hash {file_path} for the extraction cache: {e}")
+        if digest:
+            cached = extraction_cache.get(digest, name, EXTRACTION_VERSION)
+            if cached is not None:
+                logging.info(f"Extraction cache hit ({name}, {len(cached['text'])} characters)")
+                return {"text": cached["text"], "segments": [Segment.from_list(s) for s in cached["segments"]]}
+    started = time.perf_counter()
+    segments = extractor(file_path)
+    text = render_text(segments)
+    # Failures are not cached, so installing a missing library or fixing OCR takes effect at once
+    if digest and not _is_extraction_failure(text):
+        extraction_cache.set(digest, name, {"text": text, "segments": [s.to_list() for s in segments]}, EXTRACTION_VERSION)
+        logging.info(f"Extracted {len(segments)} segments ({name}) in {time.perf_counter() - started:.2f}s, cached")
+    return {"text": text, "segments": segments}
+
+def extract_document(file_path: str, content_type: str) -> dict:
+    """Main function to extract various document formats (robust detection).
+    Returns {"text": flattened text, "segments": list of Segment}."""
+    name, extractor = _document_extractor(file_path, content_type)
+    if extractor is None:
+        return {"text": "", "segments": []}
+    return _extract_cached(file_path, extractor, name)
+
+def iter_document_pages(file_path: str, content_type: str):
+    """Yield (page_number, segments) of a document as it is extracted.
+    PDFs not in the extraction cache stream page by page from iter_pdf_pages and are cached
+    once one engine has read them completely; cached PDFs are replayed page by page; other
+    formats come as one page. Raises PdfExtractionAborted if a PDF could not be finished."""
+    name, extractor = _document_extractor(file_path, content_type)
+    if extractor is None:
+        return
+    if name != "pdf":
+        yield 1, _extract_cached(file_path, extractor, name)["segments"]
+        return
+    
+    digest = None
+    if extraction_cache.enabled:
+        try:
+            digest = file_digest(file_path)
+        except OSError as e:
+            logging.warning(f"Could not hash {file_path} for the extraction cache: {e}")
+        cached = extraction_cache.get(digest, name, EXTRACTION_VERSION) if digest else None
+        if cached is not None:
+            logging.info(f"Extraction cache hit ({name}, {len(cached['text'])} characters)")
+            page_number, page = 1, []
+            for data in cached["segments"]:
+                segment = Segment.from_list(data)
+                if segment.location and segment.location[0] != page_number:
+                    if page:
+                        yield page_number, page
+                    page_number, page = segment.location[0], []
+                page.append(segment)
+            if page:
+                yield page_number, page
+            return
+    
+    started = time.perf_counter()
+    # Segments are only kept for the whole document when there is a cache to fill
+    collected = [] if digest else None
+    pages = 0
+    report = {}
+    # PdfExtractionAborted propagates to the consumer, after the pages that were read
+    for page_number, page in iter_pdf_pages(file_path, report=report):
+        pages += 1
+        if collected is not None:
+            collected.extend(page)
+        yield page_number, page
+    if not pages:
+        yield 1, _pdf_extraction_failure()
+        return
+    if len(report["engines"]) > 1:
+        # Finished by a fallback engine after a failure; retry with a clean run next time
+        logging.info(f"Not caching {name} extraction stitched from {', '.join(report['engines'])}")
+    elif collected:
+        segments = compact_segments(collected)
+        extraction_cache.set(digest, name, {"text": render_text(segments), "segments": [s.to_list() for s in segments]}, EXTRACTION_VERSION)
+        logging.info(f"Extracted {len(segments)} segments ({name}) from {pages} pages in {time.perf_counter() - started:.2f}s, cached")
 
 def decode_html_entities(text: str) -> str:
     """Decode HTML entities in text"""
@@ -622,54 +738,43 @@ def decode_html_entities(text: str) -> str:
         logging.error(f"Error decoding HTML entities: {e}")
         return text
 
-def format_translated_text_for_download(text: str, preserve_structure: bool = True) -> str:
-    """Format translated text for download with proper structure and clear formatting."""
-    if not preserve_structure:
-        return text
-    
-    lines = text.split('\n')
+def format_segments_for_download(segments: list) -> str:
+    """Format translated segments as plain text for download with clear structure."""
     formatted_lines = []
     
-    for i, line in enumerate(lines):
-        line = line.strip()
-        
-        if not line:
+    for segment in segments:
+        if segment.is_empty:
             formatted_lines.append('')
             continue
-            
-        # Check if it's a heading (marked with **)
-        if line.startswith('**') and line.endswith('**') and line.count('**') == 2:
+        
+        if segment.type == "heading":
             # Convert to clear heading format for plain text
-            heading_text = line[2:-2].strip()
+            heading_text = segment.text.replace('**', '').strip()
             formatted_lines.append('')
             formatted_lines.append(heading_text.upper())
             formatted_lines.append('=' * len(heading_text))
             formatted_lines.append('')
-            
-        # Check if it's a bullet point
-        elif line.startswith(('•', '-', '*', '◦')):
-            # Clean up bullet formatting
-            bullet_text = line[1:].strip() if len(line) > 1 else line
-            formatted_lines.append(f"• {bullet_text}")
-            
-        # Check if it's a numbered list
-        elif re.match(r'^\d+\.\s', line):
-            formatted_lines.append(line)
-            
-        # Check for section headers (lines ending with colon)
-        elif line.endswith(':') and len(line) < 100:
-            formatted_lines.append('')
-            formatted_lines.append(line.upper())
-            formatted_lines.append('-' * len(line))
-            formatted_lines.append('')
-            
+        
+        elif segment.type == "bullet":
+            formatted_lines.append(f"• {segment.text}")
+        
+        elif segment.type == "numbered":
+            formatted_lines.append(f"{segment.marker} {segment.text}" if segment.marker else segment.text)
+        
         else:
-            # Regular paragraph - add proper spacing
-            if i > 0 and lines[i-1].strip() and not lines[i-1].strip().startswith(('•', '-', '*')):
-                # Add space between paragraphs
-                if formatted_lines and formatted_lines[-1].strip():
+            for line in segment.text.split('\n'):
+                line = line.strip()
+                # Check for section headers (lines ending with colon)
+                if line.endswith(':') and len(line) < 100:
                     formatted_lines.append('')
-            formatted_lines.append(line)
+                    formatted_lines.append(line.upper())
+                    formatted_lines.append('-' * len(line))
+                    formatted_lines.append('')
+                else:
+                    # Regular paragraph - add proper spacing
+                    if formatted_lines and formatted_lines[-1].strip():
+                        formatted_lines.append('')
+                    formatted_lines.append(line)
     
     # Clean up excessive empty lines
     result_lines = []
@@ -686,14 +791,20 @@ def format_translated_text_for_download(text: str, preserve_structure: bool = Tr
     
     return '\n'.join(result_lines)
 
-def create_translated_document(original_text: str, translated_text: str, original_filename: str, file_extension: str) -> str:
-    """Create a translated document file with proper formatting"""
+def format_translated_text_for_download(text: str, preserve_structure: bool = True) -> str:
+    """Format translated text for download with proper structure and clear formatting."""
+    if not preserve_structure:
+        return text
+    return format_segments_for_download(segments_from_text(text))
+
+def create_translated_document(segments: list, original_filename: str, file_extension: str) -> str:
+    """Create a translated plain-text document from translated segments"""
     try:
         # Decode HTML entities first
-        clean_text = decode_html_entities(translated_text)
+        clean_segments = [segment.with_text(decode_html_entities(segment.text)) for segment in segments]
         
         # Format the text with proper structure
-        formatted_text = format_translated_text_for_download(clean_text, preserve_structure=True)
+        formatted_text = format_segments_for_download(clean_segments)
         
         # Create the file
         temp_file = os.path.join(tempfile.gettempdir(), f"translated_{uuid.uuid4()}.txt")
@@ -778,138 +889,298 @@ def _split_sentences(text: str):
     # Remove empty parts while preserving order
     return [p.strip() for p in parts if p and p.strip()]
 
-
-def identify_line_type(line: str) -> str:
-    """Identify the type of line (heading, bullet, numbered, paragraph)."""
-    line = line.strip()
-    if not line:
-        return "empty"
+def _new_translation_stats(stats: dict = None) -> dict:
+    """Reset (or create) the per-document reuse counters filled in by segment translation"""
+    stats = stats if stats is not None else {}
+    stats.update({
+        "segments": 0, "revision_reused": 0, "cache_hits": 0, "tm_exact": 0, "tm_fuzzy_reused": 0,
+        "tm_fuzzy_offered": 0, "translated": 0, "reused_chars": 0, "translated_chars": 0, "failed": 0,
+    })
+    return stats
+
+async def _translate_segment_texts(segments: list, fingerprints: list, previous_translations: dict, source_lang: str, target_lang: str, headers: dict, max_chunk_len: int, use_localization: bool, max_concurrency: int, stats: dict):
+    """Translations of the segments' text (in order, "" for blank segments) and the indices
+    whose upstream translation failed. Adds to the counters in `stats`.
+    Raises TranslationError on a fatal upstream error."""
+    tm_profile = "localized" if use_localization else ""
     
-    # Check for headings (marked with ** or short lines that look like titles)
-    if line.startswith('**') and line.endswith('**'):
-        return "heading"
+    # Resolve unchanged and cached elements; everything else is pending
+    translations = [""] * len(segments)
+    lookups = []
+    for i, segment in enumerate(segments):
+        if fingerprints[i] is None:
+            continue
+        stats["segments"] += 1
+        if fingerprints[i] in previous_translations:
+            translations[i] = previous_translations[fingerprints[i]]
+            stats["revision_reused"] += 1
+            stats["reused_chars"] += len(segment.text)
+            continue
+        lookups.append(i)
+    # One cache transaction per document, off the event loop
+    cached_translations = await asyncio.to_thread(
+        translation_cache.get_many,
+        [_translate_cache_key(segments[i].text, source_lang, target_lang, use_localization) for i in lookups]
+    ) if lookups else []
+    pending = []
+    for i, cached in zip(lookups, cached_translations):
+        if cached is not None:
+            translations[i] = cached
+            stats["cache_hits"] += 1
+        else:
+            pending.append(i)
     
-    # Check for bullet points
-    if line.startswith(('•', '-', '*', '◦', '▪', '▫')):
-        return "bullet"
+    # Reuse translation memory matches: exact ones always, near ones only when TM_REUSE_FUZZY is set
+    if pending and translation_memory.enabled:
+        matches = await asyncio.to_thread(
+            translation_memory.lookup_many, [segments[i].text for i in pending],
+            source_lang, target_lang, tm_profile
+        )
+        remaining = []
+        exact = []
+        for i, match in zip(pending, matches):
+            if match and (match["kind"] == "exact" or translation_memory.reuse_fuzzy):
+                translations[i] = match["target"]
+                stats["tm_exact" if match["kind"] == "exact" else "tm_fuzzy_reused"] += 1
+                stats["reused_chars"] += len(segments[i].text)
+                if match["kind"] == "exact":
+                    exact.append((_translate_cache_key(segments[i].text, source_lang, target_lang, use_localization), match["target"]))
+            else:
+                if match:
+                    stats["tm_fuzzy_offered"] += 1
+                remaining.append(i)
+        pending = remaining
+        if exact:
+            await asyncio.to_thread(translation_cache.set_many, exact)
     
-    # Check for numbered lists
-    if re.match(r'^\d+\.\s', line):
-        return "numbered"
+    # Split oversized segments at sentence/word boundaries so every request stays within the limit
+    units = []  # (segment index, source text)
+    for i in pending:
+        for piece in chunk_text(segments[i].text, max_chunk_len):
+            units.append((i, piece))
+    unit_translations = [""] * len(units)
+    failed_units = set()  # pieces upstream did not translate (left as their source text)
     
-    # Check for potential headings (short lines, title case, no punctuation at end)
-    if (len(line) < 80 and 
-        not line.endswith('.') and 
-        not line.startswith(('1.', '2.', '3.', '4.', '5.')) and
-        (line.isupper() or line.istitle() or ':' in line)):
-        return "heading"
+    # Localize every segment up front so the simplification backend sees them in batches
+    inputs = [source for _, source in units]
+    if use_localization and inputs:
+        inputs = await simplifier.simplify_many(inputs)
     
-    return "paragraph"
-
-def translate_text_preserving_structure(text: str, source_lang: str, target_lang: str, headers: dict, max_chunk_len: int = 250, use_localization: bool = False):
-    """Translate text while preserving document structure (headings, bullets, paragraphs).
-    Returns (translated_text, error_message)."""
+    packs = pack_segments(inputs, max_chunk_len)
+    if units:
+        logging.info(f"Packed {len(pending)} segments ({len(units)} pieces) into {len(packs)} translate requests")
     
-    # Split text into lines and analyze structure
-    lines = text.split('\n')
-    structured_content = []
+    # Translate packs concurrently, reassembling them in original order
+    semaphore = asyncio.Semaphore(max_concurrency or TRANSLATE_MAX_CONCURRENCY)
     
-    # Group lines by type and content
-    current_paragraph = []
+    async def translate_pack(pack):
+        sources = [inputs[u] for u in pack]
+        if len(pack) == 1:
+            async with semaphore:
+                translated_text, err, failed = await translate_batch(sources[0], source_lang, target_lang, headers, use_cache=False)
+            if err:
+                raise TranslationError(err)
+            parts = [translated_text]
+        else:
+            packed = SEGMENT_DELIMITER.join(sources)
+            async with semaphore:
+                translated_text, err, failed = await translate_batch(packed, source_lang, target_lang, headers, use_cache=False)
+            if err:
+                raise TranslationError(err)
+            parts = sources if failed else split_packed_translation(translated_text, len(pack))
+            if parts is None:
+                # Delimiters were lost in translation: fall back to one request per segment
+                logging.warning(f"Could not split translated pack of {len(pack)} segments, retrying individually")
+                await asyncio.gather(*(translate_pack([u]) for u in pack))
+                return
+        
+        for u, part in zip(pack, parts):
+            unit_translations[u] = part
+        if failed:
+            failed_units.update(pack)
     
-    for line in lines:
-        line_type = identify_line_type(line)
-        
-        if line_type == "empty":
-            # End current paragraph if exists
-            if current_paragraph:
-                structured_content.append({
-                    "type": "paragraph",
-                    "content": current_paragraph,
-                    "raw": '\n'.join(current_paragraph)
-                })
-                current_paragraph = []
-            # Add empty line
-            structured_content.append({"type": "empty", "content": [""], "raw": ""})
-            
-        elif line_type in ["heading", "bullet", "numbered"]:
-            # End current paragraph if exists
-            if current_paragraph:
-                structured_content.append({
-                    "type": "paragraph",
-                    "content": current_paragraph,
-                    "raw": '\n'.join(current_paragraph)
-                })
-                current_paragraph = []
-            
-            # Add special line
-            structured_content.append({
-                "type": line_type,
-                "content": [line.strip()],
-                "raw": line.strip()
-            })
-            
-        else:  # paragraph
-            current_paragraph.append(line.strip())
+    tasks = [asyncio.ensure_future(translate_pack(pack)) for pack in packs]
+    try:
+        # Fail fast: the first fatal error aborts the whole document
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
     
-    # Handle remaining paragraph
-    if current_paragraph:
-        structured_content.append({
-            "type": "paragraph",
-            "content": current_paragraph,
-            "raw": '\n'.join(current_paragraph)
-        })
+    # Rejoin the pieces of split segments
+    failed = set()
+    for u, ((i, _), translated) in enumerate(zip(units, unit_translations)):
+        translations[i] = f"{translations[i]} {translated}" if translations[i] else translated
+        # Untranslated pieces keep their source text; never cache that
+        if u in failed_units:
+            failed.add(i)
+    translated = [i for i in pending if i not in failed]
+    if translated:
+        await asyncio.to_thread(
+            translation_cache.set_many,
+            [(_translate_cache_key(segments[i].text, source_lang, target_lang, use_localization), translations[i]) for i in translated]
+        )
+    if translated and translation_memory.enabled:
+        await asyncio.to_thread(
+            translation_memory.add_many, [(segments[i].text, translations[i]) for i in translated],
+            source_lang, target_lang, tm_profile
+        )
+    stats["translated"] += len(pending)
+    stats["translated_chars"] += sum(len(segments[i].text) for i in pending)
+    stats["failed"] += len(failed)
+    return translations, failed
+
+async def _save_document_revision(document_key: str, revision_pair: str, elements: list, fingerprints: list, previous_revision: int, previous_elements: list, stats: dict):
+    """Record a translated revision ([[fingerprint, translation], ...]) so the next upload of the
+    document only translates what changed, and add the revision diff to `stats`"""
+    revision = await asyncio.to_thread(document_revisions.save, document_key, revision_pair, elements)
+    document_revisions.reused_elements += stats["revision_reused"]
+    stats["revision"] = {
+        "document_key": document_key,
+        "previous": previous_revision,
+        "current": revision,
+        **diff_fingerprints([fp for fp, _ in previous_elements], [fp for fp in fingerprints if fp is not None]),
+    }
+    if previous_revision:
+        logging.info(f"📝 Revision {revision} of '{document_key}': {stats['revision']['unchanged']} unchanged, "
+                     f"{stats['revision']['changed']} changed, {stats['revision']['added']} added, "
+                     f"{stats['revision']['removed']} removed")
+
+def _log_translation_stats(stats: dict):
+    if stats["segments"]:
+        logging.info(f"🧠 Translation memory: {stats['segments']} segments, {stats['revision_reused']} from previous revision, {stats['cache_hits']} cached, "
+                     f"{stats['tm_exact']} exact, {stats['tm_fuzzy_reused']} fuzzy reused "
+                     f"({stats['tm_fuzzy_offered']} offered), {stats['translated']} translated")
+
+async def translate_segments(segments: list, source_lang: str, target_lang: str, headers: dict, max_chunk_len: int = SARVAM_TRANSLATE_MAX_CHARS, use_localization: bool = False, max_concurrency: int = None, tm_stats: dict = None, document_key: str = None):
+    """Translate the text of every segment, keeping type, level, formatting and location.
+    Oversized segments are split into sub-requests of at most `max_chunk_len` characters, small
+    ones are packed into as few requests as that limit allows, and requests are sent
+    concurrently, at most `max_concurrency` at a time.
+    With a `document_key`, segments unchanged since that document's last translation are
+    spliced in from it and only added or edited segments are translated. Segments found in the
+    translation memory are reused as well; pass a dict as `tm_stats` to receive this
+    document's reuse counts and, as "failed", the number of segments left untranslated.
+    Returns (translated_segments, error_message)."""
     
-    # Translate each structured element
-    translated_elements = []
+    stats = _new_translation_stats(tm_stats)
     
-    for element in structured_content:
-        if element["type"] == "empty":
-            translated_elements.append("")
-        elif element["raw"].strip():
-            # Translate the content
-            translated_text, err = translate_batch(element["raw"], source_lang, target_lang, headers, use_localization)
-            if err:
-                return "", err
-            
-            # Preserve the original structure markers
-            if element["type"] == "heading":
-                # Keep heading format
-                if translated_text.startswith('**') and translated_text.endswith('**'):
-                    translated_elements.append(translated_text)
-                else:
-                    translated_elements.append(f"**{translated_text}**")
-            elif element["type"] == "bullet":
-                # Ensure bullet format is preserved
-                if not translated_text.startswith(('•', '-', '*')):
-                    translated_elements.append(f"• {translated_text}")
-                else:
-                    translated_elements.append(translated_text)
-            elif element["type"] == "numbered":
-                # Try to preserve numbering
-                match = re.match(r'^(\d+\.\s*)', element["raw"])
-                if match:
-                    number_part = match.group(1)
-                    content_part = translated_text.replace(number_part, "").strip()
-                    translated_elements.append(f"{number_part}{content_part}")
-                else:
-                    translated_elements.append(translated_text)
-            else:
-                translated_elements.append(translated_text)
-        else:
-            translated_elements.append("")
+    # Previous revision of this document: fingerprint -> translation
+    fingerprints = [None if segment.is_empty else fingerprint(segment.text) for segment in segments]
+    revision_pair = TranslationMemory.make_pair(source_lang, target_lang, "localized" if use_localization else "")
+    previous_revision, previous_elements = 0, []
+    if document_key and document_revisions.enabled:
+        previous_revision, previous_elements = await asyncio.to_thread(document_revisions.load, document_key, revision_pair)
+    previous_translations = dict((fp, translated) for fp, translated in previous_elements)
+    
+    try:
+        translations, failed = await _translate_segment_texts(
+            segments, fingerprints, previous_translations, source_lang, target_lang, headers,
+            max_chunk_len, use_localization, max_concurrency, stats
+        )
+    except TranslationError as e:
+        return [], e.args[0]
     
-    return '\n'.join(translated_elements), None
+    if document_key and document_revisions.enabled:
+        current_elements = [[fingerprints[i], translations[i]] for i in range(len(segments))
+                            if fingerprints[i] is not None and translations[i] and i not in failed]
+        await _save_document_revision(document_key, revision_pair, current_elements, fingerprints, previous_revision, previous_elements, stats)
+    _log_translation_stats(stats)
+    
+    return [segment.with_text(translations[i]) for i, segment in enumerate(segments)], None
+
+async def translate_segment_pages(pages, source_lang: str, target_lang: str, headers: dict, max_chunk_len: int = SARVAM_TRANSLATE_MAX_CHARS, use_localization: bool = False, max_concurrency: int = None, tm_stats: dict = None, document_key: str = None, batch_chars: int = None):
+    """Translate a document page by page while it is still being extracted.
+    `pages` is a ThreadedIterator of (page_number, segments). Each batch takes the next page
+    plus whatever pages the extractor has already buffered (up to `batch_chars` characters), so
+    the first page is translated alone and later pages share requests when extraction runs ahead.
+    Revision reuse, the cache and the translation memory work as in translate_segments.
+    Yields (page_number, segments, translated_segments, error_message); after a fatal
+    translation error the remaining pages are still yielded, untranslated (None)."""
+    
+    stats = _new_translation_stats(tm_stats)
+    batch_chars = batch_chars or DOCUMENT_PIPELINE_BATCH_CHARS
+    revision_pair = TranslationMemory.make_pair(source_lang, target_lang, "localized" if use_localization else "")
+    previous_revision, previous_elements = 0, []
+    if document_key and document_revisions.enabled:
+        previous_revision, previous_elements = await asyncio.to_thread(document_revisions.load, document_key, revision_pair)
+    previous_translations = dict((fp, translated) for fp, translated in previous_elements)
+    current_elements = []
+    document_fingerprints = []
+    error = None
+    
+    async for page in pages:
+        batch = [page]
+        size = sum(len(s.text) for s in page[1])
+        while size < batch_chars:
+            more = pages.drain(1)
+            if not more:
+                break
+            batch.extend(more)
+            size += sum(len(s.text) for s in more[0][1])
+        
+        if error:
+            for page_number, segments in batch:
+                yield page_number, segments, None, error
+            continue
+        
+        segments = [s for _, page_segments in batch for s in page_segments]
+        fingerprints = [None if segment.is_empty else fingerprint(segment.text) for segment in segments]
+        try:
+            translations, failed = await _translate_segment_texts(
+                segments, fingerprints, previous_translations, source_lang, target_lang, headers,
+                max_chunk_len, use_localization, max_concurrency, stats
+            )
+        except TranslationError as e:
+            error = e.args[0]
+            for page_number, page_segments in batch:
+                yield page_number, page_segments, None, error
+            continue
+        document_fingerprints.extend(fingerprints)
+        current_elements.extend([fingerprints[i], translations[i]] for i in range(len(segments))
+                                if fingerprints[i] is not None and translations[i] and i not in failed)
+        
+        offset = 0
+        for page_number, page_segments in batch:
+            translated = [segment.with_text(translations[offset + i]) for i, segment in enumerate(page_segments)]
+            offset += len(page_segments)
+            yield page_number, page_segments, translated, None
+    
+    # Nothing extracted means nothing to compare against next time; keep the stored revision
+    if document_key and document_revisions.enabled and not error and current_elements:
+        await _save_document_revision(document_key, revision_pair, current_elements, document_fingerprints, previous_revision, previous_elements, stats)
+    _log_translation_stats(stats)
 
-def translate_batch(text: str, source_lang: str, target_lang: str, headers: dict, use_localization: bool = False):
-    """Translate a batch of text while preserving line structure with optional BLOOMZ localization."""
+async def translate_text_preserving_structure(text: str, source_lang: str, target_lang: str, headers: dict, max_chunk_len: int = SARVAM_TRANSLATE_MAX_CHARS, use_localization: bool = False, max_concurrency: int = None, tm_stats: dict = None, document_key: str = None):
+    """Translate flattened text while preserving document structure (headings, bullets, paragraphs).
+    Returns (translated_text, error_message)."""
+    translated, err = await translate_segments(
+        segments_from_text(text), source_lang, target_lang, headers, max_chunk_len, use_localization,
+        max_concurrency, tm_stats, document_key
+    )
+    if err:
+        return "", err
+    return render_text(translated), None
+
+async def translate_batch(text: str, source_lang: str, target_lang: str, headers: dict, use_localization: bool = False, use_cache: bool = True):
+    """Translate a batch of text while preserving line structure with optional localization.
+    With use_cache=False the translation cache is neither consulted nor updated.
+
+    Returns (translated_text, error, failed). A fatal error (timeout, open circuit) is
+    reported in `error`; when upstream answers without a translation the input text is
+    returned unchanged with `failed` set."""
+    
+    cache_key = _translate_cache_key(text, source_lang, target_lang, use_localization)
+    if use_cache:
+        cached = await asyncio.to_thread(translation_cache.get, cache_key)
+        if cached is not None:
+            return cached, None, False
     
     input_text = text
     
-    # Step 1: Optionally localize text for Indian context using BLOOMZ
+    # Step 1: Optionally localize text for Indian context
     if use_localization:
-        input_text = localize_text_for_indian_context(text)
-        logging.info(f"BLOOMZ localization: '{text[:50]}...' -> '{input_text[:50]}...'")
+        input_text = await localize_text_for_indian_context(text)
     
     # Step 2: Translate the text using Sarvam API
     payload = {
@@ -923,252 +1194,160 @@ def translate_batch(text: str, source_lang: str, target_lang: str, headers: dict
     }
     
     try:
-        resp = requests.post(
-            SARVAM_TRANSLATE_URL, headers=headers, json=payload,
+        resp = await sarvam_client.post(
+            "translate", SARVAM_TRANSLATE_URL, headers=headers, json=payload,
             timeout=(10, 120)
         )
-    except Timeout:
-        return "", "timeout"
+    except httpx.TimeoutException:
+        return "", "timeout", True
+    except CircuitOpenError as e:
+        return "", str(e), True
     
     if resp.status_code != 200:
         logging.error(f"Translation API error: {resp.status_code} - {resp.text}")
-        return text, None  # Return original text if translation fails
+        return text, None, True  # Return original text if translation fails
     
     j = resp.json()
     translated = j.get("translated_text", "")
     
     if not translated:
         logging.error(f"Missing translated_text: {j}")
-        return text, None  # Return original text if translation fails
+        return text, None, True  # Return original text if translation fails
     
     # Decode HTML entities
     translated = decode_html_entities(translated)
+    if use_cache:
+        await asyncio.to_thread(translation_cache.set, cache_key, translated)
     
-    # Add small delay between requests to avoid rate limiting
-    import time
-    time.sleep(0.2)
-    
-    return translated, None
+    return translated, None, False
+
+def _translate_cache_key(text: str, source_lang: str, target_lang: str, use_localization: bool = False) -> str:
+    """Cache key for the fixed translate payload used by translate_batch and _sarvam_translate"""
+    return TranslationCache.make_key(
+        text, source_lang, target_lang, model="mayura:v1", mode="formal",
+        enable_preprocessing=True, use_localization=use_localization
+    )
 
-def translate_text_chunked_sentences(text: str, source_lang: str, target_lang: str, headers: dict, max_chunk_len: int = 500):
+async def translate_text_chunked_sentences(text: str, source_lang: str, target_lang: str, headers: dict, max_chunk_len: int = 500):
     """Translate text by grouping sentences into chunks <= max_chunk_len, preserving meaning boundaries.
     Returns (translated_text, error_message)."""
     # Use the new structure-preserving function
-    return translate_text_preserving_structure(text, source_lang, target_lang, headers, max_chunk_len)
-
+    return await translate_text_preserving_structure(text, source_lang, target_lang, headers, max_chunk_len)
+
+
+def _add_docx_runs(para, text: str, flags: int = 0):
+    """Add text to a DOCX paragraph, bolding **text** spans and applying segment-wide formatting"""
+    parts = text.split('**')
+    for i, part in enumerate(parts):
+        if part:
+            run = para.add_run(part)
+            if i % 2 == 1 or flags & BOLD:  # Odd indices are between ** markers
+                run.bold = True
+            if flags & ITALIC:
+                run.italic = True
+            if flags & UNDERLINE:
+                run.underline = True
+
+def write_docx_segments(segments: list, out_path: str):
+    """Lay out segments as a new DOCX: headings at their level, list items and justified paragraphs"""
+    doc = Document()
+    for segment in segments:
+        if segment.is_empty:
+            continue
+        if segment.type == "heading":
+            heading = doc.add_heading(segment.text.replace('**', ''), level=min(max(segment.level, 1), 9))
+            heading.alignment = 0
+        elif segment.type in ("bullet", "numbered"):
+            # Add list item with formatting
+            para = doc.add_paragraph()
+            para.alignment = 3
+            para.paragraph_format.space_after = 6
+            _add_docx_runs(para, f"{segment.marker or '•'} {segment.text}", segment.formatting)
+        else:
+            para = doc.add_paragraph()
+            para.alignment = 3
+            para.paragraph_format.space_after = 12
+            para.paragraph_format.line_spacing = 1.15
+            _add_docx_runs(para, ' '.join(segment.text.split('\n')), segment.formatting)
+    doc.save(out_path)
 
-def create_translated_docx(in_path: str, out_path: str, source_lang: str, target_lang: str):
+async def create_translated_docx(in_path: str, out_path: str, source_lang: str, target_lang: str, tm_stats: dict = None, document_key: str = None):
     """Create a translated DOCX preserving layout (paragraphs, bullets, headings). Returns (success, error)."""
     if not DOCX_AVAILABLE:
         return False, "DOCX support not available"
     try:
-        # Extract text with structure
-        extracted_text = extract_text_from_docx(in_path)
-        if not extracted_text:
+        # Extract the document's segments
+        segments = _extract_cached(in_path, extract_segments_from_docx, "docx")["segments"]
+        if all(s.is_empty for s in segments):
             return False, "No text extracted from DOCX"
         
-        # Translate the full text while preserving structure
+        # Translate every segment, keeping its structure
         headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
-        translated_text, err = translate_text_preserving_structure(extracted_text, source_lang, target_lang, headers)
+        translated, err = await translate_segments(segments, source_lang, target_lang, headers, tm_stats=tm_stats, document_key=document_key)
         if err:
             return False, f"Translation failed: {err}"
         
-        # Create new DOCX with translated text
-        doc = Document()
-        
-        def add_formatted_paragraph(text, doc):
-            """Add paragraph with bold formatting for **text**"""
-            para = doc.add_paragraph()
-            para.alignment = 3
-            para.paragraph_format.space_after = 12
-            para.paragraph_format.line_spacing = 1.15
-            
-            # Split text by ** markers and add runs
-            parts = text.split('**')
-            for i, part in enumerate(parts):
-                if part:
-                    run = para.add_run(part)
-                    if i % 2 == 1:  # Odd indices are between ** markers
-                        run.bold = True
-        
-        # Process the translated text line by line to preserve structure
-        lines = translated_text.split('\n')
-        current_paragraph = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            if not line:  # Empty line - end current paragraph
-                if current_paragraph:
-                    para_text = ' '.join(current_paragraph)
-                    if para_text.startswith('**') and para_text.endswith('**') and para_text.count('**') == 2:
-                        heading_text = para_text[2:-2]
-                        heading = doc.add_heading(heading_text, level=1)
-                        heading.alignment = 0
-                    else:
-                        add_formatted_paragraph(para_text, doc)
-                    current_paragraph = []
-                continue
-            
-            # Check if it's a heading (marked with **)
-            if line.startswith('**') and line.endswith('**') and line.count('**') == 2:
-                # Finish current paragraph first
-                if current_paragraph:
-                    para_text = ' '.join(current_paragraph)
-                    add_formatted_paragraph(para_text, doc)
-                    current_paragraph = []
-                
-                # Add heading
-                heading_text = line[2:-2]
-                heading = doc.add_heading(heading_text, level=1)
-                heading.alignment = 0
-            elif line.startswith(('1.', '2.', '3.', '4.', '5.', '•', '-')):
-                # Finish current paragraph first
-                if current_paragraph:
-                    para_text = ' '.join(current_paragraph)
-                    add_formatted_paragraph(para_text, doc)
-                    current_paragraph = []
-                
-                # Add list item with formatting
-                para = doc.add_paragraph()
-                para.alignment = 3
-                para.paragraph_format.space_after = 6
-                parts = line.split('**')
-                for i, part in enumerate(parts):
-                    if part:
-                        run = para.add_run(part)
-                        if i % 2 == 1:
-                            run.bold = True
-            else:
-                # Add to current paragraph
-                current_paragraph.append(line)
-        
-        # Handle any remaining paragraph
-        if current_paragraph:
-            para_text = ' '.join(current_paragraph)
-            if para_text.startswith('**') and para_text.endswith('**') and para_text.count('**') == 2:
-                heading_text = para_text[2:-2]
-                heading = doc.add_heading(heading_text, level=1)
-                heading.alignment = 0
-            else:
-                add_formatted_paragraph(para_text, doc)
-        
-        doc.save(out_path)
+        # Create new DOCX with translated segments
+        write_docx_segments(translated, out_path)
         return True, None
     except Exception as e:
         logging.error(f"Error creating translated DOCX: {e}")
         return False, str(e)
 
 
-def create_translated_pdf(in_path: str, out_path: str, source_lang: str, target_lang: str):
+def _add_pdf_text(page, text, x, y, width, height, fontsize=12, is_heading=False):
+    """Add text to a PDF page; **text** markers are dropped (PyMuPDF has limited rich text support)"""
+    rect = fitz.Rect(x, y, x + width, y + height)
+    clean_text = text.replace('**', '')
+    if is_heading:
+        page.insert_textbox(rect, clean_text, fontsize=fontsize, fontname="hebo", align=0)
+    else:
+        page.insert_textbox(rect, clean_text, fontsize=fontsize, fontname="helv", align=3)
+    return height
+
+def write_pdf_segments(segments: list, out_path: str):
+    """Lay out segments as a new PDF: bold headings, then paragraphs and list items sized by word count"""
+    doc = fitz.open()  # Create new PDF
+    page = doc.new_page()
+    y_position = 50
+    for segment in segments:
+        if not segment.is_empty:
+            if segment.type == "heading":
+                height = _add_pdf_text(page, segment.text, 50, y_position, 500, 30, 16, True)
+            else:
+                text = f"{segment.marker} {segment.text}" if segment.type in ("bullet", "numbered") and segment.marker else segment.text
+                text = ' '.join(text.split('\n'))
+                # Calculate required height for paragraph
+                words_per_line = 12
+                lines_needed = max(1, len(text.replace('**', '').split()) // words_per_line + 1)
+                height = _add_pdf_text(page, text, 50, y_position, 500, lines_needed * 18 + 6, 12, False)
+            y_position += height + 10
+        
+        # Add new page if needed
+        if y_position > 700:
+            page = doc.new_page()
+            y_position = 50
+    doc.save(out_path)
+    doc.close()
+
+async def create_translated_pdf(in_path: str, out_path: str, source_lang: str, target_lang: str, tm_stats: dict = None, document_key: str = None):
     """Create a translated PDF preserving layout as much as possible. Returns (success, error)."""
     if not MUPDF_AVAILABLE:
         return False, "PDF layout preservation not available (requires PyMuPDF)"
     try:
-        # Extract text with structure
-        extracted_text = extract_text_from_pdf(in_path)
-        if not extracted_text:
+        # Extract the document's segments
+        segments = _extract_cached(in_path, extract_segments_from_pdf, "pdf")["segments"]
+        if all(s.is_empty for s in segments):
             return False, "No text extracted from PDF"
         
-        # Translate the full text while preserving structure
+        # Translate every segment, keeping its structure
         headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
-        translated_text, err = translate_text_preserving_structure(extracted_text, source_lang, target_lang, headers)
+        translated, err = await translate_segments(segments, source_lang, target_lang, headers, tm_stats=tm_stats, document_key=document_key)
         if err:
             return False, f"Translation failed: {err}"
         
-        # Create new PDF with translated text
-        doc = fitz.open()  # Create new PDF
-        page = doc.new_page()
-        
-        def add_formatted_text_to_pdf(page, text, x, y, width, height, fontsize=12, is_heading=False):
-            """Add text with bold formatting for **text** to PDF"""
-            if is_heading:
-                # Remove ** markers for headings
-                clean_text = text.replace('**', '')
-                rect = fitz.Rect(x, y, x + width, y + height)
-                page.insert_textbox(rect, clean_text, fontsize=fontsize, fontname="helv-bold", align=0)
-                return height
-            else:
-                # Handle inline bold formatting
-                parts = text.split('**')
-                if len(parts) == 1:
-                    # No formatting
-                    rect = fitz.Rect(x, y, x + width, y + height)
-                    page.insert_textbox(rect, text, fontsize=fontsize, fontname="helv", align=3)
-                    return height
-                else:
-                    # Has formatting - for PDF, just remove ** markers (PyMuPDF has limited rich text support)
-                    clean_text = ''.join(parts)
-                    rect = fitz.Rect(x, y, x + width, y + height)
-                    page.insert_textbox(rect, clean_text, fontsize=fontsize, fontname="helv", align=3)
-                    return height
-        
-        # Process text line by line to preserve structure
-        y_position = 50
-        lines = translated_text.split('\n')
-        current_paragraph = []
-        
-        for line in lines:
-            line = line.strip()
-            
-            if not line:  # Empty line - process current paragraph
-                if current_paragraph:
-                    para_text = ' '.join(current_paragraph)
-                    if para_text.startswith('**') and para_text.endswith('**') and para_text.count('**') == 2:
-                        height = add_formatted_text_to_pdf(page, para_text, 50, y_position, 500, 25, 16, True)
-                        y_position += height + 10
-                    else:
-                        # Calculate required height for paragraph
-                        words_per_line = 12
-                        lines_needed = max(1, len(para_text.replace('**', '').split()) // words_per_line + 1)
-                        height = lines_needed * 15
-                        add_formatted_text_to_pdf(page, para_text, 50, y_position, 500, height, 12, False)
-                        y_position += height + 10
-                    current_paragraph = []
-                
-                # Add new page if needed
-                if y_position > 700:
-                    page = doc.new_page()
-                    y_position = 50
-                continue
-            
-            # Check if it's a heading
-            if line.startswith('**') and line.endswith('**') and line.count('**') == 2:
-                # Process current paragraph first
-                if current_paragraph:
-                    para_text = ' '.join(current_paragraph)
-                    words_per_line = 12
-                    lines_needed = max(1, len(para_text.replace('**', '').split()) // words_per_line + 1)
-                    height = lines_needed * 15
-                    add_formatted_text_to_pdf(page, para_text, 50, y_position, 500, height, 12, False)
-                    y_position += height + 10
-                    current_paragraph = []
-                
-                # Add heading
-                height = add_formatted_text_to_pdf(page, line, 50, y_position, 500, 25, 16, True)
-                y_position += height + 10
-            else:
-                # Add to current paragraph
-                current_paragraph.append(line)
-            
-            # Add new page if needed
-            if y_position > 700:
-                page = doc.new_page()
-                y_position = 50
-        
-        # Handle any remaining paragraph
-        if current_paragraph:
-            para_text = ' '.join(current_paragraph)
-            if para_text.startswith('**') and para_text.endswith('**') and para_text.count('**') == 2:
-                add_formatted_text_to_pdf(page, para_text, 50, y_position, 500, 25, 16, True)
-            else:
-                words_per_line = 12
-                lines_needed = max(1, len(para_text.replace('**', '').split()) // words_per_line + 1)
-                height = lines_needed * 15
-                add_formatted_text_to_pdf(page, para_text, 50, y_position, 500, height, 12, False)
-        
-        doc.save(out_path)
-        doc.close()
+        # Create new PDF with translated segments
+        write_pdf_segments(translated, out_path)
         return True, None
     except Exception as e:
         logging.error(f"Error creating translated PDF: {e}")
@@ -1185,7 +1364,7 @@ def create_translated_pdf(in_path: str, out_path: str, source_lang: str, target_
             txt = p.text or ""
             if not txt.strip():
                 continue
-            translated, err = translate_text_chunked_sentences(txt, source_lang, target_lang, headers)
+            translated, err = await translate_text_chunked_sentences(txt, source_lang, target_lang, headers)
             if err:
                 logging.error(f"Paragraph translation error: {err}")
                 return False, err
@@ -1200,7 +1379,7 @@ def create_translated_pdf(in_path: str, out_path: str, source_lang: str, target_
                         txt = p.text or ""
                         if not txt.strip():
                             continue
-                        translated, err = translate_text_chunked_sentences(txt, source_lang, target_lang, headers)
+                        translated, err = await translate_text_chunked_sentences(txt, source_lang, target_lang, headers)
                         if err:
                             logging.error(f"Table cell translation error: {err}")
                             return False, err
@@ -1223,8 +1402,9 @@ async def tts(text: str = Form(...), lang: str = Form(...)):
     return FileResponse(wav_path, media_type="audio/wav")
 
 @app.post("/api/speech-to-text")
-async def speech_to_text(file: UploadFile = File(...), language_code: str = Form("auto")):
-    logging.info(f"Received file: {file.filename}, content_type: {file.content_type}, lang: {language_code}")
+async def speech_to_text(file: UploadFile = File(...), language_code: str = Form("auto"),
+                         use_text_preprocessing: bool = Form(False), tenant: str = Form(None)):
+    logging.info(f"Received file: {file.filename}, content_type: {file.content_type}, lang: {language_code}, preprocessing: {use_text_preprocessing}")
     try:
         file.file.seek(0)
         mime = file.content_type
@@ -1237,6 +1417,9 @@ async def speech_to_text(file: UploadFile = File(...), language_code: str = Form
         logging.info(f"Audio duration: {duration_sec:.2f} seconds")
         chunk_length_ms = 30 * 1000
         transcripts = []
+        # Clean each chunk's transcript as it arrives rather than the joined text at the end
+        cleaner = preprocessor.stream(input_type="stt", source_lang=language_code, tenant=tenant) if use_text_preprocessing else None
+        cleaned = []
         if duration_sec > 30:
             logging.info("Audio longer than 30s, splitting into chunks...")
             for i in range(0, len(audio), chunk_length_ms):
@@ -1249,20 +1432,29 @@ async def speech_to_text(file: UploadFile = File(...), language_code: str = Form
                 data = {"language_code": language_code}
                 logging.info(f"Sending chunk {i//chunk_length_ms+1} to Sarvam STT API...")
                 try:
-                    response = requests.post(SARVAM_STT_URL, headers=headers, files=files, data=data, timeout=(10, 120))
-                except Timeout:
-                    logging.error(f"Sarvam STT API chunk {i//chunk_length_ms+1} timed out")
-                    transcripts.append("")
-                    continue
+                    response = await sarvam_client.post("stt", SARVAM_STT_URL, headers=headers, files=files, data=data, timeout=(10, 120))
+                except (httpx.TimeoutException, CircuitOpenError) as e:
+                    # Retries are exhausted: report the failure instead of silently dropping the chunk
+                    logging.error(f"Sarvam STT API chunk {i//chunk_length_ms+1} failed: {e!r}")
+                    status = 503 if isinstance(e, CircuitOpenError) else 504
+                    return JSONResponse(content={
+                        "error": f"STT request for chunk {i//chunk_length_ms+1} failed.",
+                        "partial_transcript": ' '.join([t for t in transcripts if t])
+                    }, status_code=status)
                 sarvam_json = response.json()
                 logging.info(f"Chunk {i//chunk_length_ms+1} Sarvam response: {sarvam_json}")
                 transcript = sarvam_json.get("transcript", "")
                 if not transcript:
                     logging.error(f"No transcript for chunk {i//chunk_length_ms+1}")
                 transcripts.append(transcript)
+                if cleaner:
+                    cleaned.append(cleaner.feed(transcript))
             full_transcript = ' '.join([t for t in transcripts if t])
             if not full_transcript:
                 return JSONResponse(content={"error": "No transcript returned from STT API for any chunk."}, status_code=200)
+            if cleaner:
+                cleaned.append(cleaner.flush())
+                return JSONResponse(content={"transcript": "".join(cleaned), "raw_transcript": full_transcript})
             return JSONResponse(content={"transcript": full_transcript})
         else:
             wav_io = io.BytesIO()
@@ -1273,10 +1465,12 @@ async def speech_to_text(file: UploadFile = File(...), language_code: str = Form
             data = {"language_code": language_code}
             logging.info("Sending request to Sarvam STT API...")
             try:
-                response = requests.post(SARVAM_STT_URL, headers=headers, files=files, data=data, timeout=(10, 120))
-            except Timeout:
+                response = await sarvam_client.post("stt", SARVAM_STT_URL, headers=headers, files=files, data=data, timeout=(10, 120))
+            except httpx.TimeoutException:
                 logging.error("Sarvam STT API request timed out")
                 return JSONResponse(content={"error": "STT request timed out."}, status_code=504)
+            except CircuitOpenError as e:
+                return JSONResponse(content={"error": str(e)}, status_code=503)
             logging.info(f"Sarvam STT API response status: {response.status_code}")
             sarvam_json = response.json()
             logging.info(f"Sarvam STT API response: {sarvam_json}")
@@ -1284,6 +1478,9 @@ async def speech_to_text(file: UploadFile = File(...), language_code: str = Form
             if not transcript:
                 logging.error("No transcript returned from Sarvam STT API.")
                 return JSONResponse(content={"error": "No transcript returned from STT API.", "sarvam_response": sarvam_json}, status_code=200)
+            if use_text_preprocessing:
+                sarvam_json["raw_transcript"] = transcript
+                sarvam_json["transcript"] = preprocessor.process(transcript, input_type="stt", source_lang=language_code, tenant=tenant)
             return JSONResponse(content=sarvam_json)
     except Exception as e:
         logging.error(f"Error in /api/speech-to-text: {e}")
@@ -1294,6 +1491,7 @@ async def translate_api(request: Request):
     data = await request.json()
     use_localization = data.pop("use_localization", False)  # Extract localization flag
     use_text_preprocessing = data.pop("use_text_preprocessing", False)  # Extract preprocessing flag
+    tenant = data.pop("tenant", None)  # Selects the tenant's glossary files
     logging.info(f"Received translate request: {data}, use_localization: {use_localization}, use_preprocessing: {use_text_preprocessing}")
     
     headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
@@ -1301,15 +1499,38 @@ async def translate_api(request: Request):
     try:
         input_text = data.get("input", "")
         
+        # Serve repeated requests from the translation cache
+        cache_options = {k: v for k, v in data.items() if k not in ("input", "source_language_code", "target_language_code", "model", "mode")}
+        if use_text_preprocessing:
+            # Glossary edits must not be masked by translations cached under the old terms
+            cache_options["glossary"] = preprocessor.glossaries.get(
+                tenant, data.get("source_language_code"), data.get("target_language_code")).version
+        cache_key = TranslationCache.make_key(
+            input_text, data.get("source_language_code"), data.get("target_language_code"),
+            model=data.get("model"), mode=data.get("mode"),
+            use_localization=use_localization, use_text_preprocessing=use_text_preprocessing, **cache_options
+        )
+        cached = await asyncio.to_thread(translation_cache.get, cache_key)
+        if cached is not None:
+            logging.info("Translation cache hit for /api/translate")
+            return JSONResponse(content={
+                "translated_text": cached,
+                "source_language_code": data.get("source_language_code"),
+                "cached": True
+            })
+        
         # Apply text preprocessing if requested
         if use_text_preprocessing and input_text:
-            preprocessed_text = preprocessor.process(input_text, input_type="text")
+            preprocessed_text = preprocessor.process(
+                input_text, input_type="text", target_lang=data.get("target_language_code"),
+                source_lang=data.get("source_language_code"), tenant=tenant
+            )
             data["input"] = preprocessed_text
             logging.info(f"🔧 PREPROCESSING ENABLED: '{input_text[:50]}...' -> '{preprocessed_text[:50]}...'")
         
-        # Apply BLOOMZ localization if requested
+        # Apply localization if requested
         if use_localization and data.get("input"):
-            localized_text = localize_text_for_indian_context(data["input"])
+            localized_text = await localize_text_for_indian_context(data["input"])
             data["input"] = localized_text
             logging.info(f"🔥 LOCALIZATION ENABLED: '{data.get('input', '')[:50]}...' -> '{localized_text[:50]}...'")
         
@@ -1317,9 +1538,11 @@ async def translate_api(request: Request):
             logging.info(f"❌ NO PREPROCESSING - Direct translation")
         
         try:
-            response = requests.post(SARVAM_TRANSLATE_URL, headers=headers, json=data, timeout=(10, 120))
-        except Timeout:
+            response = await sarvam_client.post("translate", SARVAM_TRANSLATE_URL, headers=headers, json=data, timeout=(10, 120))
+        except httpx.TimeoutException:
             return JSONResponse(content={"error": "Translate API timed out."}, status_code=504)
+        except CircuitOpenError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=503)
         
         logging.info(f"Sarvam Translate API response status: {response.status_code}")
         sarvam_json = response.json()
@@ -1334,6 +1557,7 @@ async def translate_api(request: Request):
         if translated:
             translated = decode_html_entities(translated)
             sarvam_json["translated_text"] = translated
+            await asyncio.to_thread(translation_cache.set, cache_key, translated)
         
         return JSONResponse(content=sarvam_json)
     except Exception as e:
@@ -1347,9 +1571,11 @@ async def text_to_speech_api(request: Request):
     headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
     try:
         try:
-            response = requests.post(SARVAM_TTS_URL, headers=headers, json=data, timeout=(10, 120))
-        except Timeout:
+            response = await sarvam_client.post("tts", SARVAM_TTS_URL, headers=headers, json=data, timeout=(10, 120))
+        except httpx.TimeoutException:
             return JSONResponse(content={"error": "TTS API timed out."}, status_code=504)
+        except CircuitOpenError as e:
+            return JSONResponse(content={"error": str(e)}, status_code=503)
         logging.info(f"Sarvam TTS API response status: {response.status_code}")
         result = response.json()
         logging.info(f"Sarvam TTS API response: {result}")
@@ -1370,31 +1596,85 @@ async def text_to_speech_api(request: Request):
         logging.error(f"Error in /api/text-to-speech: {e}")
         return JSONResponse(content={"error": str(e)}, status_code=500)
 
+async def _stream_document_pages(translated_pages, pages: ThreadedIterator, tm_stats: dict, temp_file_path: str):
+    """NDJSON body of a streamed /api/document-extract: one line per page as soon as it is
+    translated, then a summary line. Owns the uploaded file and removes it when done."""
+    count = 0
+    has_text = False
+    try:
+        async for page_number, segments, translated, err in translated_pages:
+            count += 1
+            extracted_text = render_text(segments)
+            has_text = has_text or bool(extracted_text.strip())
+            line = {
+                "type": "page",
+                "page": page_number,
+                "extracted_text": extracted_text,
+                "translated_text": render_text(translated) if translated is not None else None,
+            }
+            if err:
+                line["error"] = err
+            yield json.dumps(line, ensure_ascii=False) + "\n"
+        summary = {"type": "done", "pages": count, "translation_memory": tm_stats}
+        if not has_text:
+            summary["error"] = "No text extracted"
+        yield json.dumps(summary, ensure_ascii=False) + "\n"
+    except Exception as e:
+        logging.error(f"Document extract stream error: {e}")
+        yield json.dumps({"type": "error", "error": str(e)}, ensure_ascii=False) + "\n"
+    finally:
+        pages.close()
+        try:
+            os.unlink(temp_file_path)
+        except:
+            pass
+
 @app.post("/api/document-extract")
 async def document_extract(
     file: UploadFile = File(...), 
     source_language_code: str = Form(...), 
     target_language_code: str = Form(...),
-    use_localization: bool = Form(False)
+    use_localization: bool = Form(False),
+    document_key: str = Form(None),
+    stream: bool = Form(False)
 ):
-    """Extract and translate full text from document for display"""
+    """Extract and translate full text from document for display.
+    Pages are translated while later pages are still being extracted. With `stream`, the
+    response is NDJSON with one line per page as soon as it is translated."""
     temp_file_path = None
+    pages = None
     try:
         temp_file_path = os.path.join(tempfile.gettempdir(), f"extract_{uuid.uuid4()}_{file.filename}")
         with open(temp_file_path, "wb") as buffer:
             content = await file.read()
             buffer.write(content)
         
-        extracted_text = extract_text_from_document(temp_file_path, file.content_type)
+        headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
+        source_lang = _normalize_language_code(source_language_code)
+        target_lang = _normalize_language_code(target_language_code)
+        
+        # Use structure-preserving translation with optional localization, page by page
+        tm_stats = {}
+        pages = ThreadedIterator(iter_document_pages(temp_file_path, file.content_type))
+        translated_pages = translate_segment_pages(pages, source_lang, target_lang, headers, use_localization=use_localization, tm_stats=tm_stats, document_key=document_key or file.filename)
+        
+        if stream:
+            response = StreamingResponse(_stream_document_pages(translated_pages, pages, tm_stats, temp_file_path), media_type="application/x-ndjson")
+            # The stream closes the pipeline and removes the upload once it ends
+            pages = temp_file_path = None
+            return response
+        
+        extracted, translated, err = [], [], None
+        async for _, page_segments, page_translated, page_err in translated_pages:
+            extracted.extend(page_segments)
+            if page_err:
+                err = page_err
+            else:
+                translated.extend(page_translated)
+        extracted_text = render_text(compact_segments(extracted))
         
         if extracted_text.strip():
-            # Translate full text for display
-            headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
-            source_lang = _normalize_language_code(source_language_code)
-            target_lang = _normalize_language_code(target_language_code)
-            
-            # Use structure-preserving translation with optional localization
-            translated_text, err = translate_text_preserving_structure(extracted_text, source_lang, target_lang, headers, use_localization=use_localization)
+            translated_text = "" if err else render_text(compact_segments(translated))
             
             if err or not translated_text:
                 logging.error(f"Structure-preserving translation failed: {err}")
@@ -1402,7 +1682,8 @@ async def document_extract(
             
             return JSONResponse({
                 "extracted_text": extracted_text,
-                "translated_text": translated_text
+                "translated_text": translated_text,
+                "translation_memory": tm_stats
             })
         
         return JSONResponse({"error": "No text extracted"}, status_code=400)
@@ -1410,6 +1691,8 @@ async def document_extract(
         logging.error(f"Document extract error: {e}")
         return JSONResponse({"error": str(e)}, status_code=500)
     finally:
+        if pages is not None:
+            pages.close()
         if temp_file_path:
             try:
                 os.unlink(temp_file_path)
@@ -1420,60 +1703,81 @@ async def document_extract(
 async def document_translate(
     file: UploadFile = File(...), 
     source_language_code: str = Form(...), 
-    target_language_code: str = Form(...)
+    target_language_code: str = Form(...),
+    document_key: str = Form(None)
 ):
-    """Process uploaded document, extract text, translate, and return translated document"""
+    """Process uploaded document, extract text, translate, and return translated document.
+    Re-uploads with the same `document_key` (default: the filename) only translate changed elements."""
     logging.info(f"Received document: {file.filename}, content_type: {file.content_type}")
+    document_key = document_key or file.filename
     
     try:
+        content = await file.read()
+        # Convert language codes to Sarvam API format
+        source_lang = _normalize_language_code(source_language_code)
+        target_lang = _normalize_language_code(target_language_code)
+        
+        # Identical upload, languages and pipeline: serve the stored output
+        artifact_key = ArtifactStore.make_key(
+            hashlib.sha256(content).hexdigest(), "document-translate", ARTIFACT_PIPELINE_VERSION,
+            filename=file.filename, source=source_lang, target=target_lang
+        )
+        cached = cached_artifact_response(artifact_key)
+        if cached is not None:
+            return cached
+        
         # Save uploaded file temporarily
         temp_file_path = os.path.join(tempfile.gettempdir(), f"upload_{uuid.uuid4()}_{file.filename}")
         with open(temp_file_path, "wb") as buffer:
-            content = await file.read()
             buffer.write(content)
         
         # For DOCX and PDF, translate while preserving layout and return the same format
         ext = os.path.splitext(file.filename)[1].lower()
-        # Convert language codes to Sarvam API format
-        source_lang = _normalize_language_code(source_language_code)
-        target_lang = _normalize_language_code(target_language_code)
+        
+        # Per-document translation memory reuse, reported in the X-Translation-Memory header
+        tm_stats = {}
         
         # Try layout-preserving translation first for supported formats
         if ext == ".docx" and DOCX_AVAILABLE:
             out_path = os.path.join(tempfile.gettempdir(), f"translated_{uuid.uuid4()}_{file.filename}")
-            ok, err = create_translated_docx(temp_file_path, out_path, source_lang, target_lang)
+            ok, err = await create_translated_docx(temp_file_path, out_path, source_lang, target_lang, tm_stats, document_key)
             # Clean up upload temp file
             try:
                 os.unlink(temp_file_path)
             except Exception:
                 pass
             if ok:
-                return FileResponse(
-                    out_path,
+                return artifact_response(
+                    artifact_key, out_path,
                     media_type="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                    filename=f"translated_{file.filename}"
+                    filename=f"translated_{file.filename}",
+                    headers={"X-Translation-Memory": json.dumps(tm_stats)},
+                    partial=tm_stats.get("failed", 0) > 0
                 )
             else:
                 logging.warning(f"Layout-preserving DOCX translation failed: {err}. Falling back to text extraction.")
         elif ext == ".pdf" and MUPDF_AVAILABLE:
             out_path = os.path.join(tempfile.gettempdir(), f"translated_{uuid.uuid4()}_{file.filename}")
-            ok, err = create_translated_pdf(temp_file_path, out_path, source_lang, target_lang)
+            ok, err = await create_translated_pdf(temp_file_path, out_path, source_lang, target_lang, tm_stats, document_key)
             # Clean up upload temp file
             try:
                 os.unlink(temp_file_path)
             except Exception:
                 pass
             if ok:
-                return FileResponse(
-                    out_path,
+                return artifact_response(
+                    artifact_key, out_path,
                     media_type="application/pdf",
-                    filename=f"translated_{file.filename}"
+                    filename=f"translated_{file.filename}",
+                    headers={"X-Translation-Memory": json.dumps(tm_stats)},
+                    partial=tm_stats.get("failed", 0) > 0
                 )
             else:
                 logging.warning(f"Layout-preserving PDF translation failed: {err}. Falling back to text extraction.")
 
-        # Extract text from document
-        extracted_text = extract_text_from_document(temp_file_path, file.content_type)
+        # Extract the document's segments
+        extracted = extract_document(temp_file_path, file.content_type)
+        extracted_text = extracted["text"]
         
         # Check for OCR-specific errors first
         if "OCR failed:" in extracted_text or "OCR processing not available" in extracted_text:
@@ -1504,7 +1808,7 @@ async def document_translate(
             logging.warning(f"Text is very long ({len(extracted_text)} chars), might cause API issues")
         
         # Decode HTML entities in extracted text first
-        extracted_text = decode_html_entities(extracted_text)
+        segments = [segment.with_text(decode_html_entities(segment.text)) for segment in extracted["segments"]]
         
         # Translate the extracted text using Sarvam API (chunk if necessary due to 2000 char limit)
         headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
@@ -1513,8 +1817,8 @@ async def document_translate(
         target_lang = _normalize_language_code(target_language_code)
         
         # Use the new structure-preserving translation
-        logging.info(f"Starting structure-preserving translation for {len(extracted_text)} characters")
-        translated_text, err = translate_text_preserving_structure(extracted_text, source_lang, target_lang, headers)
+        logging.info(f"Starting structure-preserving translation of {len(segments)} segments ({len(extracted_text)} characters)")
+        translated, err = await translate_segments(segments, source_lang, target_lang, headers, tm_stats=tm_stats, document_key=document_key)
         
         if err:
             logging.error(f"Structure-preserving translation failed: {err}")
@@ -1523,17 +1827,15 @@ async def document_translate(
                 status_code=500
             )
         
-        if not translated_text:
+        if all(segment.is_empty for segment in translated):
             logging.error("No translated text returned from structure-preserving translation")
-            translated_text = extracted_text  # Fallback to original text
+            translated = segments  # Fallback to original text
         
         # Create translated document with proper format
         file_extension = os.path.splitext(file.filename)[1] or '.txt'
         
         # Create translated document with proper formatting
-        translated_file_path = create_translated_document(
-            extracted_text, translated_text, file.filename, file_extension
-        )
+        translated_file_path = create_translated_document(translated, file.filename, file_extension)
         
         # Clean up temporary file
         try:
@@ -1558,10 +1860,12 @@ async def document_translate(
                 base_name = os.path.splitext(file.filename)[0]
                 output_filename = f"translated_{base_name}.txt"
             
-            return FileResponse(
-                translated_file_path, 
+            return artifact_response(
+                artifact_key, translated_file_path,
                 media_type=media_type,
-                filename=output_filename
+                filename=output_filename,
+                headers={"X-Translation-Memory": json.dumps(tm_stats)},
+                partial=tm_stats.get("failed", 0) > 0
             )
         else:
             return JSONResponse(
@@ -1585,6 +1889,16 @@ async def translate_video_url(request: Request):
     if not video_url or not target_language_code:
         return JSONResponse(content={"error": "video_url and target_language_code are required"}, status_code=400)
 
+    # Same video, languages and pipeline: serve the stored dub (the voice follows the detected
+    # speaker, so the requested gender does not change the output)
+    artifact_key = ArtifactStore.make_key(
+        video_url.strip(), "dubbed-video", ARTIFACT_PIPELINE_VERSION,
+        source=source_language_code, target=target_language_code, sampling_rate=tts_sr
+    )
+    cached = cached_artifact_response(artifact_key)
+    if cached is not None:
+        return cached
+
     workdir = os.path.join(tempfile.gettempdir(), f"vidproc_{uuid.uuid4()}")
     os.makedirs(workdir, exist_ok=True)
 
@@ -1601,60 +1915,104 @@ async def translate_video_url(request: Request):
             else:
                 return JSONResponse(content={"error": f"Failed to download video: {error_msg}"}, status_code=400)
 
-        # 2) Extract audio to WAV mono 16k
-        wav_in_path = os.path.join(workdir, "input_audio.wav")
+        # 2-7) Dub: extract audio, translate speech segments, re-voice and mux
+        out_video_path, failed_segments = await _dub_video(video_path, workdir, source_language_code, target_language_code, tts_sr)
+
+        # 8) Return the dubbed video (not stored when some segments were left silent)
+        return artifact_response(
+            artifact_key, out_video_path, media_type="video/mp4", filename="dubbed.mp4",
+            partial=failed_segments > 0
+        )
+
+    except Exception as e:
+        logging.error(f"Error in /api/translate-video-url: {e}")
+        return JSONResponse(content={"error": str(e)}, status_code=500)
+
+
+async def _dub_video(video_path: str, workdir: str, source_language_code: str, target_language_code: str, tts_sr: int = 22050, timings: dict = None) -> tuple:
+    """Replace the speech in a local video with translated TTS.
+
+    Returns (dubbed MP4 path, number of speech segments whose STT, translation or
+    TTS failed and were left silent). When `timings` is given, seconds spent per
+    pipeline stage are accumulated into it."""
+    timings = timings if timings is not None else {}
+    failed_segments = 0
+
+    # 2) Extract audio to WAV mono 16k
+    wav_in_path = os.path.join(workdir, "input_audio.wav")
+    with _timed(timings, "extract_audio"):
         _extract_wav_from_video(video_path, wav_in_path, 16000)
 
-        # 3) Process audio segments
+    # 3) Process audio segments
+    with _timed(timings, "decode_audio"):
         audio_seg = AudioSegment.from_file(wav_in_path)
+    with _timed(timings, "detect_gender"):
         detected_gender = _detect_speaker_gender(audio_seg)
-        logging.info(f"Detected speaker gender: {detected_gender}")
-        
-        # Detect voice activity
+    logging.info(f"Detected speaker gender: {detected_gender}")
+    
+    # Detect voice activity
+    with _timed(timings, "detect_nonsilent"):
         speech_segments = detect_nonsilent(audio_seg, min_silence_len=300, silence_thresh=-35)
-        logging.info(f"Detected {len(speech_segments)} speech segments")
-        
-        # Start with silence matching original duration
-        final_audio = AudioSegment.silent(duration=len(audio_seg))
+    logging.info(f"Detected {len(speech_segments)} speech segments")
+    
+    # Start with silence matching original duration
+    final_audio = AudioSegment.silent(duration=len(audio_seg))
+    
+    for start_ms, end_ms in speech_segments:
+        speech_segment = audio_seg[start_ms:end_ms]
+        with _timed(timings, "stt"):
+            segment_transcript = await _sarvam_stt_from_audiosegment(speech_segment, source_language_code)
+        if segment_transcript is None:
+            failed_segments += 1
+            continue
         
-        for start_ms, end_ms in speech_segments:
-            speech_segment = audio_seg[start_ms:end_ms]
-            segment_transcript = _sarvam_stt_from_audiosegment(speech_segment, source_language_code)
+        if segment_transcript.strip():
+            with _timed(timings, "translate"):
+                segment_translation = await _sarvam_translate(segment_transcript, source_language_code, target_language_code)
+            if segment_translation is None:
+                failed_segments += 1
+                continue
             
-            if segment_transcript and segment_transcript.strip():
-                segment_translation = _sarvam_translate(segment_transcript, source_language_code, target_language_code)
+            if segment_translation.strip():
+                # Generate TTS for this segment
+                temp_segment_tts_path = os.path.join(workdir, f"segment_{start_ms}_{end_ms}.wav")
+                with _timed(timings, "tts"):
+                    ok = await _sarvam_tts_to_wav(segment_translation, target_language_code, detected_gender, tts_sr, temp_segment_tts_path)
                 
-                if segment_translation and segment_translation.strip():
-                    # Generate TTS for this segment
-                    temp_segment_tts_path = os.path.join(workdir, f"segment_{start_ms}_{end_ms}.wav")
-                    ok = _sarvam_tts_to_wav(segment_translation, target_language_code, detected_gender, tts_sr, temp_segment_tts_path)
+                if ok:
+                    segment_tts = AudioSegment.from_file(temp_segment_tts_path)
+                    logging.info(f"TTS segment {start_ms}-{end_ms}: {len(segment_tts)}ms")
                     
-                    if ok:
-                        segment_tts = AudioSegment.from_file(temp_segment_tts_path)
-                        logging.info(f"TTS segment {start_ms}-{end_ms}: {len(segment_tts)}ms")
-                        
-                        # Fit TTS within original segment duration
-                        original_duration = end_ms - start_ms
-                        if len(segment_tts) > original_duration:
-                            speed_ratio = len(segment_tts) / original_duration
-                            if speed_ratio <= 2.0:  # Allow up to 2x compression
-                                adj_path = os.path.join(workdir, f"adj_{start_ms}_{end_ms}.wav")
+                    # Fit TTS within original segment duration
+                    original_duration = end_ms - start_ms
+                    if len(segment_tts) > original_duration:
+                        speed_ratio = len(segment_tts) / original_duration
+                        if speed_ratio <= 2.0:  # Allow up to 2x compression
+                            adj_path = os.path.join(workdir, f"adj_{start_ms}_{end_ms}.wav")
+                            with _timed(timings, "atempo"):
                                 try:
                                     subprocess.run(["ffmpeg", "-y", "-i", temp_segment_tts_path, "-filter:a", f"atempo={speed_ratio:.3f}", adj_path], check=True, capture_output=True)
                                     segment_tts = AudioSegment.from_file(adj_path)
                                 except:
                                     segment_tts = segment_tts[:original_duration]
-                        
-                        # Place TTS at original timing
+                    
+                    # Place TTS at original timing
+                    with _timed(timings, "overlay"):
                         final_audio = final_audio.overlay(segment_tts, position=start_ms)
-                    else:
-                        logging.error(f"TTS generation failed for segment {start_ms}-{end_ms}")
-        
-        tts_wav_path = os.path.join(workdir, "tts.wav")
+                else:
+                    failed_segments += 1
+                    logging.error(f"TTS generation failed for segment {start_ms}-{end_ms}")
+    
+    if failed_segments:
+        logging.warning(f"⚠️ {failed_segments}/{len(speech_segments)} speech segments failed and were left silent")
+
+    tts_wav_path = os.path.join(workdir, "tts.wav")
+    with _timed(timings, "export_audio"):
         final_audio.export(tts_wav_path, format="wav")
-        logging.info(f"Generated TTS audio: {len(final_audio)}ms duration")
+    logging.info(f"Generated TTS audio: {len(final_audio)}ms duration")
 
-        # 6) Final audio preparation
+    # 6) Final audio preparation
+    with _timed(timings, "sync_audio"):
         tts_audio = AudioSegment.from_file(tts_wav_path)
         vid_duration_sec = _ffprobe_duration_seconds(video_path)
         desired_ms = int(vid_duration_sec * 1000)
@@ -1670,32 +2028,37 @@ async def translate_video_url(request: Request):
         padded_tts_wav = os.path.join(workdir, "tts_synced.wav")
         tts_audio.export(padded_tts_wav, format="wav")
 
-        # 7) Mux new audio with original video visuals
-        out_video_path = os.path.join(workdir, "dubbed.mp4")
-        cmd = [
-            "ffmpeg", "-y",
-            "-i", video_path,
-            "-i", padded_tts_wav,
-            "-c:v", "copy",
-            "-c:a", "aac",
-            "-b:a", "128k",
-            "-map", "0:v",
-            "-map", "1:a",
-            out_video_path,
-        ]
+    # 7) Mux new audio with original video visuals
+    out_video_path = os.path.join(workdir, "dubbed.mp4")
+    cmd = [
+        "ffmpeg", "-y",
+        "-i", video_path,
+        "-i", padded_tts_wav,
+        "-c:v", "copy",
+        "-c:a", "aac",
+        "-b:a", "128k",
+        "-map", "0:v",
+        "-map", "1:a",
+        out_video_path,
+    ]
+    with _timed(timings, "mux"):
         try:
             result = subprocess.run(cmd, capture_output=True, text=True, check=True)
             logging.info(f"FFmpeg mux success: {result.stdout}")
         except subprocess.CalledProcessError as e:
             logging.error(f"FFmpeg mux failed (code {e.returncode}): {e.stderr}")
             raise
+    return out_video_path, failed_segments
 
-        # 8) Return the dubbed video
-        return FileResponse(out_video_path, media_type="video/mp4", filename="dubbed.mp4")
 
-    except Exception as e:
-        logging.error(f"Error in /api/translate-video-url: {e}")
-        return JSONResponse(content={"error": str(e)}, status_code=500)
+@contextmanager
+def _timed(timings: dict, stage: str):
+    """Add the wall time of the with-block to timings[stage]"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - started
 
 
 def _download_video_to_mp4(url: str, workdir: str) -> str:
@@ -1746,8 +2109,8 @@ def _detect_speaker_gender(audio_segment):
     except:
         return "arvind"  # Default fallback
 
-def _sarvam_stt_from_audiosegment(audio_segment, language_code: str) -> str:
-    """Convert AudioSegment to text using Sarvam STT"""
+async def _sarvam_stt_from_audiosegment(audio_segment, language_code: str):
+    """Convert AudioSegment to text using Sarvam STT; None when the request failed"""
     try:
         wav_io = io.BytesIO()
         audio_segment.export(wav_io, format="wav")
@@ -1757,13 +2120,14 @@ def _sarvam_stt_from_audiosegment(audio_segment, language_code: str) -> str:
         headers = {"api-subscription-key": SARVAM_API_KEY}
         data = {"language_code": language_code}
         
-        response = requests.post(SARVAM_STT_URL, headers=headers, files=files, data=data, timeout=(10, 60))
+        response = await sarvam_client.post("stt", SARVAM_STT_URL, headers=headers, files=files, data=data, timeout=(10, 60))
         if response.status_code == 200:
             result = response.json()
-            return result.get("transcript", "")
+            return result.get("transcript") or ""
+        logging.error(f"STT API error {response.status_code}: {response.text}")
     except Exception as e:
         logging.error(f"STT error: {e}")
-    return ""
+    return None
 
 def _normalize_language_code(lang_code: str) -> str:
     """Normalize language code for Sarvam API"""
@@ -1787,29 +2151,41 @@ def _normalize_language_code(lang_code: str) -> str:
     
     return supported_langs.get(lang_code, 'en-IN')
 
-def _sarvam_translate(text: str, source_lang: str, target_lang: str) -> str:
-    """Translate text using Sarvam API"""
+async def _sarvam_translate(text: str, source_lang: str, target_lang: str):
+    """Translate text using Sarvam API; None when the request failed"""
+    source_lang = _normalize_language_code(source_lang)
+    target_lang = _normalize_language_code(target_lang)
+    cache_key = _translate_cache_key(text, source_lang, target_lang)
+    cached = await asyncio.to_thread(translation_cache.get, cache_key)
+    if cached is not None:
+        return cached
     try:
         headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
         payload = {
             "input": text,
-            "source_language_code": _normalize_language_code(source_lang),
-            "target_language_code": _normalize_language_code(target_lang),
+            "source_language_code": source_lang,
+            "target_language_code": target_lang,
             "speaker_gender": "Male",
             "mode": "formal",
             "model": "mayura:v1",
             "enable_preprocessing": True,
         }
         
-        response = requests.post(SARVAM_TRANSLATE_URL, headers=headers, json=payload, timeout=(10, 60))
+        response = await sarvam_client.post("translate", SARVAM_TRANSLATE_URL, headers=headers, json=payload, timeout=(10, 60))
         if response.status_code == 200:
             result = response.json()
-            return decode_html_entities(result.get("translated_text", ""))
+            if result.get("translated_text") is not None:
+                translated = decode_html_entities(result["translated_text"])
+                await asyncio.to_thread(translation_cache.set, cache_key, translated)
+                return translated
+            logging.error(f"Translation response without translated_text: {result}")
+        else:
+            logging.error(f"Translation API error {response.status_code}: {response.text}")
     except Exception as e:
         logging.error(f"Translation error: {e}")
-    return ""
+    return None
 
-def _sarvam_tts_to_wav(text: str, language_code: str, gender: str, sample_rate: int, output_path: str) -> bool:
+async def _sarvam_tts_to_wav(text: str, language_code: str, gender: str, sample_rate: int, output_path: str) -> bool:
     """Generate TTS audio and save to WAV file"""
     try:
         headers = {"api-subscription-key": SARVAM_API_KEY, "Content-Type": "application/json"}
@@ -1825,7 +2201,7 @@ def _sarvam_tts_to_wav(text: str, language_code: str, gender: str, sample_rate:
             "model": "bulbul:v1"
         }
         
-        response = requests.post(SARVAM_TTS_URL, headers=headers, json=payload, timeout=(10, 120))
+        response = await sarvam_client.post("tts", SARVAM_TTS_URL, headers=headers, json=payload, timeout=(10, 120))
         logging.info(f"TTS API response: {response.status_code}")
         if response.status_code == 200:
             result = response.json()
@@ -1853,6 +2229,24 @@ def _ffprobe_duration_seconds(video_path: str) -> float:
         return 0.0
 
 
+@app.post("/api/translation-memory/lookup")
+async def translation_memory_lookup(request: Request):
+    """Exact and near matches from the translation memory for a list of source segments"""
+    data = await request.json()
+    segments = data.get("segments") or []
+    if not isinstance(segments, list) or not all(isinstance(s, str) for s in segments):
+        return JSONResponse({"error": "segments must be a list of strings"}, status_code=400)
+    if not translation_memory.enabled:
+        return JSONResponse({"error": "Translation memory is disabled"}, status_code=503)
+    matches = await asyncio.to_thread(
+        translation_memory.lookup_many, segments,
+        _normalize_language_code(data.get("source_language_code", "en-IN")),
+        _normalize_language_code(data.get("target_language_code", "hi-IN")),
+        "localized" if data.get("use_localization") else ""
+    )
+    return JSONResponse({"matches": matches})
+
+
 @app.get("/health")
 def health():
     return {"status": "ok"}
@@ -1887,5 +2281,13 @@ def get_status():
             "pdfplumber": PDFPLUMBER_AVAILABLE,
             "pymupdf": MUPDF_AVAILABLE,
             "pypdf2": PDF_AVAILABLE
-        }
+        },
+        "translation_cache": translation_cache.stats(),
+        "translation_memory": translation_memory.stats(),
+        "document_revisions": document_revisions.stats(),
+        "extraction_cache": extraction_cache.stats(),
+        "artifact_store": artifact_store.stats(),
+        "localization": simplifier.stats(),
+        "glossary": preprocessor.glossaries.stats(),
+        "upstream": sarvam_client.stats()
     }
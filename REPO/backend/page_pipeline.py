@@ -0,0 +1,96 @@
+import os
+import queue
+import asyncio
+import threading
+
+# Pages parsed ahead of the consumer before the parser thread waits
+DOCUMENT_PIPELINE_PAGES = int(os.getenv("DOCUMENT_PIPELINE_PAGES", "16"))
+
+_POLL_SECONDS = 0.1
+
+
+class ThreadedIterator:
+    """Runs a blocking generator (e.g. a page-by-page PDF parser) in a worker
+    thread and exposes it as an async iterator.
+
+    At most `max_ahead` items are buffered, so a slow consumer holds the
+    parser back instead of letting it pile up the whole document. `drain()`
+    returns whatever is already buffered without waiting, for consumers that
+    batch. Exceptions raised by the generator are re-raised from the
+    iteration, and `close()` stops the thread and closes the generator."""
+
+    def __init__(self, generator, max_ahead: int = DOCUMENT_PIPELINE_PAGES):
+        self._generator = generator
+        self._queue = queue.Queue(maxsize=max(1, max_ahead))
+        self._stopped = threading.Event()
+        self._end = None  # (error,) once the generator has finished
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _put(self, entry) -> bool:
+        while not self._stopped.is_set():
+            try:
+                self._queue.put(entry, timeout=_POLL_SECONDS)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self):
+        try:
+            for item in self._generator:
+                if not self._put((item, None)):
+                    return
+            self._put((None, (None,)))
+        except Exception as e:
+            self._put((None, (e,)))
+        finally:
+            self._generator.close()
+
+    def _get(self):
+        while not self._stopped.is_set():
+            try:
+                return self._queue.get(timeout=_POLL_SECONDS)
+            except queue.Empty:
+                continue
+        return None, (None,)
+
+    def _finish(self):
+        error = self._end[0]
+        if error is not None:
+            self._end = (None,)
+            raise error
+        raise StopAsyncIteration
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if self._end is not None:
+            self._finish()
+        try:
+            item, end = self._queue.get_nowait()
+        except queue.Empty:
+            item, end = await asyncio.to_thread(self._get)
+        if end is not None:
+            self._end = end
+            self._finish()
+        return item
+
+    def drain(self, max_items: int = None) -> list:
+        """Items already produced, without waiting"""
+        items = []
+        while self._end is None and (max_items is None or len(items) < max_items):
+            try:
+                item, end = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if end is not None:
+                self._end = end
+                break
+            items.append(item)
+        return items
+
+    def close(self):
+        """Stop the worker thread; the generator is closed once its current item is done"""
+        self._stopped.set()
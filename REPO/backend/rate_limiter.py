@@ -0,0 +1,248 @@
+import os
+import json
+import time
+import asyncio
+import logging
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+    FCNTL_AVAILABLE = True
+except ImportError:
+    FCNTL_AVAILABLE = False
+
+# Default upstream budgets per endpoint: (requests per second, burst size)
+DEFAULT_LIMITS = {
+    "translate": (10.0, 20),
+    "stt": (5.0, 10),
+    "tts": (5.0, 10),
+}
+
+# AIMD tuning: multiplicative back-off on overload, additive ramp-up on success
+BACKOFF_FACTOR = float(os.getenv("SARVAM_RATE_BACKOFF_FACTOR", "0.5"))
+RAMP_UP_FRACTION = float(os.getenv("SARVAM_RATE_RAMP_UP_FRACTION", "0.05"))
+MIN_RATE_FRACTION = float(os.getenv("SARVAM_RATE_MIN_FRACTION", "0.05"))
+
+# Share budgets between uvicorn workers on this host through lock-protected state files
+SARVAM_RATE_LIMIT_SHARED = os.getenv("SARVAM_RATE_LIMIT_SHARED", "1") != "0"
+SARVAM_RATE_LIMIT_DIR = os.getenv(
+    "SARVAM_RATE_LIMIT_DIR", os.path.join(tempfile.gettempdir(), "shiksha_rate_limits")
+)
+
+# Window used to report live consumption rates
+USAGE_WINDOW_SECONDS = 60
+
+
+def limits_from_env(endpoint: str):
+    """Read SARVAM_<ENDPOINT>_RPS / SARVAM_<ENDPOINT>_BURST, falling back to DEFAULT_LIMITS"""
+    rate, burst = DEFAULT_LIMITS.get(endpoint, (5.0, 10))
+    prefix = f"SARVAM_{endpoint.upper()}"
+    return float(os.getenv(f"{prefix}_RPS", rate)), int(os.getenv(f"{prefix}_BURST", burst))
+
+
+def is_overload_status(status_code) -> bool:
+    """429, 5xx and transport failures (None) all mean upstream wants us to slow down"""
+    return status_code is None or status_code == 429 or status_code >= 500
+
+
+class AdaptiveTokenBucket:
+    """Async token bucket whose refill rate adapts AIMD-style to upstream feedback.
+
+    The rate halves (BACKOFF_FACTOR) on 429/5xx and grows back by a fixed step
+    on every success, never exceeding the configured rate. The bucket also
+    accounts the characters and audio seconds sent upstream."""
+
+    # True when state() blocks (file lock); the async methods then run it in a worker thread
+    blocking = False
+
+    def __init__(self, name: str, rate: float, burst: int):
+        self.name = name
+        self.max_rate = rate
+        self.min_rate = max(rate * MIN_RATE_FRACTION, 0.01)
+        self.burst = burst
+        self.acquired = 0
+        self.throttled = 0
+        self._state = self._initial_state()
+
+    def _initial_state(self) -> dict:
+        now = time.time()
+        return {
+            "rate": self.max_rate,
+            "tokens": float(self.burst),
+            "updated": now,
+            "blocked_until": 0.0,
+            "backoffs": 0,
+            "usage": {"requests": 0, "chars": 0, "audio_seconds": 0.0},
+            "window": {"start": now, "requests": 0, "chars": 0, "audio_seconds": 0.0},
+        }
+
+    @contextmanager
+    def state(self):
+        """Yield the mutable bucket state (overridden for cross-process sharing)"""
+        yield self._state
+
+    def _refill(self, state: dict, now: float):
+        state["tokens"] = min(self.burst, state["tokens"] + max(now - state["updated"], 0) * state["rate"])
+        state["updated"] = now
+
+    async def _run(self, fn, *args):
+        """Call a state-updating method, in a worker thread if the state is behind a blocking lock"""
+        if self.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    def _take(self) -> float:
+        """Take a token if one is available; returns 0, or the seconds to wait before trying again"""
+        now = time.time()
+        with self.state() as state:
+            self._refill(state, now)
+            if now >= state["blocked_until"] and state["tokens"] >= 1:
+                state["tokens"] -= 1
+                return 0.0
+            return max(state["blocked_until"] - now, (1 - state["tokens"]) / state["rate"])
+
+    async def acquire(self):
+        """Wait until a request may be sent"""
+        waited = False
+        while True:
+            delay = await self._run(self._take)
+            if delay <= 0:
+                self.acquired += 1
+                if waited:
+                    self.throttled += 1
+                return
+            waited = True
+            await asyncio.sleep(delay)
+
+    def record(self, status_code, retry_after: float = None):
+        """Adapt the rate to an upstream response status (None for timeouts/connection errors)"""
+        now = time.time()
+        with self.state() as state:
+            self._refill(state, now)
+            if is_overload_status(status_code):
+                state["backoffs"] += 1
+                state["rate"] = max(self.min_rate, state["rate"] * BACKOFF_FACTOR)
+                if retry_after:
+                    state["blocked_until"] = max(state["blocked_until"], now + retry_after)
+                rate = state["rate"]
+                logging.warning(f"Upstream {self.name} overloaded (status {status_code}); rate lowered to {rate:.2f}/s")
+            elif status_code < 400:
+                state["rate"] = min(self.max_rate, state["rate"] + self.max_rate * RAMP_UP_FRACTION)
+
+    def add_usage(self, chars: int = 0, audio_seconds: float = 0.0):
+        """Account quota consumed by one successful upstream request"""
+        now = time.time()
+        with self.state() as state:
+            window = state["window"]
+            if now - window["start"] >= USAGE_WINDOW_SECONDS:
+                state["window"] = window = {"start": now, "requests": 0, "chars": 0, "audio_seconds": 0.0}
+            for counters in (state["usage"], window):
+                counters["requests"] += 1
+                counters["chars"] += chars
+                counters["audio_seconds"] += audio_seconds
+
+    def stats(self) -> dict:
+        with self.state() as state:
+            self._refill(state, time.time())
+            window = state["window"]
+            elapsed = max(time.time() - window["start"], 1.0)
+            return {
+                "rate": round(state["rate"], 3),
+                "max_rate": self.max_rate,
+                "burst": self.burst,
+                "tokens": round(state["tokens"], 2),
+                "backoffs": state["backoffs"],
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "usage": dict(state["usage"]),
+                "live": {
+                    "requests_per_sec": round(window["requests"] / elapsed, 3),
+                    "chars_per_sec": round(window["chars"] / elapsed, 3),
+                    "audio_seconds_per_sec": round(window["audio_seconds"] / elapsed, 3),
+                },
+            }
+
+
+class SharedTokenBucket(AdaptiveTokenBucket):
+    """AdaptiveTokenBucket whose state lives in a file guarded by an exclusive flock.
+
+    Every worker process on the host reads and updates the same state, so the
+    configured rate is a host-wide budget rather than a per-worker one."""
+
+    blocking = True
+
+    def __init__(self, name: str, rate: float, burst: int, directory: str = SARVAM_RATE_LIMIT_DIR):
+        self.path = os.path.join(directory, f"{name}.json")
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(name, rate, burst)
+
+    @contextmanager
+    def state(self):
+        with open(self.path, "a+", encoding="utf-8") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                f.seek(0)
+                raw = f.read()
+                try:
+                    state = json.loads(raw) if raw else self._initial_state()
+                except ValueError:
+                    logging.warning(f"Resetting corrupt rate limit state {self.path}")
+                    state = self._initial_state()
+                # Configuration may have changed since another worker wrote the file
+                state["rate"] = min(state["rate"], self.max_rate)
+                yield state
+                f.seek(0)
+                f.truncate()
+                f.write(json.dumps(state))
+                f.flush()
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+
+class RateLimiter:
+    """Per-endpoint adaptive token buckets for the Sarvam translate, STT and TTS APIs.
+
+    Buckets are shared across processes when fcntl is available and
+    SARVAM_RATE_LIMIT_SHARED is not "0"."""
+
+    def __init__(self, limits: dict = None, shared: bool = SARVAM_RATE_LIMIT_SHARED):
+        self.limits = limits or {}
+        self.shared = shared and FCNTL_AVAILABLE
+        self.buckets = {}
+        for endpoint in DEFAULT_LIMITS:
+            self.bucket(endpoint)
+
+    def bucket(self, endpoint: str) -> AdaptiveTokenBucket:
+        if endpoint not in self.buckets:
+            rate, burst = self.limits.get(endpoint) or limits_from_env(endpoint)
+            if self.shared:
+                try:
+                    self.buckets[endpoint] = SharedTokenBucket(endpoint, rate, burst)
+                    return self.buckets[endpoint]
+                except OSError as e:
+                    logging.warning(f"Shared rate limit for {endpoint} unavailable, using per-process limit: {e}")
+            self.buckets[endpoint] = AdaptiveTokenBucket(endpoint, rate, burst)
+        return self.buckets[endpoint]
+
+    async def acquire(self, endpoint: str):
+        await self.bucket(endpoint).acquire()
+
+    async def record(self, endpoint: str, status_code, retry_after: float = None):
+        bucket = self.bucket(endpoint)
+        await bucket._run(bucket.record, status_code, retry_after)
+
+    async def add_usage(self, endpoint: str, chars: int = 0, audio_seconds: float = 0.0):
+        bucket = self.bucket(endpoint)
+        await bucket._run(bucket.add_usage, chars, audio_seconds)
+
+    def stats(self) -> dict:
+        return {name: bucket.stats() for name, bucket in self.buckets.items()}
+
+
+def parse_retry_after(value) -> float:
+    """Seconds from a Retry-After header (delta-seconds form only)"""
+    try:
+        return max(float(value), 0.0) if value else None
+    except (TypeError, ValueError):
+        return None
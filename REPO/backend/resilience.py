@@ -0,0 +1,139 @@
+import os
+import time
+import random
+import asyncio
+import logging
+from collections import deque
+
+# Retry settings for idempotent upstream calls
+SARVAM_MAX_RETRIES = int(os.getenv("SARVAM_MAX_RETRIES", "2"))
+SARVAM_RETRY_BASE_DELAY = float(os.getenv("SARVAM_RETRY_BASE_DELAY", "0.5"))
+SARVAM_RETRY_MAX_DELAY = float(os.getenv("SARVAM_RETRY_MAX_DELAY", "8"))
+
+# Circuit breaker settings
+SARVAM_BREAKER_FAILURES = int(os.getenv("SARVAM_BREAKER_FAILURES", "5"))
+SARVAM_BREAKER_RESET_SECONDS = float(os.getenv("SARVAM_BREAKER_RESET_SECONDS", "30"))
+
+# Hedged requests: send a duplicate when the first is slower than this latency quantile
+SARVAM_HEDGE_REQUESTS = os.getenv("SARVAM_HEDGE_REQUESTS", "0") == "1"
+SARVAM_HEDGE_QUANTILE = float(os.getenv("SARVAM_HEDGE_QUANTILE", "0.95"))
+SARVAM_HEDGE_MIN_SAMPLES = int(os.getenv("SARVAM_HEDGE_MIN_SAMPLES", "20"))
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling an upstream endpoint whose circuit is open"""
+
+
+def backoff_delay(attempt: int, base: float = SARVAM_RETRY_BASE_DELAY, cap: float = SARVAM_RETRY_MAX_DELAY) -> float:
+    """Exponential backoff with full jitter for retry number `attempt` (0-based)"""
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    """Per-endpoint circuit breaker.
+
+    After `failure_threshold` consecutive failures the circuit opens and calls
+    fail fast with CircuitOpenError. Once `reset_timeout` has passed a single
+    trial call is let through (half-open); its outcome closes or re-opens it."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = SARVAM_BREAKER_FAILURES,
+                 reset_timeout: float = SARVAM_BREAKER_RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.trial_in_flight = False
+        self.rejected = 0
+        self.opens = 0
+
+    def before_call(self):
+        """Raise CircuitOpenError unless a call may be made now"""
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError(f"Upstream {self.name} is unavailable (circuit open)")
+            self.state = self.HALF_OPEN
+            self.trial_in_flight = False
+        if self.state == self.HALF_OPEN:
+            if self.trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError(f"Upstream {self.name} is recovering (circuit half-open)")
+            self.trial_in_flight = True
+
+    def release_trial(self):
+        """End a half-open trial that finished without an outcome (cancelled or failed
+        locally) so the next call can try again; no-op otherwise"""
+        self.trial_in_flight = False
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logging.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.trial_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.opens += 1
+                logging.warning(f"Circuit for {self.name} opened after {self.consecutive_failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opens": self.opens,
+            "rejected": self.rejected,
+        }
+
+
+class LatencyTracker:
+    """Rolling window of recent call latencies"""
+
+    def __init__(self, size: int = 200):
+        self.samples = deque(maxlen=size)
+
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+
+    def quantile(self, q: float):
+        """Latency quantile, or None until enough samples were seen"""
+        if len(self.samples) < SARVAM_HEDGE_MIN_SAMPLES:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def hedged(fn, delay: float):
+    """Run `fn()`; if it has not finished after `delay` seconds start a second
+    attempt and return whichever completes successfully first.
+    Returns (result, hedge_was_sent)."""
+    first = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({first}, timeout=delay)
+    if done:
+        return first.result(), False
+
+    second = asyncio.ensure_future(fn())
+    pending = {first, second}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), True
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
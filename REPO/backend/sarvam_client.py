@@ -0,0 +1,216 @@
+import os
+import io
+import time
+import wave
+import asyncio
+import logging
+from urllib.parse import urlsplit
+
+import httpx
+
+from singleflight import SingleFlight, request_fingerprint
+from rate_limiter import RateLimiter, parse_retry_after, is_overload_status
+from key_pool import ApiKeyPool
+from resilience import (
+    CircuitBreaker, CircuitOpenError, LatencyTracker, backoff_delay, hedged,
+    SARVAM_MAX_RETRIES, SARVAM_HEDGE_REQUESTS, SARVAM_HEDGE_QUANTILE,
+)
+
+# Upstream connection settings (override with environment variables)
+SARVAM_CONNECT_TIMEOUT = float(os.getenv("SARVAM_CONNECT_TIMEOUT", "10"))
+SARVAM_READ_TIMEOUT = float(os.getenv("SARVAM_READ_TIMEOUT", "120"))
+SARVAM_MAX_CONNECTIONS_PER_HOST = int(os.getenv("SARVAM_MAX_CONNECTIONS_PER_HOST", "200"))
+SARVAM_MAX_KEEPALIVE_CONNECTIONS = int(os.getenv("SARVAM_MAX_KEEPALIVE_CONNECTIONS", "50"))
+SARVAM_KEEPALIVE_EXPIRY = float(os.getenv("SARVAM_KEEPALIVE_EXPIRY", "30"))
+
+
+def usage_units(json: dict = None, files: dict = None):
+    """Quota units of a request: (input characters, seconds of uploaded WAV audio)"""
+    chars = 0
+    if json:
+        for field in ("input", "text"):
+            if isinstance(json.get(field), str):
+                chars += len(json[field])
+        if isinstance(json.get("inputs"), list):
+            chars += sum(len(t) for t in json["inputs"] if isinstance(t, str))
+    audio_seconds = 0.0
+    for value in (files or {}).values():
+        content = value[1] if isinstance(value, tuple) and len(value) > 1 else None
+        if isinstance(content, bytes):
+            try:
+                with wave.open(io.BytesIO(content)) as w:
+                    audio_seconds += w.getnframes() / float(w.getframerate())
+            except (wave.Error, EOFError):
+                pass
+    return chars, audio_seconds
+
+
+class SarvamClient:
+    """Shared non-blocking HTTP client for the Sarvam STT, translate and TTS APIs.
+
+    Keeps one pooled httpx.AsyncClient per upstream host, so connections are
+    reused (keep-alive) and each host has its own connection limit. Identical
+    concurrent requests are coalesced into a single upstream call, and every
+    call waits for its endpoint's adaptive rate limit. With a key pool, each
+    call is sent with the least-loaded healthy API key. Failed calls are retried
+    with jittered exponential backoff behind a per-endpoint circuit breaker, and
+    slow calls can optionally be hedged with a duplicate request."""
+
+    def __init__(self,
+                 max_connections_per_host: int = SARVAM_MAX_CONNECTIONS_PER_HOST,
+                 max_keepalive_connections: int = SARVAM_MAX_KEEPALIVE_CONNECTIONS,
+                 connect_timeout: float = SARVAM_CONNECT_TIMEOUT,
+                 read_timeout: float = SARVAM_READ_TIMEOUT,
+                 keepalive_expiry: float = SARVAM_KEEPALIVE_EXPIRY,
+                 rate_limiter: RateLimiter = None,
+                 key_pool: ApiKeyPool = None,
+                 max_retries: int = SARVAM_MAX_RETRIES,
+                 hedge_requests: bool = SARVAM_HEDGE_REQUESTS):
+        self.limits = httpx.Limits(
+            max_connections=max_connections_per_host,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self._clients = {}
+        self._requests = {}
+        self._in_flight = {}
+        self.single_flight = SingleFlight()
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.key_pool = key_pool
+        self.max_retries = max_retries
+        self.hedge_requests = hedge_requests
+        self.breakers = {}
+        self.latencies = {}
+        self._retries = {}
+        self._hedges = {}
+
+    def _client_for(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the host of `url`, creating it on first use."""
+        host = urlsplit(url).netloc
+        client = self._clients.get(host)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(limits=self.limits, timeout=self.timeout)
+            self._clients[host] = client
+        return client
+
+    async def post(self, endpoint: str, url: str, headers: dict = None, json: dict = None,
+                   data: dict = None, files: dict = None, timeout: tuple = None,
+                   coalesce: bool = True) -> httpx.Response:
+        """POST to an upstream endpoint ("translate", "stt" or "tts").
+
+        `timeout` is an optional (connect, read) tuple overriding the defaults.
+        Concurrent calls with the same URL and body share one response unless
+        coalesce=False. Raises httpx.TimeoutException when the last attempt
+        times out and CircuitOpenError while the endpoint is failing fast."""
+        if not coalesce:
+            return await self._call(endpoint, url, headers, json, data, files, timeout)
+        key = request_fingerprint(url, json, data, files)
+        return await self.single_flight.do(
+            key, lambda: self._call(endpoint, url, headers, json, data, files, timeout), group=endpoint
+        )
+
+    async def _call(self, endpoint, url, headers, json, data, files, timeout) -> httpx.Response:
+        """Send with retries, circuit breaking and optional hedging. All Sarvam calls are idempotent."""
+        breaker = self.breakers.setdefault(endpoint, CircuitBreaker(endpoint))
+        latencies = self.latencies.setdefault(endpoint, LatencyTracker())
+
+        async def send():
+            started = time.monotonic()
+            response = await self._send(endpoint, url, headers, json, data, files, timeout)
+            latencies.add(time.monotonic() - started)
+            return response
+
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            breaker.before_call()
+            try:
+                hedge_delay = latencies.quantile(SARVAM_HEDGE_QUANTILE) if self.hedge_requests else None
+                if hedge_delay is not None:
+                    response, hedge_sent = await hedged(send, hedge_delay)
+                    if hedge_sent:
+                        self._hedges[endpoint] = self._hedges.get(endpoint, 0) + 1
+                else:
+                    response = await send()
+            except httpx.TransportError as e:
+                breaker.record_failure()
+                if last_attempt:
+                    raise
+                logging.warning(f"Upstream {endpoint} attempt {attempt + 1} failed: {e!r}; retrying")
+                delay = backoff_delay(attempt)
+            else:
+                if not is_overload_status(response.status_code):
+                    breaker.record_success()
+                    return response
+                breaker.record_failure()
+                if last_attempt:
+                    return response
+                logging.warning(f"Upstream {endpoint} attempt {attempt + 1} returned {response.status_code}; retrying")
+                delay = max(backoff_delay(attempt), parse_retry_after(response.headers.get("retry-after")) or 0)
+            finally:
+                # Cancellation or a local error (rate limiter, key pool, non-transport
+                # httpx error) must not leave a half-open trial claimed forever
+                breaker.release_trial()
+            self._retries[endpoint] = self._retries.get(endpoint, 0) + 1
+            await asyncio.sleep(delay)
+
+    async def _send(self, endpoint, url, headers, json, data, files, timeout) -> httpx.Response:
+        client = self._client_for(url)
+        kwargs = {}
+        if timeout is not None:
+            connect, read = timeout
+            kwargs["timeout"] = httpx.Timeout(read, connect=connect)
+
+        await self.rate_limiter.acquire(endpoint)
+        api_key = None
+        if self.key_pool is not None:
+            api_key = self.key_pool.acquire()
+            headers = {**(headers or {}), "api-subscription-key": api_key.key}
+        self._requests[endpoint] = self._requests.get(endpoint, 0) + 1
+        self._in_flight[endpoint] = self._in_flight.get(endpoint, 0) + 1
+        try:
+            response = await client.post(url, headers=headers, json=json, data=data, files=files, **kwargs)
+        except asyncio.CancelledError:
+            # Abandoned by the caller (e.g. the losing request of a hedged call): not an
+            # upstream failure, so neither the key nor the endpoint's rate is penalised
+            if api_key is not None:
+                self.key_pool.cancel(api_key)
+            raise
+        except Exception:
+            if api_key is not None:
+                self.key_pool.release(api_key, None)
+            await self.rate_limiter.record(endpoint, None)
+            raise
+        finally:
+            self._in_flight[endpoint] -= 1
+        retry_after = parse_retry_after(response.headers.get("retry-after"))
+        await self.rate_limiter.record(endpoint, response.status_code, retry_after)
+        if api_key is not None:
+            self.key_pool.release(api_key, response.status_code, retry_after)
+        if response.status_code < 400:
+            chars, audio_seconds = usage_units(json, files)
+            await self.rate_limiter.add_usage(endpoint, chars, audio_seconds)
+        return response
+
+    def stats(self) -> dict:
+        """Per-endpoint request counters and open connection pools."""
+        return {
+            "hosts": sorted(self._clients),
+            "requests": dict(self._requests),
+            "in_flight": dict(self._in_flight),
+            "coalesced": self.single_flight.stats(),
+            "rate_limits": self.rate_limiter.stats(),
+            "api_keys": self.key_pool.stats() if self.key_pool is not None else {},
+            "retries": dict(self._retries),
+            "hedged": dict(self._hedges),
+            "circuits": {name: breaker.stats() for name, breaker in self.breakers.items()},
+        }
+
+    async def aclose(self):
+        """Close all pooled connections."""
+        for client in list(self._clients.values()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logging.warning(f"Error closing upstream client: {e}")
+        self._clients.clear()
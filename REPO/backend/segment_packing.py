@@ -0,0 +1,50 @@
+import re
+
+# Delimiter used to pack several document elements into one translate request
+SEGMENT_DELIMITER = "\n|||\n"
+SEGMENT_SPLIT_PATTERN = re.compile(r"\s*\|\s*\|\s*\|\s*")
+
+# Pipes separated only by whitespace could merge with the delimiter when splitting
+_ADJACENT_PIPES = re.compile(r"\|\s*\|")
+
+
+def is_packable(text: str) -> bool:
+    """True if `text` survives a round trip through SEGMENT_DELIMITER packing.
+    Texts containing "||" (even with spaces between), or starting or ending with "|",
+    would have their pipes absorbed by the split pattern, so they are sent alone."""
+    stripped = text.strip()
+    return not (stripped.startswith("|") or stripped.endswith("|") or _ADJACENT_PIPES.search(stripped))
+
+
+def pack_segments(texts: list, max_len: int) -> list:
+    """Group consecutive texts into packs whose delimiter-joined length stays within max_len.
+    Returns a list of packs, each a list of indices into `texts`."""
+    packs = []
+    current = []
+    current_len = 0
+    for i, t in enumerate(texts):
+        # Texts whose pipes could be mistaken for the delimiter could not be split back, so send them alone
+        if not is_packable(t):
+            if current:
+                packs.append(current)
+                current, current_len = [], 0
+            packs.append([i])
+            continue
+        additional = len(t) + (len(SEGMENT_DELIMITER) if current else 0)
+        if current and current_len + additional > max_len:
+            packs.append(current)
+            current, current_len = [], 0
+            additional = len(t)
+        current.append(i)
+        current_len += additional
+    if current:
+        packs.append(current)
+    return packs
+
+
+def split_packed_translation(translated: str, expected: int):
+    """Split a translated pack back into its segments. Returns None if the delimiters did not survive."""
+    parts = [p.strip() for p in SEGMENT_SPLIT_PATTERN.split(translated)]
+    if len(parts) != expected or not all(parts):
+        return None
+    return parts
@@ -0,0 +1,320 @@
+import os
+import re
+import time
+import asyncio
+import logging
+
+import httpx
+
+# Optional OpenAI-compatible LLM server (e.g. llama.cpp, vLLM or Ollama at http://127.0.0.1:8080/v1).
+# Without it localization uses the rule-based simplifier only.
+LOCALIZATION_LLM_URL = os.getenv("LOCALIZATION_LLM_URL", "").rstrip("/")
+LOCALIZATION_LLM_MODEL = os.getenv("LOCALIZATION_LLM_MODEL", "local")
+LOCALIZATION_LLM_API_KEY = os.getenv("LOCALIZATION_LLM_API_KEY", "")
+LOCALIZATION_LLM_TIMEOUT = float(os.getenv("LOCALIZATION_LLM_TIMEOUT", "30"))
+LOCALIZATION_LLM_BATCH_SIZE = int(os.getenv("LOCALIZATION_LLM_BATCH_SIZE", "16"))
+
+# How long a failing backend is skipped before it is probed again
+LOCALIZATION_BACKEND_RETRY_SECONDS = float(os.getenv("LOCALIZATION_BACKEND_RETRY_SECONDS", "60"))
+
+# Rule-based localization rewrites (complex phrase -> simple phrase), in priority order
+LOCALIZATION_TRANSFORMATIONS = [
+    # Complex phrases to simple explanations
+    ("implementation of", "using"),
+    ("in order to", "to"),
+    ("due to the fact that", "because"),
+    ("it is important to note that", ""),
+    ("it should be emphasized that", ""),
+    ("with regard to", "about"),
+    ("in accordance with", "following"),
+    ("for the purpose of", "to"),
+    ("in the event that", "if"),
+    ("prior to", "before"),
+    ("subsequent to", "after"),
+    ("in spite of", "despite"),
+    ("as a result of", "because of"),
+    ("in addition to", "also"),
+    ("with the exception of", "except"),
+    
+    # Technical terms to everyday language
+    ("methodology", "way of doing"),
+    ("infrastructure", "basic systems"),
+    ("optimization", "making better"),
+    ("implementation", "putting into use"),
+    ("comprehensive", "complete"),
+    ("sophisticated", "advanced"),
+    ("facilitate", "make easier"),
+    ("utilize", "use"),
+    ("demonstrate", "show"),
+    ("establish", "set up"),
+    ("maintain", "keep"),
+    ("acquire", "get"),
+    ("construct", "build"),
+    ("operate", "run"),
+    ("monitor", "watch"),
+    ("evaluate", "check"),
+    ("analyze", "study"),
+    ("investigate", "look into"),
+    ("collaborate", "work together"),
+    ("coordinate", "organize"),
+    ("communicate", "talk"),
+    ("participate", "take part"),
+    ("contribute", "help"),
+    ("significant", "important"),
+    ("substantial", "large"),
+    ("considerable", "big"),
+    ("numerous", "many"),
+    ("various", "different"),
+    ("appropriate", "right"),
+    ("adequate", "enough"),
+    ("sufficient", "enough"),
+    ("essential", "needed"),
+    ("crucial", "very important"),
+    ("vital", "very important"),
+    ("beneficial", "helpful"),
+    ("advantageous", "good"),
+    ("efficient", "works well"),
+    ("effective", "works good")
+]
+
+def _trie_regex(phrases) -> str:
+    """Regex source matching any of `phrases`, factored into a prefix trie so the
+    engine checks each text position against one branch per character instead of
+    trying every phrase in turn. Where phrases share a prefix the longest wins."""
+    trie = {}
+    for phrase in phrases:
+        node = trie
+        for ch in phrase:
+            node = node.setdefault(ch, {})
+        node[""] = True
+
+    def build(node) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+def _compile_localization_rules(rules: list):
+    """One compiled matcher over every phrase and its capitalized form, so all
+    rewrites are applied in a single left-to-right pass over the text"""
+    replacements = {}
+    for complex_phrase, simple_phrase in rules:
+        replacements.setdefault(complex_phrase, simple_phrase)
+        replacements.setdefault(complex_phrase.capitalize(), simple_phrase.capitalize())
+    return re.compile(_trie_regex(replacements)), replacements
+
+LOCALIZATION_PATTERN, LOCALIZATION_REPLACEMENTS = _compile_localization_rules(LOCALIZATION_TRANSFORMATIONS)
+
+
+class SimplificationBackend:
+    """Interface for text simplification backends.
+
+    simplify_batch() returns one simplified text per input, with None where the
+    backend has no usable answer; it raises when the backend itself is failing."""
+
+    name = "backend"
+
+    async def probe(self) -> bool:
+        """Cheap health check run before first use and after a failure window"""
+        return True
+
+    async def simplify_batch(self, texts: list) -> list:
+        raise NotImplementedError
+
+
+class RuleBasedSimplifier(SimplificationBackend):
+    """Phrase rewrites plus splitting of long sentences at a conjunction near the middle"""
+
+    name = "rules"
+
+    def simplify(self, text: str) -> str:
+        if not text.strip():
+            return text
+        # Apply all transformations for Indian context in one pass
+        simplified = LOCALIZATION_PATTERN.sub(lambda m: LOCALIZATION_REPLACEMENTS[m.group(0)], text)
+        
+        # Break long sentences and add Indian context
+        sentences = simplified.split('. ')
+        new_sentences = []
+        
+        for sentence in sentences:
+            sentence = sentence.strip()
+            if not sentence:
+                continue
+                
+            words = sentence.split()
+            if len(words) > 15:
+                # Try to break at natural points
+                mid_point = len(words) // 2
+                # Look for conjunctions near the middle
+                for i in range(max(5, mid_point-3), min(len(words)-5, mid_point+3)):
+                    if words[i].lower() in ['and', 'but', 'or', 'because', 'since', 'while', 'when', 'if', 'that']:
+                        first_part = ' '.join(words[:i]).strip()
+                        second_part = ' '.join(words[i+1:]).strip()
+                        if first_part and second_part:
+                            new_sentences.append(first_part)
+                            new_sentences.append(second_part.capitalize())
+                            break
+                else:
+                    new_sentences.append(sentence)
+            else:
+                new_sentences.append(sentence)
+        
+        result = '. '.join(new_sentences)
+        
+        # Clean up extra spaces and punctuation
+        result = ' '.join(result.split())  # Remove extra spaces
+        return result.replace(' .', '.').replace('..', '.')
+
+    async def simplify_batch(self, texts: list) -> list:
+        return [self.simplify(t) for t in texts]
+
+
+class HttpLLMSimplifier(SimplificationBackend):
+    """Simplification through an OpenAI-compatible chat completions server.
+
+    Up to `batch_size` texts are sent per request as numbered items and the
+    numbered answers are mapped back; items the model drops come back as None."""
+
+    name = "llm"
+    PROMPT = """Rewrite each numbered text below to make it simple and easy to understand for Indian readers. Use:
+- Simple, everyday words instead of complex terms
+- Short, clear sentences
+- Indian context and examples where appropriate
+- Conversational tone
+
+Answer with the same numbered markers, one rewritten text per marker, and nothing else.
+
+{items}"""
+    ITEM_PATTERN = re.compile(r"\[\[(\d+)\]\]\s*(.*?)(?=\s*\[\[\d+\]\]|\Z)", re.S)
+
+    def __init__(self, url: str, model: str = LOCALIZATION_LLM_MODEL, api_key: str = LOCALIZATION_LLM_API_KEY,
+                 timeout: float = LOCALIZATION_LLM_TIMEOUT, batch_size: int = LOCALIZATION_LLM_BATCH_SIZE):
+        self.url = url.rstrip("/")
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        headers = {"Authorization": f"Bearer {api_key}"} if api_key else {}
+        self.client = httpx.AsyncClient(timeout=httpx.Timeout(timeout, connect=3), headers=headers)
+
+    async def probe(self) -> bool:
+        try:
+            response = await self.client.get(f"{self.url}/models", timeout=3)
+            return response.status_code == 200
+        except httpx.HTTPError as e:
+            logging.warning(f"Localization LLM at {self.url} is unreachable: {e!r}")
+            return False
+
+    async def _complete(self, texts: list) -> list:
+        items = "\n\n".join(f"[[{i + 1}]] {t}" for i, t in enumerate(texts))
+        response = await self.client.post(f"{self.url}/chat/completions", json={
+            "model": self.model,
+            "messages": [{"role": "user", "content": self.PROMPT.format(items=items)}],
+            "max_tokens": sum(len(t) for t in texts) + 100 * len(texts),
+            "temperature": 0.3,
+        })
+        response.raise_for_status()
+        content = response.json()["choices"][0]["message"]["content"]
+        answers = {int(n): a.strip() for n, a in self.ITEM_PATTERN.findall(content)}
+        if len(texts) == 1 and not answers:
+            answers = {1: content.strip()}
+        return [answers.get(i + 1) or None for i in range(len(texts))]
+
+    async def simplify_batch(self, texts: list) -> list:
+        batches = [texts[i:i + self.batch_size] for i in range(0, len(texts), self.batch_size)]
+        results = await asyncio.gather(*(self._complete(batch) for batch in batches))
+        return [answer for batch in results for answer in batch]
+
+    async def aclose(self):
+        await self.client.aclose()
+
+
+class Simplifier:
+    """Tries simplification backends in order, falling through to the next for
+    any text a backend could not handle.
+
+    A backend is health-probed before its first use. When the probe or a call
+    fails, the backend is skipped (negative-cached) for `retry_after` seconds
+    and probed again afterwards, so an unreachable server costs one probe per
+    window instead of one timeout per text."""
+
+    def __init__(self, backends: list, retry_after: float = LOCALIZATION_BACKEND_RETRY_SECONDS):
+        self.backends = backends
+        self.retry_after = retry_after
+        self._state = {b.name: {"healthy": None, "down_until": 0.0, "calls": 0, "texts": 0, "failures": 0, "skipped": 0}
+                       for b in backends}
+        self._probe_locks = {b.name: asyncio.Lock() for b in backends}
+
+    @classmethod
+    def from_config(cls) -> "Simplifier":
+        backends = []
+        if LOCALIZATION_LLM_URL:
+            backends.append(HttpLLMSimplifier(LOCALIZATION_LLM_URL))
+            logging.info(f"Localization LLM backend: {LOCALIZATION_LLM_URL} ({LOCALIZATION_LLM_MODEL})")
+        backends.append(RuleBasedSimplifier())
+        return cls(backends)
+
+    def _mark_down(self, backend, reason: str):
+        state = self._state[backend.name]
+        state["healthy"] = False
+        state["failures"] += 1
+        state["down_until"] = time.time() + self.retry_after
+        logging.warning(f"Simplification backend '{backend.name}' disabled for {self.retry_after:.0f}s: {reason}")
+
+    async def _usable(self, backend) -> bool:
+        state = self._state[backend.name]
+        if state["healthy"]:
+            return True
+        if time.time() < state["down_until"]:
+            state["skipped"] += 1
+            return False
+        async with self._probe_locks[backend.name]:
+            if state["healthy"]:
+                return True
+            if time.time() < state["down_until"]:
+                state["skipped"] += 1
+                return False
+            if await backend.probe():
+                state["healthy"] = True
+                return True
+            self._mark_down(backend, "health probe failed")
+            return False
+
+    async def simplify_many(self, texts: list) -> list:
+        """Simplify every text, batching them per backend call; blank texts are returned unchanged"""
+        results = list(texts)
+        todo = [i for i, t in enumerate(texts) if t and t.strip()]
+        for backend in self.backends:
+            if not todo:
+                break
+            if not await self._usable(backend):
+                continue
+            state = self._state[backend.name]
+            state["calls"] += 1
+            try:
+                answers = await backend.simplify_batch([texts[i] for i in todo])
+            except Exception as e:
+                self._mark_down(backend, repr(e))
+                continue
+            remaining = []
+            for i, answer in zip(todo, answers):
+                if answer:
+                    results[i] = answer
+                else:
+                    remaining.append(i)
+            state["texts"] += len(todo) - len(remaining)
+            todo = remaining
+        return results
+
+    async def simplify(self, text: str) -> str:
+        return (await self.simplify_many([text]))[0]
+
+    def stats(self) -> dict:
+        return {name: dict(state) for name, state in self._state.items()}
+
+    async def aclose(self):
+        for backend in self.backends:
+            if hasattr(backend, "aclose"):
+                await backend.aclose()
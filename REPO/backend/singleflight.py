@@ -0,0 +1,67 @@
+import json
+import asyncio
+import hashlib
+
+
+def request_fingerprint(*parts) -> str:
+    """Stable digest of request parts (dicts, strings, bytes and tuples/lists of them)"""
+    digest = hashlib.sha256()
+
+    def feed(value):
+        if isinstance(value, bytes):
+            digest.update(b"b:")
+            digest.update(hashlib.sha256(value).digest())
+        elif isinstance(value, dict):
+            digest.update(b"{")
+            for k in sorted(value, key=str):
+                feed(str(k))
+                feed(value[k])
+            digest.update(b"}")
+        elif isinstance(value, (list, tuple)):
+            digest.update(b"[")
+            for item in value:
+                feed(item)
+            digest.update(b"]")
+        elif hasattr(value, "read"):
+            # File-like uploads are not fingerprinted by content; make them unique
+            digest.update(f"io:{id(value)}".encode())
+        else:
+            digest.update(json.dumps(value, ensure_ascii=False, default=str).encode("utf-8"))
+        digest.update(b";")
+
+    for part in parts:
+        feed(part)
+    return digest.hexdigest()
+
+
+class SingleFlight:
+    """Coalesce identical concurrent calls so they share one execution and its result.
+
+    The first caller for a key starts the call; callers arriving while it is in
+    flight await the same task instead of starting their own."""
+
+    def __init__(self):
+        self._in_flight = {}
+        self.executed = {}
+        self.suppressed = {}
+
+    async def do(self, key: str, fn, group: str = "default"):
+        """Run `fn()` (a coroutine function) once per key among concurrent callers"""
+        task = self._in_flight.get(key)
+        if task is None:
+            self.executed[group] = self.executed.get(group, 0) + 1
+            task = asyncio.ensure_future(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        else:
+            self.suppressed[group] = self.suppressed.get(group, 0) + 1
+        # Shield so one waiter being cancelled does not cancel the shared call
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Executed vs. suppressed duplicate calls per group"""
+        return {
+            "in_flight": len(self._in_flight),
+            "executed": dict(self.executed),
+            "suppressed": dict(self.suppressed),
+        }
@@ -0,0 +1,30 @@
+import asyncio
+import fcntl
+import threading
+
+from rate_limiter import SharedTokenBucket
+
+
+def test_shared_bucket_waits_for_the_lock_off_the_event_loop(tmp_path):
+    bucket = SharedTokenBucket("translate", 100.0, 10, directory=str(tmp_path))
+
+    async def run():
+        ticks = 0
+        with open(bucket.path, "a+") as f:
+            # Another worker holds the state file
+            fcntl.flock(f, fcntl.LOCK_EX)
+            acquire = asyncio.ensure_future(bucket.acquire())
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            assert not acquire.done()
+            fcntl.flock(f, fcntl.LOCK_UN)
+        await asyncio.wait_for(acquire, 5)
+        await bucket._run(bucket.record, 200)
+        await bucket._run(bucket.add_usage, 12, 0.0)
+        return ticks
+
+    assert asyncio.run(run()) == 5
+    stats = bucket.stats()
+    assert stats["acquired"] == 1
+    assert stats["usage"] == {"requests": 1, "chars": 12, "audio_seconds": 0.0}
@@ -0,0 +1,119 @@
+import asyncio
+
+import httpx
+
+from key_pool import ApiKeyPool
+from rate_limiter import RateLimiter
+from resilience import CircuitBreaker, LatencyTracker
+from sarvam_client import SarvamClient
+
+
+def _hedging_client(handler):
+    pool = ApiKeyPool(["sk_first_test_key", "sk_second_test_key"])
+    client = SarvamClient(rate_limiter=RateLimiter(limits={"translate": (1000.0, 1000)}, shared=False),
+                          key_pool=pool, max_retries=0, hedge_requests=True)
+    transport = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    client._client_for = lambda url: transport
+    # Enough fast samples that every call is hedged after a few milliseconds
+    tracker = LatencyTracker()
+    for _ in range(50):
+        tracker.add(0.005)
+    client.latencies["translate"] = tracker
+    return client, pool
+
+
+def test_hedged_calls_release_every_key():
+    calls = {"n": 0}
+
+    async def handler(request):
+        calls["n"] += 1
+        # Every first attempt is slow, so the hedge wins and the first is cancelled
+        if calls["n"] % 2:
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"translated_text": "ok"})
+
+    async def run():
+        client, pool = _hedging_client(handler)
+        for i in range(10):
+            response = await client.post("translate", "https://upstream/translate", json={"input": f"text {i}"}, coalesce=False)
+            assert response.status_code == 200
+        # Cancelled attempts clean up when the loop next runs them
+        await asyncio.sleep(0.05)
+        return client, pool
+
+    client, pool = asyncio.run(run())
+    assert client.stats()["hedged"] == {"translate": 10}
+    assert [key.in_flight for key in pool.keys] == [0, 0]
+    assert sum(key.requests for key in pool.keys) == 20
+    assert client.stats()["in_flight"] == {"translate": 0}
+    # Cancelled losers are not upstream failures
+    assert [key.failures for key in pool.keys] == [0, 0]
+    limits = client.stats()["rate_limits"]["translate"]
+    assert limits["backoffs"] == 0
+    assert limits["rate"] == 1000.0
+
+
+def test_transport_errors_release_the_key():
+    async def handler(request):
+        raise httpx.ConnectError("refused", request=request)
+
+    async def run():
+        client, pool = _hedging_client(handler)
+        client.hedge_requests = False
+        try:
+            await client.post("translate", "https://upstream/translate", json={"input": "text"}, coalesce=False)
+        except httpx.ConnectError:
+            pass
+        return pool
+
+    pool = asyncio.run(run())
+    assert [key.in_flight for key in pool.keys] == [0, 0]
+    assert sum(key.failures for key in pool.keys) == 1
+
+
+def _half_open_client(handler):
+    client, _ = _hedging_client(handler)
+    client.hedge_requests = False
+    breaker = CircuitBreaker("translate", failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()  # opened; the next call is the half-open trial
+    client.breakers["translate"] = breaker
+    return client, breaker
+
+
+def test_cancelled_trial_releases_the_circuit():
+    async def handler(request):
+        if request.url.path == "/slow":
+            await asyncio.sleep(1)
+        return httpx.Response(200, json={"translated_text": "ok"})
+
+    async def run():
+        client, breaker = _half_open_client(handler)
+        trial = asyncio.ensure_future(client.post("translate", "https://upstream/slow", json={"input": "a"}, coalesce=False))
+        await asyncio.sleep(0.01)
+        assert breaker.trial_in_flight
+        trial.cancel()
+        await asyncio.gather(trial, return_exceptions=True)
+        response = await client.post("translate", "https://upstream/fast", json={"input": "b"}, coalesce=False)
+        return breaker, response
+
+    breaker, response = asyncio.run(run())
+    assert response.status_code == 200
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_unexpected_error_releases_the_trial():
+    async def handler(request):
+        raise httpx.DecodingError("bad body", request=request)
+
+    async def run():
+        client, breaker = _half_open_client(handler)
+        for _ in range(2):
+            try:
+                await client.post("translate", "https://upstream/translate", json={"input": "a"}, coalesce=False)
+            except httpx.DecodingError:
+                pass
+        return breaker
+
+    breaker = asyncio.run(run())
+    assert not breaker.trial_in_flight
+    assert breaker.rejected == 0
@@ -0,0 +1,41 @@
+from segment_packing import SEGMENT_DELIMITER, pack_segments, split_packed_translation
+
+
+def _round_trip(texts: list, max_len: int = 1000) -> list:
+    """Texts as they come back from packing, translating unchanged and splitting"""
+    result = [None] * len(texts)
+    for pack in pack_segments(texts, max_len):
+        parts = split_packed_translation(SEGMENT_DELIMITER.join(texts[i] for i in pack), len(pack))
+        assert parts is not None
+        for i, part in zip(pack, parts):
+            result[i] = part
+    return result
+
+
+def test_packs_respect_max_len():
+    texts = ["a" * 40, "b" * 40, "c" * 40]
+    assert pack_segments(texts, 100) == [[0, 1], [2]]
+    assert _round_trip(texts, 100) == texts
+
+
+def test_table_rows_survive_packing():
+    texts = ["| a | b |", "| c | d |"]
+    assert pack_segments(texts, 1000) == [[0], [1]]
+    assert _round_trip(texts) == texts
+
+
+def test_double_pipes_survive_packing():
+    texts = ["value ||", "next", "x | | y", "plain text"]
+    assert _round_trip(texts) == texts
+    assert pack_segments(texts, 1000) == [[0], [1], [2], [3]]
+
+
+def test_inner_single_pipes_still_pack():
+    texts = ["a | b", "c | d"]
+    assert pack_segments(texts, 1000) == [[0, 1]]
+    assert _round_trip(texts) == texts
+
+
+def test_lost_delimiters_are_detected():
+    assert split_packed_translation("one two", 2) is None
+    assert split_packed_translation("one\n|||\n", 2) is None
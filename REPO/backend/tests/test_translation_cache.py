@@ -0,0 +1,22 @@
+from translation_cache import TranslationCache
+
+
+def test_batched_reads_and_writes_use_the_disk_tier(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    cache = TranslationCache(path=path)
+    cache.set_many([("a", "A"), ("b", "B"), ("empty", "")])
+
+    # A fresh instance has an empty memory tier, so hits come from disk
+    reopened = TranslationCache(path=path)
+    assert reopened.get_many(["a", "missing", "b", "empty"]) == ["A", None, "B", None]
+    assert reopened.stats()["disk_hits"] == 2
+    assert reopened.get("a") == "A"
+    assert reopened.stats()["memory_hits"] == 1
+
+
+def test_expired_rows_are_dropped(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TranslationCache(path=path, ttl=-1).set("a", "A")
+    cache = TranslationCache(path=path, ttl=-1)
+    assert cache.get_many(["a"]) == [None]
+    assert cache._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0] == 0
@@ -1,52 +1,185 @@
 import re
 
+from glossary import GlossaryStore
+
+DISFLUENCIES = [r"\buh+\b", r"\bum+\b", r"\byou know\b", r"\ber+\b", r"\bhmm+\b", r"\bokay\b"]
+
+# Joins segments in process_many; no pass can match across it
+BATCH_SEPARATOR = "\x00"
+
+
 class TextPreprocessingPipeline:
-    def __init__(self):
-        pass
-    
-    def process(self, text, input_type="text", tone="formal", target_lang=None):
+    def __init__(self, glossaries=None):
+        """Compile every pass once so process() only runs them"""
+        self.glossaries = glossaries if glossaries is not None else GlossaryStore()
+        disfluency = "|".join(DISFLUENCIES)
+        self._surrogates = re.compile(r"[\ud800-\udfff]")
+        # Same matches as the plain alternation, but the lookahead lets the engine skip most positions
+        self._disfluency_pattern = re.compile(rf"(?=[uyeho])(?:{disfluency})", re.IGNORECASE)
+        # Single spaces are already collapsed, so only longer runs and other whitespace are rewritten
+        self._whitespace_pattern = re.compile(r"\s{2,}|[^\S ]")
+        self._email_pattern = re.compile(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+")
+        self._phone_pattern = re.compile(r"\b\d{10,13}\b")
+        self._km_probe = re.compile(r"km", re.IGNORECASE)
+        # Distances and rupee amounts in one pass; the lookahead skips positions neither can start at.
+        # A rupee amount directly followed by km keeps the old km-then-₹ result ("₹5km" -> "5 rupees kilometers")
+        self._unit_pattern = re.compile(r"(?=[₹\d])(?:₹\s*(\d+)(\s*(?i:kms?)\b)?|(\d+)\s*(?i:kms?)\b)")
+        # Only used by PreprocessingStream to find safe split points: whitespace runs that may
+        # contain disfluencies, and units that span more than one word.
+        self._stt_spacing_pattern = re.compile(rf"(?P<ws>(?:{disfluency})?\s(?:\s|{disfluency})*)|{disfluency}",
+                                               re.IGNORECASE)
+        self._text_spacing_pattern = re.compile(r"\s+")
+        self._unit_span_pattern = re.compile(r"\d+\s*(?i:kms?)\b")
+
+    def process(self, text, input_type="text", tone="formal", target_lang=None, source_lang=None, tenant=None):
         """Main preprocessing pipeline for text-to-text translation"""
         # Basic text cleaning
         text = self.normalize_encoding(text)
         text = self.remove_disfluencies(text, input_type)
         text = self.mask_sensitive_data(text)
-        text = self.apply_custom_glossary(text)
+        text = self.apply_custom_glossary(text, tenant, source_lang, target_lang)
         text = self.normalize_units_and_numbers(text)
         return text.strip()
-    
+
+    def process_many(self, texts, input_type="text", tone="formal", target_lang=None, source_lang=None, tenant=None):
+        """Preprocess a list of segments, running each pass once over the whole batch"""
+        texts = [self.normalize_encoding(t or "") for t in texts]
+        if not texts:
+            return []
+        if any(BATCH_SEPARATOR in t for t in texts):
+            return [self.process(t, input_type, tone, target_lang, source_lang, tenant) for t in texts]
+        joined = self.process(BATCH_SEPARATOR.join(texts), input_type, tone, target_lang, source_lang, tenant)
+        return [t.strip() for t in joined.split(BATCH_SEPARATOR)]
+
+    def stream(self, input_type="stt", separator=" ", target_lang=None, source_lang=None, tenant=None):
+        """Incremental preprocessor for transcripts that arrive chunk by chunk"""
+        return PreprocessingStream(self, input_type, separator, target_lang, source_lang, tenant)
+
     def normalize_encoding(self, text):
         """Fix encoding issues"""
+        if self._surrogates.search(text) is None:
+            return text
         return text.encode('utf-8', errors='replace').decode('utf-8')
-    
+
     def remove_disfluencies(self, text, input_type):
         """Remove common speech disfluencies"""
         if input_type == "stt":
-            disfluencies = [r"\buh+\b", r"\bum+\b", r"\byou know\b", r"\ber+\b", r"\bhmm+\b", r"\bokay\b"]
-            pattern = re.compile("|".join(disfluencies), re.IGNORECASE)
-            text = pattern.sub("", text)
-        return re.sub(r"\s+", " ", text).strip()
-    
+            text = self._disfluency_pattern.sub("", text)
+        return self._whitespace_pattern.sub(" ", text).strip()
+
     def mask_sensitive_data(self, text):
         """Mask emails and phone numbers"""
-        text = re.sub(r"[a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+", "[EMAIL]", text)
-        text = re.sub(r"\b\d{10,13}\b", "[PHONE]", text)
-        return text
-    
-    def apply_custom_glossary(self, text):
+        if "@" in text:
+            text = self._mask_emails(text)
+        return self._phone_pattern.sub("[PHONE]", text)
+
+    def _mask_emails(self, text):
+        """Run the email pattern only on the space-delimited stretches around each "@".
+
+        An email never contains a space, so this matches exactly what a full-text
+        scan would, without retrying the pattern at every character of every word.
+        """
+        pieces, last, at = [], 0, text.find("@")
+        while at != -1:
+            start = max(text.rfind(" ", 0, at) + 1, last)
+            end = text.find(" ", at)
+            if end == -1:
+                end = len(text)
+            pieces.append(text[last:start])
+            pieces.append(self._email_pattern.sub("[EMAIL]", text[start:end]))
+            last = end
+            at = text.find("@", end)
+        pieces.append(text[last:])
+        return "".join(pieces)
+
+    def apply_custom_glossary(self, text, tenant=None, source_lang=None, target_lang=None):
         """Replace common terms with standard equivalents"""
-        glossary = {
-            "kms": "kilometers",
-            "₹": "rupees",
-            "circuit brkr": "circuit breaker",
-            "break a leg": "good luck",
-            "piece of cake": "very easy"
-        }
-        for k, v in glossary.items():
-            text = text.replace(k, v)
-        return text
-    
+        return self.glossaries.get(tenant, source_lang, target_lang).apply(text)
+
     def normalize_units_and_numbers(self, text):
         """Basic unit normalization"""
-        text = re.sub(r"(\d+)\s*kms?\b", r"\1 kilometers", text, flags=re.IGNORECASE)
-        text = re.sub(r"₹\s*(\d+)", r"\1 rupees", text)
-        return text
\ No newline at end of file
+        if "₹" in text or self._km_probe.search(text):
+            text = self._unit_pattern.sub(self._normalize_unit, text)
+        return text
+
+    @staticmethod
+    def _normalize_unit(m):
+        amount, km, distance = m.groups()
+        if distance is not None:
+            return f"{distance} kilometers"
+        return f"{amount} rupees kilometers" if km else f"{amount} rupees"
+
+
+class PreprocessingStream:
+    """Applies a pipeline to text fed in chunks, e.g. partial STT transcripts.
+
+    The last few words are held back until more text arrives (or flush() is
+    called), so disfluencies, glossary terms and units split across chunk
+    boundaries come out as if the whole transcript had been processed at once.
+    """
+
+    def __init__(self, pipeline, input_type="stt", separator=" ", target_lang=None, source_lang=None, tenant=None):
+        self.pipeline = pipeline
+        self.input_type = input_type
+        self.separator = separator
+        self.options = {"target_lang": target_lang, "source_lang": source_lang, "tenant": tenant}
+        self._glossary = pipeline.glossaries.get(tenant, source_lang, target_lang)
+        self._hold_words = max(self._glossary.max_words, 2)
+        self._pending = ""
+        self._emitted = False
+
+    def feed(self, chunk):
+        """Add a chunk and return the processed text that is now final (may be empty)"""
+        if not chunk:
+            return ""
+        self._pending = f"{self._pending}{self.separator}{chunk}" if self._pending else chunk
+        cut = self._safe_cut(self._pending)
+        if cut <= 0:
+            return ""
+        head, self._pending = self._pending[:cut], self._pending[cut:]
+        return self._emit(head)
+
+    def flush(self):
+        """Process and return whatever is still held back"""
+        head, self._pending = self._pending, ""
+        return self._emit(head)
+
+    def _safe_cut(self, text):
+        """Offset of the whitespace run to split pending text at, or 0 to keep waiting"""
+        if self.input_type == "stt":
+            runs = [(m.start(), m.end(), m.group("ws") is not None)
+                    for m in self.pipeline._stt_spacing_pattern.finditer(text)]
+        else:
+            runs = [(m.start(), m.end(), True) for m in self.pipeline._text_spacing_pattern.finditer(text)]
+        # Rebuild the text as the spacing pass sees it, noting where each space lands
+        collapsed, size, last = [], 0, 0
+        spaces, candidates = [], []
+        for start, end, has_space in runs:
+            collapsed.append(text[last:start])
+            size += start - last
+            last = end
+            if has_space:
+                spaces.append(size)
+                # Splitting right before whitespace keeps \b checks identical on both sides
+                if text[start].isspace():
+                    candidates.append((size, start))
+                collapsed.append(" ")
+                size += 1
+        collapsed.append(text[last:])
+        if len(spaces) < self._hold_words:
+            return 0
+        limit = spaces[-self._hold_words]
+        collapsed = "".join(collapsed)
+        spans = [m.span() for m in self.pipeline._unit_span_pattern.finditer(collapsed)] + self._glossary.spans(collapsed)
+        for offset, raw in reversed(candidates):
+            if offset <= limit and not any(start < offset < end for start, end in spans):
+                return raw
+        return 0
+
+    def _emit(self, text):
+        processed = self.pipeline.process(text, input_type=self.input_type, **self.options)
+        if not processed:
+            return ""
+        out = f" {processed}" if self._emitted else processed
+        self._emitted = True
+        return out
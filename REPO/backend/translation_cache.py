@@ -0,0 +1,192 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import tempfile
+import threading
+import unicodedata
+from collections import OrderedDict
+
+# Cache settings (override with environment variables)
+TRANSLATION_CACHE_PATH = os.getenv(
+    "TRANSLATION_CACHE_PATH", os.path.join(tempfile.gettempdir(), "shiksha_translation_cache.sqlite3")
+)
+TRANSLATION_CACHE_MEMORY_ENTRIES = int(os.getenv("TRANSLATION_CACHE_MEMORY_ENTRIES", "5000"))
+TRANSLATION_CACHE_DISK_ENTRIES = int(os.getenv("TRANSLATION_CACHE_DISK_ENTRIES", "200000"))
+TRANSLATION_CACHE_TTL = float(os.getenv("TRANSLATION_CACHE_TTL", str(30 * 24 * 3600)))
+
+# How many disk writes happen between eviction sweeps
+EVICTION_INTERVAL = 500
+
+
+def normalize_text(text: str) -> str:
+    """Normalize input text so trivially different requests share a cache entry"""
+    return unicodedata.normalize("NFC", text or "").strip()
+
+
+class TranslationCache:
+    """Two-tier translation cache: bounded in-process LRU in front of a persistent SQLite store.
+
+    Entries expire after `ttl` seconds; the disk tier is trimmed to `disk_entries`
+    rows by least-recent access. Pass path=None for a memory-only cache."""
+
+    def __init__(self, path: str = TRANSLATION_CACHE_PATH,
+                 memory_entries: int = TRANSLATION_CACHE_MEMORY_ENTRIES,
+                 disk_entries: int = TRANSLATION_CACHE_DISK_ENTRIES,
+                 ttl: float = TRANSLATION_CACHE_TTL):
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.ttl = ttl
+        self._memory = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self._db = None
+        self._writes_since_eviction = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if path:
+            self._open(path)
+
+    def _open(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS translations ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, created REAL NOT NULL, accessed REAL NOT NULL)"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS translations_accessed ON translations(accessed)")
+            self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Translation cache disk tier disabled ({path}): {e}")
+            self._db = None
+
+    @staticmethod
+    def make_key(text: str, source_lang: str, target_lang: str, model: str = None, mode: str = None, **options) -> str:
+        """Content-addressed key over the normalized input and every option that affects the output"""
+        parts = {
+            "input": normalize_text(text),
+            "source": source_lang,
+            "target": target_lang,
+            "model": model,
+            "mode": mode,
+            "options": options,
+        }
+        raw = json.dumps(parts, ensure_ascii=False, sort_keys=True, default=str)
+        return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+    def get(self, key: str):
+        """Return the cached translation for `key`, or None"""
+        return self.get_many([key])[0]
+
+    def get_many(self, keys: list) -> list:
+        """Cached translations for `keys` (None where missing), touching the disk tier in one transaction"""
+        now = time.time()
+        touched, expired = [], []
+        with self._lock:
+            results = [self._lookup(key, now, touched, expired) for key in keys]
+            if self._db is not None and (touched or expired):
+                try:
+                    self._db.executemany("UPDATE translations SET accessed = ? WHERE key = ?", [(now, key) for key in touched])
+                    self._db.executemany("DELETE FROM translations WHERE key = ?", [(key,) for key in expired])
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    logging.warning(f"Translation cache read failed: {e}")
+        return results
+
+    def _lookup(self, key: str, now: float, touched: list, expired: list):
+        """Memory then disk lookup; disk hits and expired rows are collected for the caller to commit"""
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+            del self._memory[key]
+
+        if self._db is not None:
+            try:
+                row = self._db.execute(
+                    "SELECT value, created FROM translations WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    value, created = row
+                    if created + self.ttl > now:
+                        touched.append(key)
+                        self._remember(key, value, created + self.ttl)
+                        self.disk_hits += 1
+                        return value
+                    expired.append(key)
+            except sqlite3.Error as e:
+                logging.warning(f"Translation cache read failed: {e}")
+
+        self.misses += 1
+        return None
+
+    def set(self, key: str, value: str):
+        """Store a translation in both tiers"""
+        self.set_many([(key, value)])
+
+    def set_many(self, items: list):
+        """Store (key, translation) pairs in both tiers, writing the disk tier in one transaction"""
+        items = [(key, value) for key, value in items if value]
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            for key, value in items:
+                self._remember(key, value, now + self.ttl)
+            if self._db is None:
+                return
+            try:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO translations (key, value, created, accessed) VALUES (?, ?, ?, ?)",
+                    [(key, value, now, now) for key, value in items],
+                )
+                self._db.commit()
+                self._writes_since_eviction += len(items)
+                if self._writes_since_eviction >= EVICTION_INTERVAL:
+                    self._evict_disk(now)
+            except sqlite3.Error as e:
+                logging.warning(f"Translation cache write failed: {e}")
+
+    def _remember(self, key: str, value: str, expires_at: float):
+        """Insert into the memory LRU, evicting the least recently used entries"""
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self.evictions += 1
+
+    def _evict_disk(self, now: float):
+        """Drop expired rows, then the least recently accessed rows above the size limit"""
+        self._writes_since_eviction = 0
+        cur = self._db.execute("DELETE FROM translations WHERE created < ?", (now - self.ttl,))
+        evicted = cur.rowcount
+        count = self._db.execute("SELECT COUNT(*) FROM translations").fetchone()[0]
+        if count > self.disk_entries:
+            cur = self._db.execute(
+                "DELETE FROM translations WHERE key IN "
+                "(SELECT key FROM translations ORDER BY accessed ASC LIMIT ?)",
+                (count - self.disk_entries,),
+            )
+            evicted += cur.rowcount
+        self._db.commit()
+        self.evictions += max(evicted, 0)
+
+    def stats(self) -> dict:
+        """Hit/miss counters for monitoring"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_entries": len(self._memory),
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "disk_enabled": self._db is not None,
+        }
@@ -0,0 +1,240 @@
+import os
+import re
+import zlib
+import time
+import sqlite3
+import difflib
+import hashlib
+import logging
+import tempfile
+import threading
+from collections import Counter
+
+import numpy as np
+
+from translation_cache import normalize_text
+
+# Translation memory settings (override with environment variables); an empty path disables it
+TRANSLATION_MEMORY_PATH = os.getenv(
+    "TRANSLATION_MEMORY_PATH", os.path.join(tempfile.gettempdir(), "shiksha_translation_memory.sqlite3")
+)
+# Minimum similarity (0-1, edit-distance ratio) for a near match to be offered
+TM_FUZZY_THRESHOLD = float(os.getenv("TM_FUZZY_THRESHOLD", "0.85"))
+# Reuse near matches in place of an upstream translation (exact matches are always reused)
+TM_REUSE_FUZZY = os.getenv("TM_REUSE_FUZZY", "0") == "1"
+# Segments shorter than this only ever match exactly
+TM_MIN_FUZZY_CHARS = int(os.getenv("TM_MIN_FUZZY_CHARS", "20"))
+
+# MinHash LSH over character trigrams: 20 bands of 3 rows, and a candidate must share at least
+# 2 bands with the query. Segments whose trigram sets have Jaccard similarity 0.6 qualify with
+# ~95% probability, 0.7 with ~99.7%, while unrelated text (~0.3) rarely reaches verification.
+LSH_BANDS = 20
+LSH_ROWS = 3
+MIN_SHARED_BANDS = 2
+MAX_FUZZY_CANDIDATES = 20
+MAX_BAND_POSTINGS = 1000
+_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(1729)
+_HASH_A = _rng.integers(1, 1 << 32, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+_HASH_B = _rng.integers(0, 1 << 32, LSH_BANDS * LSH_ROWS, dtype=np.uint64)
+
+SQLITE_MAX_PARAMS = 500
+
+
+def fuzzy_form(text: str) -> str:
+    """Case- and spacing-insensitive form used for near-match scoring"""
+    return re.sub(r"\s+", " ", normalize_text(text)).casefold()
+
+
+def _band_keys(text: str, pair: str) -> list:
+    """LSH band keys of the segment's character-trigram MinHash signature, scoped to a language pair"""
+    padded = f" {text} "
+    grams = {padded[i:i + 3] for i in range(len(padded) - 2)}
+    hashes = np.fromiter((zlib.crc32(g.encode("utf-8")) for g in grams), dtype=np.uint64, count=len(grams))
+    signature = ((_HASH_A[:, None] * hashes[None, :] + _HASH_B[:, None]) % _PRIME).min(axis=1)
+    keys = []
+    for band in range(LSH_BANDS):
+        rows = signature[band * LSH_ROWS:(band + 1) * LSH_ROWS].tobytes()
+        digest = hashlib.blake2b(f"{pair}|{band}|".encode("utf-8") + rows, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+class TranslationMemory:
+    """Persistent store of translated segments per language pair.
+
+    Exact matches are found by source hash; near matches through MinHash LSH
+    band keys (a fixed number of index rows per segment, so lookups stay cheap
+    at millions of segments) and are then scored by edit-distance ratio.
+    Pass path=None or "" to disable."""
+
+    def __init__(self, path: str = TRANSLATION_MEMORY_PATH, fuzzy_threshold: float = TM_FUZZY_THRESHOLD,
+                 reuse_fuzzy: bool = TM_REUSE_FUZZY, min_fuzzy_chars: int = TM_MIN_FUZZY_CHARS):
+        self.fuzzy_threshold = fuzzy_threshold
+        self.reuse_fuzzy = reuse_fuzzy
+        self.min_fuzzy_chars = min_fuzzy_chars
+        self._lock = threading.Lock()
+        self._db = None
+        self.lookups = 0
+        self.exact_hits = 0
+        self.fuzzy_hits = 0
+        self.stored = 0
+        if path:
+            self._open(path)
+
+    @property
+    def enabled(self) -> bool:
+        return self._db is not None
+
+    def _open(self, path: str):
+        try:
+            self._db = sqlite3.connect(path, timeout=5, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS segments ("
+                "id INTEGER PRIMARY KEY, pair TEXT NOT NULL, source_hash TEXT NOT NULL, source TEXT NOT NULL, "
+                "target TEXT NOT NULL, created REAL NOT NULL, updated REAL NOT NULL, uses INTEGER NOT NULL DEFAULT 0, "
+                "UNIQUE (pair, source_hash))"
+            )
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS segment_bands ("
+                "band INTEGER NOT NULL, segment_id INTEGER NOT NULL, PRIMARY KEY (band, segment_id)) WITHOUT ROWID"
+            )
+            self._db.commit()
+        except sqlite3.Error as e:
+            logging.warning(f"Translation memory disabled ({path}): {e}")
+            self._db = None
+
+    @staticmethod
+    def make_pair(source_lang: str, target_lang: str, profile: str = "") -> str:
+        """Scope of a segment: language pair plus any option that changes the translation"""
+        return f"{source_lang}>{target_lang}" + (f"|{profile}" if profile else "")
+
+    @staticmethod
+    def _hash(text: str) -> str:
+        return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+    def lookup_many(self, sources: list, source_lang: str, target_lang: str, profile: str = "", fuzzy: bool = True) -> list:
+        """One result per source: None, or {"kind": "exact"|"fuzzy", "score", "source", "target"}"""
+        results = [None] * len(sources)
+        if self._db is None or not sources:
+            return results
+        pair = self.make_pair(source_lang, target_lang, profile)
+        hashes = [self._hash(s) for s in sources]
+        with self._lock:
+            try:
+                found = {}
+                unique = list(dict.fromkeys(hashes))
+                for start in range(0, len(unique), SQLITE_MAX_PARAMS):
+                    batch = unique[start:start + SQLITE_MAX_PARAMS]
+                    rows = self._db.execute(
+                        f"SELECT source_hash, id, source, target FROM segments WHERE pair = ? "
+                        f"AND source_hash IN ({','.join('?' * len(batch))})", (pair, *batch)
+                    ).fetchall()
+                    found.update({h: (seg_id, source, target) for h, seg_id, source, target in rows})
+                used = []
+                for i, h in enumerate(hashes):
+                    if h in found:
+                        seg_id, source, target = found[h]
+                        results[i] = {"kind": "exact", "score": 1.0, "source": source, "target": target}
+                        used.append(seg_id)
+                    elif fuzzy and len(normalize_text(sources[i])) >= self.min_fuzzy_chars:
+                        results[i] = self._fuzzy_lookup(sources[i], pair)
+                        if results[i]:
+                            used.append(results[i].pop("id"))
+                if used:
+                    self._db.executemany("UPDATE segments SET uses = uses + 1 WHERE id = ?", [(u,) for u in used])
+                    self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Translation memory lookup failed: {e}")
+                return [None] * len(sources)
+            self.lookups += len(sources)
+            self.exact_hits += sum(1 for r in results if r and r["kind"] == "exact")
+            self.fuzzy_hits += sum(1 for r in results if r and r["kind"] == "fuzzy")
+        return results
+
+    def _fuzzy_lookup(self, source: str, pair: str):
+        """Best near match at or above the threshold, or None"""
+        query = fuzzy_form(source)
+        # Bands shared by a large share of the memory (signatures made of very common trigrams)
+        # say little about similarity and would dominate the query, so they are skipped
+        keys = [key for key in _band_keys(query, pair) if self._db.execute(
+            "SELECT COUNT(*) FROM (SELECT 1 FROM segment_bands WHERE band = ? LIMIT ?)", (key, MAX_BAND_POSTINGS + 1)
+        ).fetchone()[0] <= MAX_BAND_POSTINGS]
+        if len(keys) < MIN_SHARED_BANDS:
+            return None
+        candidates = self._db.execute(
+            f"SELECT segment_id FROM segment_bands WHERE band IN ({','.join('?' * len(keys))}) "
+            f"GROUP BY segment_id HAVING COUNT(*) >= ? ORDER BY COUNT(*) DESC LIMIT ?",
+            (*keys, MIN_SHARED_BANDS, MAX_FUZZY_CANDIDATES)
+        ).fetchall()
+        if not candidates:
+            return None
+        ids = [c[0] for c in candidates]
+        rows = self._db.execute(
+            f"SELECT id, source, target FROM segments WHERE id IN ({','.join('?' * len(ids))})", ids
+        ).fetchall()
+        best = None
+        # The query is the indexed side, so its character index is built once for all candidates
+        matcher = difflib.SequenceMatcher(None, autojunk=False)
+        matcher.set_seq2(query)
+        query_chars = Counter(query)
+        for seg_id, candidate_source, target in rows:
+            candidate = fuzzy_form(candidate_source)
+            total = len(query) + len(candidate)
+            # Upper bounds on ratio() (length ratio, then shared character counts) reject most candidates cheaply
+            if 2.0 * min(len(query), len(candidate)) / total < self.fuzzy_threshold:
+                continue
+            candidate_chars = Counter(candidate)
+            if 2.0 * sum(min(n, candidate_chars[ch]) for ch, n in query_chars.items()) / total < self.fuzzy_threshold:
+                continue
+            matcher.set_seq1(candidate)
+            score = matcher.ratio()
+            if score >= self.fuzzy_threshold and (best is None or score > best["score"]):
+                best = {"kind": "fuzzy", "score": round(score, 4), "source": candidate_source, "target": target, "id": seg_id}
+        return best
+
+    def add_many(self, pairs: list, source_lang: str, target_lang: str, profile: str = ""):
+        """Store (source, target) segment translations; a newer target replaces an older one"""
+        if self._db is None or not pairs:
+            return
+        pair = self.make_pair(source_lang, target_lang, profile)
+        now = time.time()
+        with self._lock:
+            try:
+                for source, target in pairs:
+                    source = normalize_text(source)
+                    if not source or not target:
+                        continue
+                    source_hash = self._hash(source)
+                    existing = self._db.execute(
+                        "SELECT id FROM segments WHERE pair = ? AND source_hash = ?", (pair, source_hash)
+                    ).fetchone()
+                    if existing:
+                        self._db.execute("UPDATE segments SET target = ?, updated = ? WHERE id = ?", (target, now, existing[0]))
+                        continue
+                    cur = self._db.execute(
+                        "INSERT INTO segments (pair, source_hash, source, target, created, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                        (pair, source_hash, source, target, now, now),
+                    )
+                    if len(source) >= self.min_fuzzy_chars:
+                        self._db.executemany(
+                            "INSERT OR IGNORE INTO segment_bands (band, segment_id) VALUES (?, ?)",
+                            [(key, cur.lastrowid) for key in _band_keys(fuzzy_form(source), pair)],
+                        )
+                    self.stored += 1
+                self._db.commit()
+            except sqlite3.Error as e:
+                logging.warning(f"Translation memory write failed: {e}")
+
+    def stats(self) -> dict:
+        """Reuse counters for monitoring"""
+        return {
+            "enabled": self._db is not None,
+            "lookups": self.lookups,
+            "exact_hits": self.exact_hits,
+            "fuzzy_hits": self.fuzzy_hits,
+            "stored": self.stored,
+            "fuzzy_threshold": self.fuzzy_threshold,
+            "reuse_fuzzy": self.reuse_fuzzy,
+        }
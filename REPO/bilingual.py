@@ -11,13 +11,15 @@ from datetime import datetime # Needed for timestamps
 import warnings
 warnings.filterwarnings('ignore') # Suppress warnings
 
-# Replace 'your_api_key_here' with your actual Sarvam AI API key
-SARVAM_API_KEY = "sk_aov2qcwm_v6DDreRZzU6ntWRM5ixh8voS"
+# Set SARVAM_API_KEYS (comma separated, first key is used) or SARVAM_API_KEY
+from sarvam_keys import sarvam_api_key
+SARVAM_API_KEY = sarvam_api_key()
 
 # Define API endpoints
-SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text" # Pure STT
-SARVAM_TRANSLATE_URL = "https://api.sarvam.ai/translate" # Text-to-Text Translate
-SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech" # Text-to-Speech
+SARVAM_BASE_URL = os.getenv("SARVAM_BASE_URL", "https://api.sarvam.ai").rstrip("/")
+SARVAM_STT_URL = f"{SARVAM_BASE_URL}/speech-to-text" # Pure STT
+SARVAM_TRANSLATE_URL = f"{SARVAM_BASE_URL}/translate" # Text-to-Text Translate
+SARVAM_TTS_URL = f"{SARVAM_BASE_URL}/text-to-speech" # Text-to-Speech
 
 # Language mappings for display and API calls
 LANGUAGE_MAPPINGS = {
@@ -4,16 +4,19 @@ import requests
 import io
 import base64
 import tempfile
+import os
 from pydub import AudioSegment
 from datetime import datetime
 
-# Sarvam API Key (replace with your actual key)
-SARVAM_API_KEY = "sk_aov2qcwm_v6DDreRZzU6ntWRM5ixh8voS"
+# Set SARVAM_API_KEYS (comma separated, first key is used) or SARVAM_API_KEY
+from sarvam_keys import sarvam_api_key
+SARVAM_API_KEY = sarvam_api_key()
 
 # API Endpoints
-SARVAM_STT_URL = "https://api.sarvam.ai/speech-to-text"
-SARVAM_TRANSLATE_URL = "https://api.sarvam.ai/translate"
-SARVAM_TTS_URL = "https://api.sarvam.ai/text-to-speech"
+SARVAM_BASE_URL = os.getenv("SARVAM_BASE_URL", "https://api.sarvam.ai").rstrip("/")
+SARVAM_STT_URL = f"{SARVAM_BASE_URL}/speech-to-text"
+SARVAM_TRANSLATE_URL = f"{SARVAM_BASE_URL}/translate"
+SARVAM_TTS_URL = f"{SARVAM_BASE_URL}/text-to-speech"
 
 # Supported Languages
 LANGUAGE_MAPPINGS = {
@@ -0,0 +1,12 @@
+import os
+import logging
+
+
+def sarvam_api_key() -> str:
+    """Sarvam API key for the standalone scripts: the first key in SARVAM_API_KEYS
+    (comma separated, as used by the backend's key pool), else SARVAM_API_KEY."""
+    keys = [k.strip() for k in os.getenv("SARVAM_API_KEYS", "").split(",") if k.strip()]
+    key = keys[0] if keys else os.getenv("SARVAM_API_KEY", "").strip()
+    if not key:
+        logging.warning("No Sarvam API key configured; set SARVAM_API_KEYS or SARVAM_API_KEY")
+    return key